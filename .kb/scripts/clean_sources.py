@@ -7,150 +7,242 @@ to clean HTML or markdown format.
 
 Usage:
     python3 clean_sources.py <input_file> [--output <output_file>] [--format html|markdown]
+    python3 clean_sources.py <dir|glob|file>... [--jobs N] [--format html|markdown]
+    python3 clean_sources.py <input_file> --stream
+
+Batch mode (several inputs, a directory or a glob) cleans files across a
+process pool, skips files whose content hash shows they are already clean
+and writes every file atomically. --stream rewrites files chunk by chunk,
+parsing the source-list HTML incrementally, so peak memory stays constant
+regardless of file size.
 """
 
 import re
 import argparse
+import glob
+import hashlib
+import json
+import os
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent / '40-code'))
 
-def extract_source_data(html_content):
-    """Extract source data from complex HTML structure using regex."""
-    sources = []
+from frontmatter_io import atomic_write_text  # noqa: E402
 
-    # Find all href links
-    href_pattern = r'href="(https?://[^"]+)"'
-    href_matches = re.findall(href_pattern, html_content)
+HTML_SUFFIXES = ('.html', '.htm')
+STREAM_CHUNK_SIZE = 64 * 1024
 
-    # For each unique URL, extract associated data
-    processed_urls = set()
+# Markers for the streaming rewriter
+SECTION_MARKER = '## Sources'
+NEXT_SECTION = '\n## '
+HTML_OPEN = '<deep-research-source-lists'
+HTML_CLOSE = '</deep-research-source-lists>'
+DEFAULT_MANIFEST = Path(__file__).resolve().parent.parent / 'cache' / 'clean-sources-manifest.json'
 
-    for url in href_matches:
-        if url in processed_urls:
-            continue
-        processed_urls.add(url)
 
-        # Find the section containing this URL
-        url_section_pattern = rf'href="{re.escape(url)}".*?(?=href="|$)'
-        url_match = re.search(url_section_pattern, html_content, re.DOTALL)
+# Every attribute value that opens an anchor section
+HREF_RE = re.compile(r'href="')
+SOURCE_HREF_RE = re.compile(r'href="(https?://[^"]+)"')
+FAVICON_RE = re.compile(r'src="([^"]*faviconV2[^"]*)"')
+DOMAIN_RE = re.compile(r'class="display-name"[^>]*>([^<]+)')
+TITLE_RE = re.compile(r'class="sub-title"[^>]*>([^<]+(?:<[^>]+>[^<]*)*)')
+TAG_RE = re.compile(r'<[^>]+>')
+URL_HOST_RE = re.compile(r'https?://([^/]+)')
 
-        if not url_match:
-            continue
 
-        section = url_match.group(0)
-
-        # Extract favicon
-        favicon_pattern = r'src="([^"]*faviconV2[^"]*)"'
-        favicon_match = re.search(favicon_pattern, section)
-        favicon = favicon_match.group(1) if favicon_match else ''
-
-        # Extract domain name
-        domain_pattern = r'class="display-name"[^>]*>([^<]+)'
-        domain_match = re.search(domain_pattern, section)
-        domain = domain_match.group(1).strip() if domain_match else ''
-
-        # Extract title/subtitle
-        title_pattern = r'class="sub-title"[^>]*>([^<]+(?:<[^>]+>[^<]*)*)'
-        title_match = re.search(title_pattern, section)
-        if title_match:
-            title = re.sub(r'<[^>]+>', '', title_match.group(1)).strip()
-            # Clean up multiple whitespaces
-            title = ' '.join(title.split())
-        else:
-            title = ''
+def _parse_section(html_content, start, end, processed_urls):
+    """Parse the anchor section ``html_content[start:end]`` into a source dict.
 
-        # Extract domain from URL if no domain found
-        if not domain:
-            domain_from_url = re.search(r'https?://([^/]+)', url)
-            domain = domain_from_url.group(1) if domain_from_url else ''
+    Returns None for non-http(s) links, repeated URLs and empty sections.
+    """
+    href_match = SOURCE_HREF_RE.match(html_content, start)
+    if not href_match:
+        return None
 
-        if url and (title or domain):
-            sources.append({
-                'url': url,
-                'title': title or domain,
-                'domain': domain,
-                'favicon': favicon
-            })
+    url = href_match.group(1)
+    if url in processed_urls:
+        return None
+    processed_urls.add(url)
 
-    return sources
+    end = max(end, href_match.end())
 
+    # Extract favicon
+    favicon_match = FAVICON_RE.search(html_content, start, end)
+    favicon = favicon_match.group(1) if favicon_match else ''
 
-def format_as_clean_html(sources):
-    """Format sources as clean HTML."""
-    html_parts = []
+    # Extract domain name
+    domain_match = DOMAIN_RE.search(html_content, start, end)
+    domain = domain_match.group(1).strip() if domain_match else ''
+
+    # Extract title/subtitle
+    title_match = TITLE_RE.search(html_content, start, end)
+    if title_match:
+        title = TAG_RE.sub('', title_match.group(1)).strip()
+        # Clean up multiple whitespaces
+        title = ' '.join(title.split())
+    else:
+        title = ''
+
+    # Extract domain from URL if no domain found
+    if not domain:
+        domain_from_url = URL_HOST_RE.search(url)
+        domain = domain_from_url.group(1) if domain_from_url else ''
+
+    if url and (title or domain):
+        return {
+            'url': url,
+            'title': title or domain,
+            'domain': domain,
+            'favicon': favicon
+        }
+    return None
+
+
+def extract_source_data(html_content):
+    """Extract source data from complex HTML structure in a single pass.
+
+    The HTML is tokenized once into sections, each running from an
+    ``href="`` to the next one. The first section of every unique http(s)
+    URL supplies its favicon, display-name and sub-title, so the work is
+    linear in the size of the input.
+    """
+    sources = []
+    processed_urls = set()
+
+    boundaries = [match.start() for match in HREF_RE.finditer(html_content)]
+    # The last section stops before a single trailing newline, like a `$` anchor would
+    text_end = len(html_content) - 1 if html_content.endswith('\n') else len(html_content)
 
-    for source in sources:
-        if source['favicon']:
-            html_parts.append(f'''
+    for index, start in enumerate(boundaries):
+        end = boundaries[index + 1] if index + 1 < len(boundaries) else text_end
+        source = _parse_section(html_content, start, end, processed_urls)
+        if source:
+            sources.append(source)
+
+    return sources
+
+
+class SourceStreamExtractor:
+    """Push parser yielding the same sources as extract_source_data.
+
+    HTML is fed in arbitrary chunks; only the anchor section currently being
+    read is buffered, so memory stays bounded by the largest single source
+    entry rather than the size of the source list.
+    """
+
+    def __init__(self):
+        self._buffer = ''
+        self._scanned = 0
+        self._processed_urls = set()
+
+    def feed(self, chunk):
+        """Consume a chunk of HTML and return the sources it completed."""
+        buffer = self._buffer + chunk
+        sources = []
+        # Sections start at an href="; everything before the first one is noise
+        current = 0 if buffer.startswith('href="') else None
+        for match in HREF_RE.finditer(buffer, max(0, self._scanned - (len('href="') - 1))):
+            if match.start() == current:
+                continue
+            if current is not None:
+                source = _parse_section(buffer, current, match.start(), self._processed_urls)
+                if source:
+                    sources.append(source)
+            current = match.start()
+
+        if current is None:
+            # Keep just enough to recognise an href=" split across chunks
+            self._buffer = buffer[-(len('href="') - 1):]
+        else:
+            self._buffer = buffer[current:]
+        self._scanned = len(self._buffer)
+        return sources
+
+    def close(self):
+        """Flush the final section and return any source it holds."""
+        sources = []
+        if self._buffer.startswith('href="'):
+            source = _parse_section(self._buffer, 0, len(self._buffer), self._processed_urls)
+            if source:
+                sources.append(source)
+        self._buffer = ''
+        self._scanned = 0
+        return sources
+
+
+def _format_source_html(source):
+    if source['favicon']:
+        return f'''
 <a target="_blank" href="{source['url']}">
     <img class="favicon" src="{source['favicon']}">
     <span class="sub-title">{source['title']}</span>
     <span class="display-name">{source['domain']}</span>
-</a>''')
-        else:
-            html_parts.append(f'''
+</a>'''
+    return f'''
 <a target="_blank" href="{source['url']}">
     <span class="sub-title">{source['title']}</span>
     <span class="display-name">{source['domain']}</span>
-</a>''')
+</a>'''
 
-    return '\n'.join(html_parts)
 
+def _format_source_markdown(source):
+    if source['favicon']:
+        # Markdown with favicon
+        return f"[![]({source['favicon']}) {source['title']} {source['domain']}]({source['url']})"
+    # Simple markdown link
+    return f"[{source['title']} - {source['domain']}]({source['url']})"
 
-def format_as_markdown(sources):
-    """Format sources as markdown links."""
-    markdown_parts = []
-
-    for source in sources:
-        if source['favicon']:
-            # Markdown with favicon
-            markdown_parts.append(f"[![]({source['favicon']}) {source['title']} {source['domain']}]({source['url']})")
-        else:
-            # Simple markdown link
-            markdown_parts.append(f"[{source['title']} - {source['domain']}]({source['url']})")
 
-    return '\n'.join(markdown_parts)
+def format_as_clean_html(sources):
+    """Format sources as clean HTML."""
+    return '\n'.join(_format_source_html(source) for source in sources)
 
 
-def clean_sources_in_file(input_file, output_file=None, format_type='html'):
-    """Clean sources in a markdown file."""
-    input_path = Path(input_file)
+def format_as_markdown(sources):
+    """Format sources as markdown links."""
+    return '\n'.join(_format_source_markdown(source) for source in sources)
 
-    if not input_path.exists():
-        raise FileNotFoundError(f"Input file not found: {input_file}")
 
-    # Read the file
-    content = input_path.read_text(encoding='utf-8')
+def clean_sources_content(content, format_type='html', whole_document=False):
+    """Return (new_content, source_count, message) for one document.
 
-    # Find the sources section (between ## Sources and end of file or next section)
-    sources_pattern = r'(## Sources.*?)(?=\n## |\Z)'
-    sources_match = re.search(sources_pattern, content, re.DOTALL)
+    ``new_content`` is None when there is nothing to clean. With
+    ``whole_document`` the entire input is treated as the source-list HTML
+    (raw exports such as sources.html) instead of a markdown Sources section.
+    """
+    if whole_document:
+        # Already-cleaned exports no longer carry Angular attributes
+        if '_ngcontent' not in content:
+            return None, 0, "No Angular-style HTML sources found."
+        html_content = content
+    else:
+        # Find the sources section (between ## Sources and end of file or next section)
+        sources_pattern = r'(## Sources.*?)(?=\n## |\Z)'
+        sources_match = re.search(sources_pattern, content, re.DOTALL)
 
-    if not sources_match:
-        print("No sources section found in the file.")
-        return False
+        if not sources_match:
+            return None, 0, "No sources section found in the file."
 
-    sources_section = sources_match.group(1)
+        sources_section = sources_match.group(1)
 
-    # Extract HTML content from the sources section
-    html_pattern = r'<deep-research-source-lists.*?</deep-research-source-lists>'
-    html_match = re.search(html_pattern, sources_section, re.DOTALL)
+        # Extract HTML content from the sources section
+        html_pattern = r'<deep-research-source-lists.*?</deep-research-source-lists>'
+        html_match = re.search(html_pattern, sources_section, re.DOTALL)
 
-    if not html_match:
-        print("No HTML sources found in the sources section.")
-        return False
+        if not html_match:
+            return None, 0, "No HTML sources found in the sources section."
 
-    html_content = html_match.group(0)
+        html_content = html_match.group(0)
 
     # Extract source data
     sources = extract_source_data(html_content)
 
     if not sources:
-        print("No valid sources extracted from HTML.")
-        return False
-
-    print(f"Extracted {len(sources)} sources")
+        return None, 0, "No valid sources extracted from HTML."
 
     # Format sources
     if format_type == 'markdown':
@@ -158,30 +250,346 @@ def clean_sources_in_file(input_file, output_file=None, format_type='html'):
     else:
         formatted_sources = format_as_clean_html(sources)
 
+    if whole_document:
+        return f"{formatted_sources.lstrip()}\n", len(sources), f"Extracted {len(sources)} sources"
+
     # Replace the complex HTML with clean format
     new_sources_section = f"## Sources\n\n{formatted_sources}\n"
     new_content = content.replace(sources_match.group(0), new_sources_section)
+    return new_content, len(sources), f"Extracted {len(sources)} sources"
+
+
+def _stream_clean(chunks, write, format_type='html', whole_document=False):
+    """Rewrite a document read from ``chunks`` through ``write``.
+
+    Text before the Sources section is copied through, the section's
+    ``<deep-research-source-lists>`` HTML is push-parsed as it arrives and
+    each clean source is written immediately, and everything after the
+    section is copied through again. Only marker-sized tails and the anchor
+    currently being parsed are held in memory.
+
+    Returns (source_count, message); a count of 0 means the output must be
+    discarded because there was nothing to clean.
+    """
+    extractor = SourceStreamExtractor()
+    format_source = _format_source_markdown if format_type == 'markdown' else _format_source_html
+    count = 0
+
+    def emit(sources):
+        nonlocal count
+        for source in sources:
+            text = format_source(source)
+            if count == 0 and whole_document:
+                text = text.lstrip()
+            write(text if count == 0 else '\n' + text)
+            count += 1
+
+    if whole_document:
+        angular = False
+        tail = ''
+        for chunk in chunks:
+            if not angular:
+                angular = '_ngcontent' in tail + chunk
+                tail = (tail + chunk)[-(len('_ngcontent') - 1):]
+            emit(extractor.feed(chunk))
+        emit(extractor.close())
+        if not angular:
+            return 0, "No Angular-style HTML sources found."
+        if not count:
+            return 0, "No valid sources extracted from HTML."
+        write('\n')
+        return count, f"Extracted {count} sources"
+
+    state = 'copy'
+    buffer = ''
+    for chunk in chain(chunks, [None]):
+        if state == 'tail':
+            if chunk is not None:
+                write(chunk)
+            continue
+        eof = chunk is None
+        buffer += chunk or ''
+
+        while True:
+            if state == 'copy':
+                index = buffer.find(SECTION_MARKER)
+                if index < 0:
+                    cut = len(buffer) if eof else max(0, len(buffer) - len(SECTION_MARKER) + 1)
+                    write(buffer[:cut])
+                    buffer = buffer[cut:]
+                    break
+                write(buffer[:index])
+                buffer = buffer[index + len(SECTION_MARKER):]
+                state = 'section'
+
+            elif state == 'section':
+                # Text between the heading and the HTML is dropped, as in the in-memory path
+                index = buffer.find(HTML_OPEN)
+                next_section = buffer.find(NEXT_SECTION)
+                if index < 0 or 0 <= next_section < index:
+                    if eof or next_section >= 0:
+                        return 0, "No HTML sources found in the sources section."
+                    buffer = buffer[-(len(HTML_OPEN) - 1):]
+                    break
+                write('## Sources\n\n')
+                buffer = buffer[index:]
+                state = 'html'
+
+            elif state == 'html':
+                index = buffer.find(HTML_CLOSE)
+                next_section = buffer.find(NEXT_SECTION)
+                if 0 <= next_section < (index if index >= 0 else len(buffer)):
+                    return 0, "No HTML sources found in the sources section."
+                if index < 0:
+                    if eof:
+                        return 0, "No HTML sources found in the sources section."
+                    cut = max(0, len(buffer) - len(HTML_CLOSE) + 1)
+                    emit(extractor.feed(buffer[:cut]))
+                    buffer = buffer[cut:]
+                    break
+                index += len(HTML_CLOSE)
+                emit(extractor.feed(buffer[:index]))
+                emit(extractor.close())
+                if not count:
+                    return 0, "No valid sources extracted from HTML."
+                write('\n')
+                buffer = buffer[index:]
+                state = 'skip'
+
+            elif state == 'skip':
+                index = buffer.find(NEXT_SECTION)
+                if index < 0:
+                    buffer = '' if eof else buffer[-(len(NEXT_SECTION) - 1):]
+                    break
+                write(buffer[index:])
+                buffer = ''
+                state = 'tail'
+                break
+
+            else:
+                break
+
+    if state == 'copy':
+        return 0, "No sources section found in the file."
+    return count, f"Extracted {count} sources"
+
+
+def clean_sources_stream(input_file, output_file=None, format_type='html', chunk_size=STREAM_CHUNK_SIZE):
+    """Clean sources with constant memory, writing through a temp file.
+
+    Returns (source_count, message); the output is only replaced when
+    sources were cleaned.
+    """
+    input_path = Path(input_file)
+    output_path = Path(output_file) if output_file else input_path
+    fd, tmp_name = tempfile.mkstemp(prefix=f'.{output_path.name}.', suffix='.tmp', dir=output_path.parent)
+    try:
+        with open(input_path, 'r', encoding='utf-8') as source, \
+                os.fdopen(fd, 'w', encoding='utf-8') as target:
+            count, message = _stream_clean(
+                iter(lambda: source.read(chunk_size), ''), target.write, format_type,
+                whole_document=input_path.suffix.lower() in HTML_SUFFIXES)
+            if count:
+                target.flush()
+                os.fsync(target.fileno())
+        if count:
+            if output_path.exists():
+                os.chmod(tmp_name, output_path.stat().st_mode & 0o7777)
+            os.replace(tmp_name, output_path)
+        return count, message
+    finally:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+
+
+def clean_sources_in_file(input_file, output_file=None, format_type='html', stream=False):
+    """Clean sources in a markdown file.
+
+    With ``stream`` the file is rewritten chunk by chunk (see
+    clean_sources_stream) instead of being loaded into memory.
+    """
+    input_path = Path(input_file)
+
+    if not input_path.exists():
+        raise FileNotFoundError(f"Input file not found: {input_file}")
 
-    # Write output
     output_path = Path(output_file) if output_file else input_path
-    output_path.write_text(new_content, encoding='utf-8')
+
+    if stream:
+        count, message = clean_sources_stream(input_path, output_path, format_type)
+        print(message)
+        if not count:
+            return False
+        print(f"Sources cleaned and saved to: {output_path}")
+        return True
+
+    # Read the file
+    content = input_path.read_text(encoding='utf-8')
+
+    new_content, _, message = clean_sources_content(
+        content, format_type, whole_document=input_path.suffix.lower() in HTML_SUFFIXES)
+    print(message)
+    if new_content is None:
+        return False
+
+    # Write output
+    atomic_write_text(output_path, new_content)
 
     print(f"Sources cleaned and saved to: {output_path}")
     return True
 
 
+def expand_inputs(inputs):
+    """Expand files, directories and glob patterns into a sorted list of files.
+
+    An input that is neither a file nor a directory and matches no file as a
+    glob pattern raises FileNotFoundError, like a missing single input does.
+    """
+    files = set()
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            for suffix in ('.md',) + HTML_SUFFIXES:
+                files.update(p for p in path.rglob(f'*{suffix}') if p.is_file())
+        elif path.is_file():
+            files.add(path)
+        else:
+            matches = [Path(p) for p in glob.glob(item, recursive=True) if Path(p).is_file()]
+            if not matches:
+                raise FileNotFoundError(f"Input file not found: {item}")
+            files.update(matches)
+    return sorted(files)
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(STREAM_CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _clean_one(task):
+    """Worker: clean one file in place. Returns a result dict."""
+    path, format_type, known_hash, stream = task
+    result = {'path': path, 'status': 'error', 'sources': 0, 'hash': None, 'message': ''}
+    try:
+        digest = _file_hash(path)
+        if digest == known_hash:
+            result.update(status='skipped', hash=digest, message='already cleaned')
+            return result
+
+        if stream:
+            count, message = clean_sources_stream(path, format_type=format_type)
+            result['message'] = message
+            if not count:
+                result.update(status='no-sources', hash=digest)
+            else:
+                result.update(status='cleaned', sources=count, hash=_file_hash(path))
+            return result
+
+        data = Path(path).read_bytes()
+        new_content, count, message = clean_sources_content(
+            data.decode('utf-8'), format_type, whole_document=Path(path).suffix.lower() in HTML_SUFFIXES)
+        result['message'] = message
+        if new_content is None:
+            result.update(status='no-sources', hash=hashlib.sha256(data).hexdigest())
+            return result
+
+        encoded = new_content.encode('utf-8')
+        if encoded != data:
+            atomic_write_text(path, new_content)
+        result.update(status='cleaned', sources=count, hash=hashlib.sha256(encoded).hexdigest())
+    except Exception as e:
+        result['message'] = str(e)
+    return result
+
+
+def _load_manifest(manifest_path):
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def clean_sources_batch(inputs, format_type='html', jobs=None, manifest_path=DEFAULT_MANIFEST,
+                        verbose=False, stream=False):
+    """Clean many files across a process pool and print one aggregated summary.
+
+    Files whose current content hash matches the hash recorded in the
+    manifest after their last run are skipped without being parsed.
+    """
+    files = expand_inputs(inputs)
+    manifest = _load_manifest(manifest_path) if manifest_path else {}
+    tasks = [(str(f), format_type, manifest.get(str(f.resolve())), stream) for f in files]
+
+    summary = {'cleaned': 0, 'skipped': 0, 'no-sources': 0, 'error': 0}
+    total_sources = 0
+    errors = []
+
+    if tasks:
+        workers = max(1, min(jobs or os.cpu_count() or 1, len(tasks)))
+        if workers == 1:
+            results = map(_clean_one, tasks)
+            pool = None
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            results = pool.map(_clean_one, tasks, chunksize=max(1, len(tasks) // (workers * 4)))
+        try:
+            for result in results:
+                summary[result['status']] += 1
+                total_sources += result['sources']
+                if result['hash']:
+                    manifest[str(Path(result['path']).resolve())] = result['hash']
+                if result['status'] == 'error':
+                    errors.append(f"{result['path']}: {result['message']}")
+                elif verbose:
+                    print(f"  {result['status']:<10} {result['path']} ({result['message']})")
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    if manifest_path:
+        Path(manifest_path).parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(manifest_path, json.dumps(manifest, indent=2, sort_keys=True) + '\n')
+
+    print(f"Processed {len(tasks)} files: {summary['cleaned']} cleaned ({total_sources} sources), "
+          f"{summary['skipped']} already clean, {summary['no-sources']} without sources, "
+          f"{summary['error']} errors")
+    for error in errors:
+        print(f"  Error: {error}")
+    return summary
+
+
 def main():
     parser = argparse.ArgumentParser(description='Clean Angular-style HTML sources in markdown files')
-    parser.add_argument('input_file', help='Input markdown file')
-    parser.add_argument('--output', '-o', help='Output file (default: overwrite input)')
+    parser.add_argument('inputs', nargs='+', help='Input markdown/HTML files, directories or glob patterns')
+    parser.add_argument('--output', '-o', help='Output file (default: overwrite input; single file only)')
     parser.add_argument('--format', '-f', choices=['html', 'markdown'], default='html',
                         help='Output format (default: html)')
+    parser.add_argument('--jobs', '-j', type=int, help='Worker processes for batch mode (default: CPU count)')
+    parser.add_argument('--manifest', default=str(DEFAULT_MANIFEST),
+                        help=f'Content-hash manifest for batch mode (default: {DEFAULT_MANIFEST})')
+    parser.add_argument('--no-manifest', action='store_true', help='Process every file, ignoring the manifest')
+    parser.add_argument('--stream', action='store_true',
+                        help='Rewrite files chunk by chunk with constant memory (for very large files)')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
 
     args = parser.parse_args()
 
+    batch = len(args.inputs) > 1 or not Path(args.inputs[0]).is_file()
+    if batch and args.output:
+        parser.error('--output can only be used with a single input file')
+
     try:
-        success = clean_sources_in_file(args.input_file, args.output, args.format)
+        if batch:
+            summary = clean_sources_batch(args.inputs, args.format, args.jobs,
+                                          None if args.no_manifest else args.manifest, args.verbose,
+                                          args.stream)
+            sys.exit(1 if summary['error'] else 0)
+
+        success = clean_sources_in_file(args.inputs[0], args.output, args.format, args.stream)
         if success:
             print("Sources cleaned successfully!")
             sys.exit(0)
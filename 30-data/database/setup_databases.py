@@ -93,6 +93,8 @@ def create_analytics_db(db_path):
     cursor = conn.cursor()
     
     cursor.execute("PRAGMA foreign_keys = ON")
+    # Let the retention job reclaim pages without a full VACUUM
+    cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
     
     # Tool usage logs
     cursor.execute("""
@@ -209,6 +211,8 @@ def create_citations_db(db_path):
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_citations_key ON citations(citation_key)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_citations_year ON citations(year)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_citations_type ON citations(citation_type)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_citations_doi ON citations(doi)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_citations_arxiv ON citations(arxiv_id)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_usage_file ON citation_usage(content_file)")
     
     conn.commit()
@@ -0,0 +1,225 @@
+"""
+Write-Behind Tool Usage Logger
+
+Records maintenance operations into the `tool_usage` table of analytics.db
+without putting SQLite on the caller's hot path. Events are appended to a
+bounded in-memory queue and a background thread flushes them in batched
+transactions. Pending events are flushed when the interpreter exits.
+
+Usage:
+    from analytics_logger import log_tool_usage, timed
+
+    log_tool_usage("yaml-frontmatter-enforcer", execution_time=0.004,
+                   success=True, context="validate")
+
+    with timed("maintain-kb.scan", context=str(md_file)):
+        ...
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger('analytics-logger')
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / '30-data' / 'database' / 'analytics.db'
+
+INSERT_SQL = """
+    INSERT INTO tool_usage
+        (tool_name, execution_time, success, error_message, context, parameters, timestamp, user_session)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Queue-full policies
+DROP = 'drop'
+BLOCK = 'block'
+
+_STOP = object()
+
+
+class ToolUsageLogger:
+    """Bounded write-behind queue in front of analytics.db `tool_usage`.
+
+    `log()` only builds a tuple and enqueues it; timestamps are formatted and
+    parameters serialized on the writer thread. When the queue is full the
+    `drop` policy discards the event (counted in `dropped`) while `block`
+    applies backpressure for up to `block_timeout` seconds before dropping.
+    """
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH, max_queue: int = 10000,
+                 batch_size: int = 500, flush_interval: float = 0.5,
+                 policy: str = DROP, block_timeout: float = 1.0,
+                 session: Optional[str] = None):
+        if policy not in (DROP, BLOCK):
+            raise ValueError(f"Unknown queue policy: {policy}")
+
+        self.db_path = Path(db_path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.session = session or f"{os.getpid()}-{int(time.time())}"
+
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='tool-usage-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def log(self, tool_name: str, execution_time: Optional[float] = None, success: bool = True,
+            error_message: Optional[str] = None, context: Optional[str] = None,
+            parameters: Optional[Dict[str, Any]] = None) -> bool:
+        """Enqueue one event. Returns False if the event was dropped."""
+        if self._closed:
+            self.dropped += 1
+            return False
+
+        event = (tool_name, execution_time, success, error_message, context, parameters, time.time())
+        try:
+            if self.policy == BLOCK:
+                self._queue.put(event, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    @contextmanager
+    def timed(self, tool_name: str, context: Optional[str] = None,
+              parameters: Optional[Dict[str, Any]] = None):
+        """Time the enclosed block and log it, recording any exception raised."""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.log(tool_name, time.perf_counter() - start, False, str(e), context, parameters)
+            raise
+        self.log(tool_name, time.perf_counter() - start, True, None, context, parameters)
+
+    def flush(self, timeout: Optional[float] = None):
+        """Block until every event enqueued so far has been written.
+
+        Returns immediately once the logger is closed: close() already
+        flushed, and no writer is left to answer.
+        """
+        if self._closed or not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done, timeout=timeout)
+        done.wait(timeout)
+
+    def close(self, timeout: float = 10.0):
+        """Flush pending events and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        atexit.unregister(self.close)
+
+    def _row(self, event) -> tuple:
+        tool_name, execution_time, success, error_message, context, parameters, ts = event
+        if parameters is not None and not isinstance(parameters, str):
+            parameters = json.dumps(parameters, default=str)
+        return (tool_name, execution_time, bool(success), error_message, context, parameters,
+                datetime.fromtimestamp(ts).isoformat(), self.session)
+
+    def _write(self, conn: Optional[sqlite3.Connection], batch) -> Optional[sqlite3.Connection]:
+        if not batch:
+            return conn
+        try:
+            if conn is None:
+                conn = sqlite3.connect(self.db_path)
+                conn.execute("PRAGMA busy_timeout = 5000")
+            with conn:
+                conn.executemany(INSERT_SQL, [self._row(event) for event in batch])
+            self.written += len(batch)
+        except sqlite3.Error as e:
+            self.failed += len(batch)
+            logger.warning(f"Could not write {len(batch)} tool usage events: {e}")
+        return conn
+
+    def _run(self):
+        conn = None
+        running = True
+        while running:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            batch, waiters = [], []
+            while True:
+                if item is _STOP:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+
+                if not running or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            conn = self._write(conn, batch)
+            for waiter in waiters:
+                waiter.set()
+
+        # Drain anything enqueued concurrently with close()
+        leftover = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is not _STOP:
+                leftover.append(item)
+        conn = self._write(conn, leftover)
+
+        if conn is not None:
+            conn.close()
+
+
+_default_logger: Optional[ToolUsageLogger] = None
+_default_lock = threading.Lock()
+
+
+def get_logger(db_path: Path = DEFAULT_DB_PATH) -> ToolUsageLogger:
+    """Return the process-wide logger, starting it on first use."""
+    global _default_logger
+    if _default_logger is None:
+        with _default_lock:
+            if _default_logger is None:
+                _default_logger = ToolUsageLogger(db_path)
+    return _default_logger
+
+
+def log_tool_usage(tool_name: str, execution_time: Optional[float] = None, success: bool = True,
+                   error_message: Optional[str] = None, context: Optional[str] = None,
+                   parameters: Optional[Dict[str, Any]] = None) -> bool:
+    """Enqueue a tool usage event on the process-wide logger."""
+    return get_logger().log(tool_name, execution_time, success, error_message, context, parameters)
+
+
+def timed(tool_name: str, context: Optional[str] = None, parameters: Optional[Dict[str, Any]] = None):
+    """Context manager timing a block on the process-wide logger."""
+    return get_logger().timed(tool_name, context, parameters)
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Tool Usage Retention Job
+
+Keeps the `tool_usage` table in analytics.db small by rolling raw rows older
+than a retention window into hourly and daily summary tables, deleting the
+raw rows in chunked transactions and reclaiming free pages with incremental
+vacuum.
+
+Usage:
+    analytics_retention.py [options]
+
+Examples:
+    analytics_retention.py --keep-days 30
+    analytics_retention.py --keep-days 7 --chunk-size 10000 --dry-run
+"""
+
+import argparse
+import logging
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s'
+)
+logger = logging.getLogger('analytics-retention')
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / '30-data' / 'database' / 'analytics.db'
+
+# Bucket formats understood by SQLite's strftime()
+ROLLUPS = {
+    'tool_usage_hourly': '%Y-%m-%d %H:00:00',
+    'tool_usage_daily': '%Y-%m-%d',
+}
+
+SUMMARY_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        bucket TEXT NOT NULL,
+        tool_name TEXT NOT NULL,
+        success BOOLEAN NOT NULL,
+        calls INTEGER NOT NULL DEFAULT 0,
+        timed_calls INTEGER NOT NULL DEFAULT 0,
+        total_time REAL NOT NULL DEFAULT 0,
+        min_time REAL,
+        max_time REAL,
+        PRIMARY KEY (bucket, tool_name, success)
+    ) WITHOUT ROWID
+"""
+
+ROLLUP_SQL = """
+    INSERT INTO {table}
+        (bucket, tool_name, success, calls, timed_calls, total_time, min_time, max_time)
+    SELECT strftime('{fmt}', u.timestamp), u.tool_name, u.success,
+           COUNT(*), COUNT(u.execution_time), COALESCE(SUM(u.execution_time), 0),
+           MIN(u.execution_time), MAX(u.execution_time)
+    FROM tool_usage u JOIN temp.retention_batch b ON b.id = u.id
+    WHERE strftime('{fmt}', u.timestamp) IS NOT NULL
+    GROUP BY 1, 2, 3
+    ON CONFLICT (bucket, tool_name, success) DO UPDATE SET
+        calls = calls + excluded.calls,
+        timed_calls = timed_calls + excluded.timed_calls,
+        total_time = total_time + excluded.total_time,
+        min_time = CASE WHEN min_time IS NULL OR excluded.min_time < min_time
+                        THEN excluded.min_time ELSE min_time END,
+        max_time = CASE WHEN max_time IS NULL OR excluded.max_time > max_time
+                        THEN excluded.max_time ELSE max_time END
+"""
+
+# Rows older than :cutoff. Timestamps written with a space instead of 'T'
+# (SQLite's CURRENT_TIMESTAMP style) are compared as if they used 'T'; the
+# plain range test first keeps idx_tool_usage_timestamp usable, since ' '
+# sorts before 'T' and so never excludes an expired row.
+EXPIRED_SQL = "timestamp < :cutoff AND replace(timestamp, ' ', 'T') < :cutoff"
+
+
+class ToolUsageRetention:
+    """Rolls up and prunes raw `tool_usage` rows in analytics.db."""
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH, keep_days: int = 30,
+                 chunk_size: int = 5000, dry_run: bool = False):
+        self.db_path = Path(db_path)
+        self.keep_days = keep_days
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode so each chunk controls its own transaction
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout = 5000")
+        return conn
+
+    def ensure_summary_tables(self, conn: sqlite3.Connection):
+        """Create the hourly and daily summary tables if they are missing."""
+        for table in ROLLUPS:
+            conn.execute(SUMMARY_TABLE_SQL.format(table=table))
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS retention_batch (id INTEGER PRIMARY KEY)")
+
+    def cutoff(self, now: Optional[datetime] = None) -> str:
+        """Return the timestamp before which raw rows are rolled up.
+
+        Formatted the way analytics_logger stores timestamps (local time via
+        datetime.fromtimestamp(...).isoformat(), microseconds included), so it
+        compares correctly as a string. The window is subtracted in epoch
+        seconds, so a DST change inside it does not shift the cutoff an hour.
+        """
+        now_ts = now.timestamp() if now is not None else time.time()
+        return datetime.fromtimestamp(now_ts - self.keep_days * 86400).isoformat()
+
+    def compact(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Roll up expired rows chunk by chunk and delete them."""
+        cutoff = self.cutoff(now)
+        stats = {'rows_rolled_up': 0, 'chunks': 0}
+
+        conn = self._connect()
+        try:
+            if self.dry_run:
+                expired = conn.execute(
+                    f"SELECT COUNT(*) FROM tool_usage WHERE {EXPIRED_SQL}", {'cutoff': cutoff}
+                ).fetchone()[0]
+                logger.info(f"📋 Would roll up {expired} rows older than {cutoff}")
+                stats['rows_rolled_up'] = expired
+                return stats
+
+            self.ensure_summary_tables(conn)
+
+            while True:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.execute("DELETE FROM temp.retention_batch")
+                    batch = conn.execute(f"""
+                        INSERT INTO temp.retention_batch (id)
+                        SELECT id FROM tool_usage WHERE {EXPIRED_SQL} LIMIT :limit
+                    """, {'cutoff': cutoff, 'limit': self.chunk_size}).rowcount
+
+                    if batch == 0:
+                        conn.execute("COMMIT")
+                        break
+
+                    for table, fmt in ROLLUPS.items():
+                        conn.execute(ROLLUP_SQL.format(table=table, fmt=fmt))
+                    conn.execute(
+                        "DELETE FROM tool_usage WHERE id IN (SELECT id FROM temp.retention_batch)"
+                    )
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+
+                stats['rows_rolled_up'] += batch
+                stats['chunks'] += 1
+                logger.debug(f"Rolled up chunk {stats['chunks']} ({batch} rows)")
+        finally:
+            conn.close()
+
+        logger.info(f"🗜️  Rolled up {stats['rows_rolled_up']} rows in {stats['chunks']} chunks "
+                    f"(cutoff {cutoff})")
+        return stats
+
+    def incremental_vacuum(self, max_pages: int = 0) -> int:
+        """Release free pages back to the filesystem.
+
+        Databases created before incremental auto-vacuum was enabled are
+        converted once with a full VACUUM; afterwards only free pages are
+        released on each run. Returns the number of pages freed.
+        """
+        conn = self._connect()
+        try:
+            freelist_before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if self.dry_run:
+                logger.info(f"📋 Would release up to {freelist_before} free pages")
+                return 0
+
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                logger.info("🔧 Enabling incremental auto-vacuum (one-time full VACUUM)")
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+            else:
+                conn.execute(f"PRAGMA incremental_vacuum({int(max_pages)})").fetchall()
+
+            freed = freelist_before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+        finally:
+            conn.close()
+
+        logger.info(f"🧹 Released {freed} free pages")
+        return freed
+
+    def run(self, vacuum_pages: int = 0) -> Dict[str, int]:
+        """Run compaction followed by incremental vacuum."""
+        stats = self.compact()
+        stats['pages_freed'] = self.incremental_vacuum(vacuum_pages)
+        return stats
+
+
+def main() -> int:
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', type=Path, default=DEFAULT_DB_PATH, help='Path to analytics.db')
+    parser.add_argument('--keep-days', type=int, default=30, help='Days of raw rows to keep (default: 30)')
+    parser.add_argument('--chunk-size', type=int, default=5000, help='Rows per transaction (default: 5000)')
+    parser.add_argument('--vacuum-pages', type=int, default=0,
+                        help='Max pages to release per run (default: 0 = all free pages)')
+    parser.add_argument('--dry-run', action='store_true', help='Report what would be rolled up')
+    parser.add_argument('--verbose', action='store_true', help='Detailed output')
+
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    if not args.db.exists():
+        logger.error(f"❌ Database not found: {args.db}")
+        return 1
+
+    try:
+        retention = ToolUsageRetention(args.db, args.keep_days, args.chunk_size, args.dry_run)
+        stats = retention.run(args.vacuum_pages)
+        print(f"✅ Retention complete: {stats}")
+        return 0
+    except sqlite3.Error as e:
+        logger.error(f"Retention failed: {e}")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Offline arXiv Metadata Loader
+
+Streams a local arXiv metadata snapshot (JSON lines, one paper per line,
+optionally gzip-compressed, e.g. the public arxiv-metadata-oai-snapshot
+dump) into an indexed `arxiv_metadata` table inside 30-data/arxiv/cache.db.
+Records are upserted in chunked transactions while reading, so memory use
+stays constant regardless of dump size. Citation enrichment can then resolve
+arXiv ids and DOIs with local index lookups on air-gapped machines.
+
+Usage:
+    arxiv_dump_import.py <dump_file> [options]
+
+Examples:
+    arxiv_dump_import.py ~/data/arxiv-metadata-oai-snapshot.json.gz
+    arxiv_dump_import.py snapshot.jsonl --with-abstracts --chunk-size 50000
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional, TextIO
+
+from bibtex_import import normalize_arxiv_id, normalize_doi
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s'
+)
+logger = logging.getLogger('arxiv-dump-import')
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent.parent / '30-data' / 'arxiv' / 'cache.db'
+
+METADATA_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS arxiv_metadata (
+        arxiv_id TEXT PRIMARY KEY,
+        doi TEXT,
+        title TEXT,
+        authors TEXT,
+        categories TEXT,
+        journal_ref TEXT,
+        latest_version TEXT,
+        update_date TEXT,
+        abstract TEXT
+    )
+"""
+
+DOI_INDEX_SQL = "CREATE INDEX IF NOT EXISTS arxiv_metadata_doi ON arxiv_metadata(doi)"
+
+UPSERT_SQL = """
+    INSERT INTO arxiv_metadata
+        (arxiv_id, doi, title, authors, categories, journal_ref, latest_version, update_date, abstract)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (arxiv_id) DO UPDATE SET
+        doi = excluded.doi,
+        title = excluded.title,
+        authors = excluded.authors,
+        categories = excluded.categories,
+        journal_ref = excluded.journal_ref,
+        latest_version = excluded.latest_version,
+        update_date = excluded.update_date,
+        abstract = COALESCE(excluded.abstract, abstract)
+"""
+
+COLUMNS = ('arxiv_id', 'doi', 'title', 'authors', 'categories', 'journal_ref',
+           'latest_version', 'update_date', 'abstract')
+
+
+def open_dump(path: Path) -> TextIO:
+    """Open a JSON-lines dump, transparently handling gzip compression."""
+    with open(path, 'rb') as f:
+        magic = f.read(2)
+    if magic == b'\x1f\x8b':
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def _clean(value: Optional[str]) -> Optional[str]:
+    return ' '.join(value.split()) if value else None
+
+
+class ArxivMetadataStore:
+    """Local arXiv metadata index keyed by arXiv id with a DOI index."""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(METADATA_TABLE_SQL)
+
+    def record_to_row(self, record: Dict, with_abstract: bool = False) -> Optional[tuple]:
+        """Map one snapshot record onto an `arxiv_metadata` row."""
+        arxiv_id = normalize_arxiv_id(record.get('id'))
+        if not arxiv_id:
+            return None
+        versions = record.get('versions') or []
+        latest = versions[-1].get('version') if versions and isinstance(versions[-1], dict) else None
+        return (
+            arxiv_id,
+            normalize_doi(record.get('doi')),
+            _clean(record.get('title')),
+            _clean(record.get('authors')),
+            record.get('categories'),
+            _clean(record.get('journal-ref')),
+            latest,
+            record.get('update_date'),
+            _clean(record.get('abstract')) if with_abstract else None,
+        )
+
+    def iter_rows(self, stream: TextIO, with_abstract: bool = False) -> Iterator[tuple]:
+        for line_number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = self.record_to_row(json.loads(line), with_abstract)
+            except (json.JSONDecodeError, AttributeError, TypeError) as e:
+                logger.debug(f"Skipping malformed record on line {line_number}: {e}")
+                continue
+            if row is not None:
+                yield row
+
+    def load_dump(self, dump_path: Path, chunk_size: int = 20000,
+                  with_abstract: bool = False) -> Dict[str, int]:
+        """Stream ``dump_path`` into the table in chunked transactions."""
+        stats = {'records': 0, 'chunks': 0}
+        started = time.time()
+
+        fresh = self._conn.execute("SELECT NOT EXISTS (SELECT 1 FROM arxiv_metadata)").fetchone()[0]
+        if fresh:
+            # Building the secondary index once after the load is cheaper than maintaining it per row
+            self._conn.execute("DROP INDEX IF EXISTS arxiv_metadata_doi")
+        else:
+            self._conn.execute(DOI_INDEX_SQL)
+        self._conn.execute("PRAGMA synchronous = OFF")
+
+        chunk = []
+        try:
+            with open_dump(dump_path) as stream:
+                for row in self.iter_rows(stream, with_abstract):
+                    chunk.append(row)
+                    if len(chunk) >= chunk_size:
+                        self._write_chunk(chunk, stats)
+                if chunk:
+                    self._write_chunk(chunk, stats)
+        finally:
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+            self._conn.execute(DOI_INDEX_SQL)
+            self._conn.commit()
+
+        logger.info(f"📥 Loaded {stats['records']} records in {stats['chunks']} chunks "
+                    f"({time.time() - started:.1f}s)")
+        return stats
+
+    def _write_chunk(self, chunk: list, stats: Dict[str, int]):
+        with self._conn:
+            self._conn.executemany(UPSERT_SQL, chunk)
+        stats['records'] += len(chunk)
+        stats['chunks'] += 1
+        if stats['chunks'] % 10 == 0:
+            logger.info(f"  … {stats['records']} records")
+        chunk.clear()
+
+    def get_by_arxiv_id(self, arxiv_id: str) -> Optional[Dict]:
+        """Look up a paper by arXiv id (prefixes and version suffixes are ignored)."""
+        arxiv_id = normalize_arxiv_id(arxiv_id)
+        if not arxiv_id:
+            return None
+        row = self._conn.execute("SELECT * FROM arxiv_metadata WHERE arxiv_id = ?", (arxiv_id,)).fetchone()
+        return dict(row) if row else None
+
+    def get_by_doi(self, doi: str) -> Optional[Dict]:
+        """Look up a paper by DOI (URL and ``doi:`` prefixes are ignored)."""
+        doi = normalize_doi(doi)
+        if not doi:
+            return None
+        row = self._conn.execute("SELECT * FROM arxiv_metadata WHERE doi = ?", (doi,)).fetchone()
+        return dict(row) if row else None
+
+    def close(self):
+        self._conn.close()
+
+
+def main() -> int:
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('dump_file', type=Path, help='arXiv metadata snapshot (.json/.jsonl, optionally .gz)')
+    parser.add_argument('--cache-db', type=Path, default=DEFAULT_CACHE_PATH, help='Target cache.db')
+    parser.add_argument('--chunk-size', type=int, default=20000, help='Records per transaction')
+    parser.add_argument('--with-abstracts', action='store_true', help='Also store abstracts (much larger)')
+    parser.add_argument('--verbose', action='store_true', help='Detailed output')
+
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    if not args.dump_file.exists():
+        logger.error(f"❌ Dump file not found: {args.dump_file}")
+        return 1
+
+    try:
+        store = ArxivMetadataStore(args.cache_db)
+        stats = store.load_dump(args.dump_file, args.chunk_size, args.with_abstracts)
+        store.close()
+        print(f"✅ arXiv metadata import complete: {stats}")
+        return 0
+    except (OSError, sqlite3.Error) as e:
+        logger.error(f"Import failed: {e}")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+BibTeX Importer for citations.db
+
+Streams the central bibliography (10-knowledge/literature/library.bib) one
+entry at a time, normalizes DOIs and arXiv identifiers and bulk-upserts the
+entries into the `citations` table of citations.db in a single transaction.
+Each entry's content hash is remembered so re-imports only touch entries
+that were added or changed.
+
+Usage:
+    bibtex_import.py [options]
+
+Examples:
+    bibtex_import.py
+    bibtex_import.py --bib exports/zotero.bib --full
+    bibtex_import.py --dry-run --verbose
+"""
+
+import argparse
+import hashlib
+import logging
+import re
+import sqlite3
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, TextIO
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s'
+)
+logger = logging.getLogger('bibtex-import')
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BIB_PATH = REPO_ROOT / '10-knowledge' / 'literature' / 'library.bib'
+DEFAULT_DB_PATH = REPO_ROOT / '30-data' / 'database' / 'citations.db'
+
+# BibTeX entry types mapped onto the citations.citation_type CHECK constraint
+CITATION_TYPES = {
+    'article': 'journal',
+    'inproceedings': 'conference',
+    'conference': 'conference',
+    'proceedings': 'conference',
+    'book': 'book',
+    'inbook': 'book',
+    'incollection': 'book',
+    'booklet': 'book',
+    'phdthesis': 'thesis',
+    'mastersthesis': 'thesis',
+    'thesis': 'thesis',
+    'online': 'web',
+    'electronic': 'web',
+    'www': 'web',
+}
+
+MONTH_MACROS = {
+    'jan': 'January', 'feb': 'February', 'mar': 'March', 'apr': 'April',
+    'may': 'May', 'jun': 'June', 'jul': 'July', 'aug': 'August',
+    'sep': 'September', 'oct': 'October', 'nov': 'November', 'dec': 'December',
+}
+
+DOI_PREFIX_RE = re.compile(r'^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)', re.IGNORECASE)
+ARXIV_ID_RE = re.compile(
+    r'(?:arxiv[:/\s]*|arxiv\.org/(?:abs|pdf)/)?'
+    r'(\d{4}\.\d{4,5}|[a-z\-]+(?:\.[A-Z]{2})?/\d{7})(?:v\d+)?',
+    re.IGNORECASE
+)
+ARXIV_HINT_RE = re.compile(r'arxiv', re.IGNORECASE)
+
+# Delimiters tracked while looking for the end of an entry (escapes are skipped)
+BRACE_RE = re.compile(r'\\.|[{}]')
+PAREN_RE = re.compile(r'\\.|[{}()]')
+
+IMPORT_STATE_SQL = """
+    CREATE TABLE IF NOT EXISTS citation_import_state (
+        citation_key TEXT PRIMARY KEY,
+        entry_hash TEXT NOT NULL,
+        source_file TEXT,
+        imported_date TEXT NOT NULL
+    )
+"""
+
+UPSERT_CITATION_SQL = """
+    INSERT INTO citations
+        (citation_key, title, authors, year, journal, volume, pages, doi, url,
+         arxiv_id, citation_type, added_date, notes)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (citation_key) DO UPDATE SET
+        title = excluded.title,
+        authors = excluded.authors,
+        year = excluded.year,
+        journal = excluded.journal,
+        volume = excluded.volume,
+        pages = excluded.pages,
+        doi = excluded.doi,
+        url = excluded.url,
+        arxiv_id = excluded.arxiv_id,
+        citation_type = excluded.citation_type,
+        notes = excluded.notes
+"""
+
+UPSERT_STATE_SQL = """
+    INSERT INTO citation_import_state (citation_key, entry_hash, source_file, imported_date)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (citation_key) DO UPDATE SET
+        entry_hash = excluded.entry_hash,
+        source_file = excluded.source_file,
+        imported_date = excluded.imported_date
+"""
+
+
+@dataclass
+class BibEntry:
+    """A single parsed BibTeX entry."""
+    entry_type: str
+    key: str
+    fields: Dict[str, str] = field(default_factory=dict)
+    entry_hash: str = ''
+
+
+def normalize_doi(value: Optional[str]) -> Optional[str]:
+    """Return a bare, lower-case DOI (``10.xxxx/yyy``) or None."""
+    if not value:
+        return None
+    doi = DOI_PREFIX_RE.sub('', value.strip()).strip().rstrip('.')
+    if not doi.startswith('10.'):
+        return None
+    return doi.lower()
+
+
+def normalize_arxiv_id(value: Optional[str]) -> Optional[str]:
+    """Return an arXiv identifier without prefix or version suffix, or None."""
+    if not value:
+        return None
+    match = ARXIV_ID_RE.search(value.strip())
+    return match.group(1) if match else None
+
+
+def _clean_value(value: str) -> str:
+    """Strip protective braces and collapse whitespace."""
+    value = value.replace('{', '').replace('}', '')
+    return ' '.join(value.split())
+
+
+class BibTeXParser:
+    """Streaming BibTeX parser.
+
+    Reads the input line by line and only ever buffers the entry currently
+    being parsed, so memory stays bounded by the largest single entry rather
+    than the file size. ``@string`` macros are collected and expanded;
+    ``@comment`` and ``@preamble`` blocks are skipped.
+    """
+
+    def __init__(self):
+        self.macros = dict(MONTH_MACROS)
+
+    def iter_entries(self, stream: TextIO) -> Iterator[BibEntry]:
+        """Yield entries from an open text stream."""
+        buffer: List[str] = []
+        depth = 0
+        opener = closer = ''
+
+        for line in stream:
+            pos = 0
+            while pos < len(line):
+                if not buffer:
+                    at = line.find('@', pos)
+                    if at == -1:
+                        break
+                    open_pos = self._find_opener(line, at)
+                    if open_pos == -1:
+                        # Entry header split across lines is not valid BibTeX; skip the '@'
+                        pos = at + 1
+                        continue
+                    opener = line[open_pos]
+                    closer = '}' if opener == '{' else ')'
+                    buffer.append(line[at:open_pos + 1])
+                    depth = 1
+                    pos = open_pos + 1
+                    continue
+
+                end = self._scan(line, pos, depth, opener, closer)
+                if end < 0:
+                    depth = -end
+                    buffer.append(line[pos:])
+                    break
+
+                buffer.append(line[pos:end + 1])
+                pos = end + 1
+                entry = self._parse_entry(''.join(buffer))
+                buffer = []
+                if entry is not None:
+                    yield entry
+
+    @staticmethod
+    def _find_opener(line: str, at: int) -> int:
+        for i in range(at + 1, len(line)):
+            ch = line[i]
+            if ch in '{(':
+                return i
+            if not (ch.isalnum() or ch in ' \t_-'):
+                return -1
+        return -1
+
+    @staticmethod
+    def _scan(line: str, pos: int, depth: int, opener: str, closer: str) -> int:
+        """Return the index closing the entry, or -depth if the line ends first."""
+        pattern = BRACE_RE if opener == '{' else PAREN_RE
+        for match in pattern.finditer(line, pos):
+            ch = match.group(0)
+            if ch in '{(':
+                depth += 1
+            elif ch in '})':
+                depth -= 1
+                if depth == 0:
+                    return match.start()
+        return -depth
+
+    def _parse_entry(self, raw: str) -> Optional[BibEntry]:
+        open_pos = min(p for p in (raw.find('{'), raw.find('(')) if p != -1)
+        entry_type = raw[1:open_pos].strip().lower()
+        body = raw[open_pos + 1:-1]
+
+        if entry_type in ('comment', 'preamble'):
+            return None
+        if entry_type == 'string':
+            for name, value in self._parse_fields(body):
+                self.macros[name] = value
+            return None
+
+        key, sep, rest = body.partition(',')
+        key = key.strip()
+        if not key or not sep:
+            logger.debug(f"Skipping @{entry_type} entry without a key")
+            return None
+
+        fields = {name: _clean_value(value) for name, value in self._parse_fields(rest)}
+        entry_hash = hashlib.sha1(' '.join(raw.split()).encode('utf-8')).hexdigest()
+        return BibEntry(entry_type, key, fields, entry_hash)
+
+    def _parse_fields(self, text: str) -> Iterator[tuple]:
+        """Yield (name, value) pairs from ``name = value, ...`` text."""
+        i, n = 0, len(text)
+        while i < n:
+            eq = text.find('=', i)
+            if eq == -1:
+                return
+            name = text[i:eq].strip().strip(',').strip().lower()
+            i = eq + 1
+            parts = []
+            while i < n:
+                while i < n and text[i].isspace():
+                    i += 1
+                if i >= n:
+                    break
+                ch = text[i]
+                if ch == '{':
+                    depth, j = 1, i + 1
+                    while j < n and depth:
+                        if text[j] == '\\':
+                            j += 2
+                            continue
+                        depth += {'{': 1, '}': -1}.get(text[j], 0)
+                        j += 1
+                    parts.append(text[i + 1:j - 1])
+                    i = j
+                elif ch == '"':
+                    depth, j = 0, i + 1
+                    while j < n and not (text[j] == '"' and depth == 0):
+                        if text[j] == '\\':
+                            j += 2
+                            continue
+                        depth += {'{': 1, '}': -1}.get(text[j], 0)
+                        j += 1
+                    parts.append(text[i + 1:j])
+                    i = j + 1
+                else:
+                    j = i
+                    while j < n and text[j] not in ',#':
+                        j += 1
+                    token = text[i:j].strip()
+                    parts.append(self.macros.get(token.lower(), token))
+                    i = j
+
+                while i < n and text[i].isspace():
+                    i += 1
+                if i < n and text[i] == '#':
+                    i += 1
+                    continue
+                break
+
+            while i < n and text[i] != ',':
+                i += 1
+            i += 1
+            if name:
+                yield name, ''.join(parts)
+
+
+class CitationImporter:
+    """Bulk-upserts parsed BibTeX entries into citations.db."""
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH, batch_size: int = 1000,
+                 dry_run: bool = False):
+        self.db_path = Path(db_path)
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database; a dry run opens it read-only and never creates it."""
+        if not self.dry_run:
+            return sqlite3.connect(self.db_path)
+        if not self.db_path.exists():
+            return sqlite3.connect(':memory:')
+        return sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)
+
+    @staticmethod
+    def _has_table(conn: sqlite3.Connection, name: str) -> bool:
+        return conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+    def entry_to_row(self, entry: BibEntry, today: str) -> tuple:
+        """Map a BibTeX entry onto a `citations` row."""
+        f = entry.fields
+
+        doi = normalize_doi(f.get('doi'))
+        arxiv_id = None
+        if f.get('archiveprefix', '').lower() == 'arxiv' or ARXIV_HINT_RE.search(f.get('eprinttype', '')):
+            arxiv_id = normalize_arxiv_id(f.get('eprint'))
+        for source in ('arxiv', 'arxivid', 'journal', 'url', 'note'):
+            if arxiv_id:
+                break
+            if ARXIV_HINT_RE.search(f.get(source, '')) or source in ('arxiv', 'arxivid'):
+                arxiv_id = normalize_arxiv_id(f.get(source))
+        if not doi and f.get('url'):
+            doi = normalize_doi(f['url'])
+
+        citation_type = CITATION_TYPES.get(entry.entry_type)
+        if citation_type is None:
+            if arxiv_id:
+                citation_type = 'preprint'
+            elif f.get('url') and entry.entry_type == 'misc':
+                citation_type = 'web'
+
+        authors = '; '.join(a.strip() for a in re.split(r'\s+and\s+', f.get('author', f.get('editor', '')))
+                            if a.strip())
+        year_match = re.search(r'\d{4}', f.get('year', f.get('date', '')))
+
+        return (
+            entry.key,
+            f.get('title') or entry.key,
+            authors or 'Unknown',
+            int(year_match.group(0)) if year_match else None,
+            f.get('journal') or f.get('journaltitle') or f.get('booktitle') or f.get('publisher'),
+            f.get('volume'),
+            f.get('pages'),
+            doi,
+            f.get('url'),
+            arxiv_id,
+            citation_type,
+            today,
+            f.get('note') or f.get('abstract'),
+        )
+
+    def import_file(self, bib_path: Path, full: bool = False) -> Dict[str, int]:
+        """Import a .bib file, skipping unchanged entries unless ``full``."""
+        bib_path = Path(bib_path)
+        today = datetime.now().strftime('%Y-%m-%d')
+        stats = {'entries': 0, 'imported': 0, 'unchanged': 0, 'duplicates': 0}
+
+        conn = self._connect()
+        try:
+            if not self.dry_run:
+                conn.execute(IMPORT_STATE_SQL)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_citations_doi ON citations(doi)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_citations_arxiv ON citations(arxiv_id)")
+            known = {}
+            if not full and self._has_table(conn, 'citation_import_state'):
+                known = dict(conn.execute("SELECT citation_key, entry_hash FROM citation_import_state"))
+            seen = set()
+            citation_rows, state_rows = [], []
+
+            def flush():
+                if not self.dry_run and citation_rows:
+                    conn.executemany(UPSERT_CITATION_SQL, citation_rows)
+                    conn.executemany(UPSERT_STATE_SQL, state_rows)
+                citation_rows.clear()
+                state_rows.clear()
+
+            parser = BibTeXParser()
+            with open(bib_path, 'r', encoding='utf-8', errors='replace') as stream:
+                # sqlite3 opens the transaction implicitly on the first upsert
+                for entry in parser.iter_entries(stream):
+                    stats['entries'] += 1
+                    if entry.key in seen:
+                        stats['duplicates'] += 1
+                        logger.warning(f"⚠️  Duplicate citation key: {entry.key}")
+                        continue
+                    seen.add(entry.key)
+
+                    if known.get(entry.key) == entry.entry_hash:
+                        stats['unchanged'] += 1
+                        continue
+
+                    citation_rows.append(self.entry_to_row(entry, today))
+                    state_rows.append((entry.key, entry.entry_hash, str(bib_path), today))
+                    stats['imported'] += 1
+                    if len(citation_rows) >= self.batch_size:
+                        flush()
+
+            flush()
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        action = "Would import" if self.dry_run else "Imported"
+        logger.info(f"📚 {action} {stats['imported']} of {stats['entries']} entries "
+                    f"({stats['unchanged']} unchanged, {stats['duplicates']} duplicate keys)")
+        return stats
+
+
+def main() -> int:
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bib', type=Path, default=DEFAULT_BIB_PATH, help='BibTeX file to import')
+    parser.add_argument('--db', type=Path, default=DEFAULT_DB_PATH, help='Path to citations.db')
+    parser.add_argument('--full', action='store_true', help='Re-import every entry, ignoring stored hashes')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Rows per executemany call')
+    parser.add_argument('--dry-run', action='store_true', help='Parse and report without writing')
+    parser.add_argument('--verbose', action='store_true', help='Detailed output')
+
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    for path in (args.bib, args.db):
+        if not path.exists():
+            logger.error(f"❌ Not found: {path}")
+            return 1
+
+    try:
+        importer = CitationImporter(args.db, args.batch_size, args.dry_run)
+        stats = importer.import_file(args.bib, full=args.full)
+        print(f"✅ Bibliography import complete: {stats}")
+        return 0
+    except (OSError, sqlite3.Error) as e:
+        logger.error(f"Import failed: {e}")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Citation Usage Indexer
+
+Populates the `citation_usage` table of citations.db with the notes that
+cite each known paper. Every citation key, DOI and arXiv id in `citations`
+is compiled into a single Aho-Corasick automaton, so each note is scanned in
+one pass regardless of how many citations exist. Notes are only rescanned
+when their content (or the citation catalog) changed since the last run.
+
+Usage:
+    citation_usage.py [options]
+
+Examples:
+    citation_usage.py
+    citation_usage.py --full --verbose
+    citation_usage.py --paths 10-knowledge 20-projects
+"""
+
+import argparse
+import hashlib
+import logging
+import sqlite3
+import sys
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s'
+)
+logger = logging.getLogger('citation-usage')
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_DB_PATH = REPO_ROOT / '30-data' / 'database' / 'citations.db'
+
+SKIP_DIRS = {'.git', '.venv', 'node_modules', '.kb', '__pycache__'}
+
+# Characters that may not touch either end of a match. A '/' may precede a
+# match, so identifiers cited as URLs (https://doi.org/10..., arxiv.org/abs/...)
+# are found; it may not follow one, so a DOI prefix does not match a longer DOI.
+WORD_CHARS = set('abcdefghijklmnopqrstuvwxyz0123456789_-/')
+LEFT_WORD_CHARS = WORD_CHARS - {'/'}
+MIN_KEY_LENGTH = 4
+CONTEXT_CHARS = 80
+
+SCAN_STATE_SQL = """
+    CREATE TABLE IF NOT EXISTS citation_scan_state (
+        content_file TEXT PRIMARY KEY,
+        mtime_ns INTEGER NOT NULL,
+        size INTEGER NOT NULL,
+        content_hash TEXT NOT NULL,
+        catalog_hash TEXT NOT NULL,
+        scanned_date TEXT NOT NULL
+    )
+"""
+
+UPSERT_USAGE_SQL = """
+    INSERT INTO citation_usage (citation_id, content_file, usage_context, usage_date)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (citation_id, content_file) DO UPDATE SET
+        usage_context = excluded.usage_context
+"""
+
+
+class CitationMatcher:
+    """Aho-Corasick automaton over lower-cased citation identifiers.
+
+    Matching is case-insensitive and linear in the length of the scanned
+    text plus the number of matches, independent of the pattern count.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[str, int]]] = [[]]
+        self._payload: Dict[str, Set[int]] = {}
+        self._built = False
+
+    def add(self, pattern: str, citation_id: int):
+        """Register a pattern that identifies ``citation_id``."""
+        pattern = pattern.strip().lower()
+        if not pattern:
+            return
+        self._payload.setdefault(pattern, set()).add(citation_id)
+        if len(self._payload[pattern]) > 1:
+            return
+
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((pattern, len(pattern)))
+        self._built = False
+
+    def build(self):
+        """Compute failure links (breadth-first)."""
+        queue = deque(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+        self._built = True
+
+    def __len__(self) -> int:
+        return len(self._payload)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield (start, end, pattern) for each bounded match in ``text``."""
+        if not self._built:
+            self.build()
+
+        lowered = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        n = len(lowered)
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            for pattern, length in out[state]:
+                start = i - length + 1
+                if start > 0 and lowered[start - 1] in LEFT_WORD_CHARS:
+                    continue
+                end = i + 1
+                # Tolerate arXiv version suffixes such as 2101.00001v2
+                if end < n and lowered[end] == 'v':
+                    j = end + 1
+                    while j < n and lowered[j].isdigit():
+                        j += 1
+                    if j > end + 1:
+                        end = j
+                # arxiv.org/pdf/<id>.pdf links
+                if lowered.startswith('.pdf', end):
+                    end += len('.pdf')
+                if end < n and (lowered[end] in WORD_CHARS or
+                                (lowered[end] == '.' and end + 1 < n and lowered[end + 1].isalnum())):
+                    continue
+                yield start, end, pattern
+
+    def citations_for(self, pattern: str) -> Set[int]:
+        return self._payload.get(pattern, set())
+
+
+class CitationUsageIndexer:
+    """Incrementally records which content files cite which papers."""
+
+    def __init__(self, base_path: Path = REPO_ROOT, db_path: Path = DEFAULT_DB_PATH,
+                 dry_run: bool = False):
+        self.base_path = Path(base_path)
+        self.db_path = Path(db_path)
+        self.dry_run = dry_run
+
+    def connect(self) -> sqlite3.Connection:
+        """Open citations.db; a dry run opens it read-only."""
+        if self.dry_run:
+            return sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)
+        return sqlite3.connect(self.db_path)
+
+    @staticmethod
+    def _has_table(conn: sqlite3.Connection, name: str) -> bool:
+        return conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+    def ensure_schema(self, conn: sqlite3.Connection):
+        conn.execute(SCAN_STATE_SQL)
+        conn.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_usage_citation_file
+            ON citation_usage(citation_id, content_file)
+        """)
+
+    def load_matcher(self, conn: sqlite3.Connection) -> Tuple[CitationMatcher, str]:
+        """Build the automaton from `citations` and fingerprint the catalog."""
+        matcher = CitationMatcher()
+        digest = hashlib.sha1()
+        rows = conn.execute("SELECT id, citation_key, doi, arxiv_id FROM citations ORDER BY id")
+        for citation_id, key, doi, arxiv_id in rows:
+            digest.update(f"{citation_id}\0{key}\0{doi}\0{arxiv_id}\n".encode('utf-8'))
+            if key and len(key) >= MIN_KEY_LENGTH:
+                matcher.add(key, citation_id)
+            if doi:
+                matcher.add(doi, citation_id)
+            if arxiv_id:
+                matcher.add(arxiv_id, citation_id)
+        matcher.build()
+        return matcher, digest.hexdigest()
+
+    def iter_content_files(self, paths: Optional[Iterable[Path]] = None) -> Iterator[Path]:
+        roots = [Path(p) if Path(p).is_absolute() else self.base_path / p for p in paths] if paths else [self.base_path]
+        for root in roots:
+            if root.is_file():
+                yield root
+                continue
+            for md_file in root.rglob("*.md"):
+                if SKIP_DIRS.intersection(md_file.relative_to(self.base_path).parts):
+                    continue
+                yield md_file
+
+    @staticmethod
+    def find_usages(matcher: CitationMatcher, text: str) -> Dict[int, str]:
+        """Return {citation_id: context of first occurrence} for ``text``."""
+        usages: Dict[int, str] = {}
+        for start, end, pattern in matcher.iter_matches(text):
+            ids = [cid for cid in matcher.citations_for(pattern) if cid not in usages]
+            if not ids:
+                continue
+            context = ' '.join(text[max(0, start - CONTEXT_CHARS):end + CONTEXT_CHARS].split())
+            for citation_id in ids:
+                usages[citation_id] = context
+        return usages
+
+    def run(self, paths: Optional[Iterable[Path]] = None, full: bool = False) -> Dict[str, int]:
+        """Scan changed content files and update `citation_usage`."""
+        today = datetime.now().strftime('%Y-%m-%d')
+        stats = {'files_seen': 0, 'files_scanned': 0, 'usages': 0, 'files_removed': 0}
+
+        conn = self.connect()
+        try:
+            if not self.dry_run:
+                self.ensure_schema(conn)
+            matcher, catalog_hash = self.load_matcher(conn)
+            logger.info(f"🔎 Loaded {len(matcher)} citation identifiers")
+
+            # Without a scan state table (dry run on a fresh database) every file counts as changed
+            state = {}
+            if self._has_table(conn, 'citation_scan_state'):
+                state = {row[0]: row[1:] for row in conn.execute(
+                    "SELECT content_file, mtime_ns, size, content_hash, catalog_hash FROM citation_scan_state")}
+            seen = set()
+
+            for md_file in self.iter_content_files(paths):
+                rel_path = str(md_file.relative_to(self.base_path))
+                seen.add(rel_path)
+                stats['files_seen'] += 1
+                try:
+                    st = md_file.stat()
+                    previous = state.get(rel_path)
+                    if (not full and previous and previous[3] == catalog_hash
+                            and previous[0] == st.st_mtime_ns and previous[1] == st.st_size):
+                        continue
+
+                    data = md_file.read_bytes()
+                except OSError as e:
+                    logger.warning(f"Could not read {md_file}: {e}")
+                    continue
+
+                content_hash = hashlib.sha1(data).hexdigest()
+                if not full and previous and previous[2] == content_hash and previous[3] == catalog_hash:
+                    # Touched but unchanged: refresh the stat fingerprint only
+                    if not self.dry_run:
+                        conn.execute("""
+                            UPDATE citation_scan_state SET mtime_ns = ?, size = ? WHERE content_file = ?
+                        """, (st.st_mtime_ns, st.st_size, rel_path))
+                    continue
+
+                usages = self.find_usages(matcher, data.decode('utf-8', errors='replace'))
+                stats['files_scanned'] += 1
+                stats['usages'] += len(usages)
+                logger.debug(f"{rel_path}: {len(usages)} citations")
+                if self.dry_run:
+                    continue
+
+                conn.execute(
+                    f"DELETE FROM citation_usage WHERE content_file = ? "
+                    f"AND citation_id NOT IN ({','.join('?' * len(usages))})",
+                    (rel_path, *usages))
+                conn.executemany(UPSERT_USAGE_SQL, [
+                    (citation_id, rel_path, context, today) for citation_id, context in usages.items()
+                ])
+                conn.execute("""
+                    INSERT OR REPLACE INTO citation_scan_state
+                        (content_file, mtime_ns, size, content_hash, catalog_hash, scanned_date)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (rel_path, st.st_mtime_ns, st.st_size, content_hash, catalog_hash, today))
+
+            # Forget files that disappeared (only when the whole tree was walked)
+            if not paths:
+                removed = [f for f in state if f not in seen]
+                stats['files_removed'] = len(removed)
+                if removed and not self.dry_run:
+                    conn.executemany("DELETE FROM citation_usage WHERE content_file = ?", [(f,) for f in removed])
+                    conn.executemany("DELETE FROM citation_scan_state WHERE content_file = ?", [(f,) for f in removed])
+
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        logger.info(f"📎 Scanned {stats['files_scanned']} of {stats['files_seen']} files, "
+                    f"recorded {stats['usages']} citation usages")
+        return stats
+
+
+def main() -> int:
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-path', type=Path, default=REPO_ROOT, help='Knowledge base root')
+    parser.add_argument('--db', type=Path, default=DEFAULT_DB_PATH, help='Path to citations.db')
+    parser.add_argument('--paths', nargs='+', type=Path, help='Only scan these files or directories')
+    parser.add_argument('--full', action='store_true', help='Rescan every file')
+    parser.add_argument('--dry-run', action='store_true', help='Scan without writing')
+    parser.add_argument('--verbose', action='store_true', help='Detailed output')
+
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    if not args.db.exists():
+        logger.error(f"❌ Database not found: {args.db}")
+        return 1
+
+    try:
+        indexer = CitationUsageIndexer(args.base_path.resolve(), args.db, args.dry_run)
+        stats = indexer.run(args.paths, full=args.full)
+        print(f"✅ Citation usage index updated: {stats}")
+        return 0
+    except sqlite3.Error as e:
+        logger.error(f"Indexing failed: {e}")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+SQLite Database Health Check
+
+Checks the knowledge base databases in 30-data/database in parallel: each
+database gets a `PRAGMA quick_check` on its own read-only connection, plus
+page count, freelist ratio and per-index statistics (size from the dbstat
+table, rows per key from sqlite_stat1). When a database passes the
+configured thresholds, maintenance is scheduled:
+
+- ANALYZE + PRAGMA optimize: an indexed table large enough to matter has
+  never been analyzed, or its row count drifted from the sqlite_stat1 estimate
+- incremental VACUUM: the freelist is a large share of the file (the first
+  run converts the database to incremental auto-vacuum with a full VACUUM)
+
+Scheduled maintenance is only reported unless --maintain is given.
+
+Usage:
+    db_health.py [options]
+
+Examples:
+    db_health.py
+    db_health.py --maintain --freelist-ratio 0.2
+    db_health.py --db-dir 30-data/database --json
+"""
+
+import argparse
+import json
+import logging
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s'
+)
+logger = logging.getLogger('db-health')
+
+DEFAULT_DB_DIR = Path(__file__).resolve().parent.parent / '30-data' / 'database'
+REQUIRED_DATABASES = ('knowledge.db', 'analytics.db', 'citations.db', 'workflows.db')
+
+ANALYZE = 'analyze'
+OPTIMIZE = 'optimize'
+INCREMENTAL_VACUUM = 'incremental_vacuum'
+
+
+@dataclass(frozen=True)
+class HealthThresholds:
+    """When to schedule maintenance."""
+    freelist_ratio: float = 0.10  # free pages / page count
+    min_free_pages: int = 16  # ignore fragmentation below this many free pages
+    stats_drift: float = 0.25  # relative row-count drift from sqlite_stat1
+    min_rows: int = 1000  # tables smaller than this never need statistics
+
+
+@dataclass
+class DatabaseHealth:
+    """Health report for one database file."""
+    name: str
+    path: str
+    exists: bool = True
+    quick_check: List[str] = field(default_factory=list)
+    page_size: int = 0
+    page_count: int = 0
+    freelist_count: int = 0
+    auto_vacuum: int = 0
+    indexes: List[Dict] = field(default_factory=list)
+    stale_tables: List[str] = field(default_factory=list)
+    scheduled: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.exists and self.error is None and self.quick_check == ['ok']
+
+    @property
+    def freelist_ratio(self) -> float:
+        return self.freelist_count / self.page_count if self.page_count else 0.0
+
+    def to_dict(self) -> Dict:
+        return dict(asdict(self), ok=self.ok, freelist_ratio=round(self.freelist_ratio, 4))
+
+
+def _index_stats(conn: sqlite3.Connection) -> List[Dict]:
+    """Size and selectivity of every user index."""
+    indexes = {name: {'name': name, 'table': table, 'pages': None, 'rows': None, 'rows_per_key': None}
+               for name, table in conn.execute(
+                   "SELECT name, tbl_name FROM sqlite_master WHERE type = 'index' ORDER BY name")}
+    try:
+        for name, pages in conn.execute("SELECT name, COUNT(*) FROM dbstat GROUP BY name"):
+            if name in indexes:
+                indexes[name]['pages'] = pages
+    except sqlite3.OperationalError:
+        pass  # SQLite built without the dbstat virtual table
+    if _has_table(conn, 'sqlite_stat1'):
+        for name, stat in conn.execute("SELECT idx, stat FROM sqlite_stat1 WHERE idx IS NOT NULL"):
+            if name in indexes and stat:
+                numbers = [int(n) for n in stat.split() if n.isdigit()]
+                if numbers:
+                    indexes[name]['rows'] = numbers[0]
+                    indexes[name]['rows_per_key'] = numbers[-1] if len(numbers) > 1 else None
+    return list(indexes.values())
+
+
+def _has_table(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+
+def _stale_tables(conn: sqlite3.Connection, drift: float, min_rows: int) -> List[str]:
+    """Indexed tables of at least ``min_rows`` rows whose sqlite_stat1 row
+    estimate is missing or off by more than ``drift``."""
+    indexed = [row[0] for row in conn.execute(
+        "SELECT DISTINCT tbl_name FROM sqlite_master WHERE type = 'index' AND tbl_name NOT LIKE 'sqlite_%'")]
+    estimates = {}
+    if _has_table(conn, 'sqlite_stat1'):
+        for table, stat in conn.execute("SELECT tbl, stat FROM sqlite_stat1"):
+            if stat and stat.split()[0].isdigit():
+                estimates[table] = int(stat.split()[0])
+
+    stale = []
+    for table in indexed:
+        actual = conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+        if max(actual, estimates.get(table, 0)) < min_rows:
+            continue
+        if table not in estimates:
+            stale.append(table)
+        elif abs(actual - estimates[table]) > drift * max(estimates[table], 1):
+            stale.append(table)
+    return stale
+
+
+def check_database(path: Path, thresholds: HealthThresholds = HealthThresholds()) -> DatabaseHealth:
+    """Quick-check one database read-only and decide which maintenance it needs."""
+    health = DatabaseHealth(path.name, str(path))
+    if not path.exists():
+        health.exists = False
+        return health
+
+    try:
+        conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            conn.execute("PRAGMA busy_timeout = 5000")
+            health.quick_check = [row[0] for row in conn.execute("PRAGMA quick_check")]
+            health.page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            health.page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            health.freelist_count = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            health.auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+            health.indexes = _index_stats(conn)
+            health.stale_tables = _stale_tables(conn, thresholds.stats_drift, thresholds.min_rows)
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        health.error = str(e)
+        return health
+
+    if health.stale_tables:
+        health.scheduled += [ANALYZE, OPTIMIZE]
+    if (health.freelist_count >= thresholds.min_free_pages
+            and health.freelist_ratio >= thresholds.freelist_ratio):
+        health.scheduled.append(INCREMENTAL_VACUUM)
+    return health
+
+
+def check_databases(db_dir: Path = DEFAULT_DB_DIR, names: Iterable[str] = REQUIRED_DATABASES,
+                    thresholds: HealthThresholds = HealthThresholds()) -> List[DatabaseHealth]:
+    """Check several databases concurrently (sqlite3 releases the GIL while it works)."""
+    paths = [Path(db_dir) / name for name in names]
+    with ThreadPoolExecutor(max_workers=max(1, len(paths))) as executor:
+        return list(executor.map(lambda path: check_database(path, thresholds), paths))
+
+
+def run_maintenance(health: DatabaseHealth, dry_run: bool = False) -> List[str]:
+    """Apply the maintenance scheduled for one database. Returns what was done."""
+    if not health.scheduled or not health.ok:
+        return []
+    if dry_run:
+        logger.info(f"📋 Would run {', '.join(health.scheduled)} on {health.name}")
+        return []
+
+    done = []
+    conn = sqlite3.connect(health.path, isolation_level=None)
+    try:
+        conn.execute("PRAGMA busy_timeout = 5000")
+        if ANALYZE in health.scheduled:
+            conn.execute("ANALYZE")
+            done.append(ANALYZE)
+        if OPTIMIZE in health.scheduled:
+            conn.execute("PRAGMA optimize")
+            done.append(OPTIMIZE)
+        if INCREMENTAL_VACUUM in health.scheduled:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                logger.info(f"🔧 Enabling incremental auto-vacuum on {health.name} (one-time full VACUUM)")
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+            else:
+                conn.execute("PRAGMA incremental_vacuum").fetchall()
+            done.append(INCREMENTAL_VACUUM)
+    finally:
+        conn.close()
+
+    logger.info(f"🧹 {health.name}: {', '.join(done)}")
+    return done
+
+
+def log_health(health: DatabaseHealth):
+    """Log one database's health summary."""
+    if not health.exists:
+        logger.warning(f"⚠️  Missing database: {health.name}")
+        return
+    if health.error:
+        logger.error(f"❌ {health.name}: {health.error}")
+        return
+    if not health.ok:
+        logger.error(f"❌ {health.name}: quick_check failed: {'; '.join(health.quick_check[:3])}")
+        return
+
+    logger.info(f"✅ {health.name}: {health.page_count} pages × {health.page_size}B, "
+                f"freelist {health.freelist_ratio:.1%}, {len(health.indexes)} indexes")
+    for index in health.indexes:
+        logger.debug(f"   {index['name']} on {index['table']}: pages={index['pages']} "
+                     f"rows={index['rows']} rows/key={index['rows_per_key']}")
+    if health.scheduled:
+        reasons = []
+        if health.stale_tables:
+            reasons.append(f"stale statistics for {', '.join(health.stale_tables)}")
+        if INCREMENTAL_VACUUM in health.scheduled:
+            reasons.append(f"{health.freelist_count} free pages")
+        logger.info(f"🗓️  {health.name}: scheduled {', '.join(health.scheduled)} ({'; '.join(reasons)})")
+
+
+def main() -> int:
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db-dir', type=Path, default=DEFAULT_DB_DIR, help='Directory holding the databases')
+    parser.add_argument('--freelist-ratio', type=float, default=HealthThresholds.freelist_ratio,
+                        help='Free page share that schedules incremental vacuum (default: 0.10)')
+    parser.add_argument('--min-free-pages', type=int, default=HealthThresholds.min_free_pages,
+                        help='Ignore fragmentation below this many free pages (default: 16)')
+    parser.add_argument('--stats-drift', type=float, default=HealthThresholds.stats_drift,
+                        help='Row-count drift from sqlite_stat1 that schedules ANALYZE (default: 0.25)')
+    parser.add_argument('--min-rows', type=int, default=HealthThresholds.min_rows,
+                        help='Only keep statistics for tables with at least this many rows (default: 1000)')
+    parser.add_argument('--maintain', action='store_true', help='Run the scheduled maintenance')
+    parser.add_argument('--dry-run', action='store_true', help='With --maintain, only report what would run')
+    parser.add_argument('--json', action='store_true', help='Print the health report as JSON')
+    parser.add_argument('--verbose', action='store_true', help='Detailed output')
+
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    thresholds = HealthThresholds(args.freelist_ratio, args.min_free_pages, args.stats_drift, args.min_rows)
+    results = check_databases(args.db_dir, thresholds=thresholds)
+    for health in results:
+        log_health(health)
+
+    if args.maintain:
+        try:
+            for health in results:
+                run_maintenance(health, args.dry_run)
+        except sqlite3.Error as e:
+            logger.error(f"Maintenance failed: {e}")
+            return 1
+
+    if args.json:
+        print(json.dumps([health.to_dict() for health in results], indent=2))
+    return 0 if all(health.ok for health in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
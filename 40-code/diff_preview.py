@@ -0,0 +1,99 @@
+"""
+Streaming previews of what a dry-run fix would change.
+
+Fixers hand each file's old and new text to format_patch() and pass the
+resulting string to a PatchWriter, which writes and flushes it immediately.
+Nothing is collected across files, so previewing a fix over thousands of
+notes starts producing output at once and uses memory proportional to the
+largest single file. Patches can be computed inside worker processes and
+written by the parent in input order.
+
+Formats:
+- ``unified``: a ``git apply``-compatible unified diff (``a/`` and ``b/``
+  prefixes, ``/dev/null`` for new files, rename headers for moves)
+- ``json``: one compact JSON object per file and line, e.g.
+  ``{"path": "x.md", "op": "modify", "edits": [["insert", 0, 0, ["---", ...]]]}``
+  where each edit is ``[tag, old_start, old_end, new_lines]`` over 0-based
+  line numbers of the old file
+"""
+
+import difflib
+import json
+import sys
+from typing import Optional, TextIO
+
+PATCH_FORMATS = ('unified', 'json')
+
+
+def format_patch(path: str, old: Optional[str], new: str, fmt: str = 'unified') -> str:
+    """Describe the change from ``old`` to ``new`` for ``path`` (relative, POSIX).
+
+    ``old`` is None when the file would be created. Returns an empty string
+    when the texts are identical.
+    """
+    if old == new:
+        return ''
+    old_lines = (old or '').splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+
+    if fmt == 'json':
+        matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+        edits = [[tag, i1, i2, [line.rstrip('\n') for line in new_lines[j1:j2]]]
+                 for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal']
+        record = {'path': path, 'op': 'create' if old is None else 'modify', 'edits': edits}
+        return json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+    fromfile = '/dev/null' if old is None else f'a/{path}'
+    header = f'diff --git a/{path} b/{path}\n'
+    if old is None:
+        header += 'new file mode 100644\n'
+    lines = difflib.unified_diff(old_lines, new_lines, fromfile, f'b/{path}')
+    # difflib leaves the last line unterminated when the file lacks a final newline
+    return header + ''.join(line if line.endswith('\n') else line + '\n\\ No newline at end of file\n'
+                            for line in lines)
+
+
+def format_rename(source: str, target: str, fmt: str = 'unified') -> str:
+    """Describe moving ``source`` to ``target`` without content changes."""
+    if fmt == 'json':
+        return json.dumps({'path': source, 'op': 'rename', 'to': target}, separators=(',', ':')) + '\n'
+    return (f'diff --git a/{source} b/{target}\n'
+            f'similarity index 100%\nrename from {source}\nrename to {target}\n')
+
+
+class PatchWriter:
+    """Writes per-file patches to a stream as soon as they are produced."""
+
+    def __init__(self, stream: TextIO = None, fmt: str = 'unified', owns_stream: bool = False):
+        if fmt not in PATCH_FORMATS:
+            raise ValueError(f"Unknown patch format: {fmt}")
+        self.stream = stream or sys.stdout
+        self.fmt = fmt
+        self.owns_stream = owns_stream
+        self.files = 0
+
+    def write(self, patch: str):
+        if not patch:
+            return
+        self.stream.write(patch)
+        self.stream.flush()
+        self.files += 1
+
+    def change(self, path: str, old: Optional[str], new: str):
+        self.write(format_patch(path, old, new, self.fmt))
+
+    def rename(self, source: str, target: str):
+        self.write(format_rename(source, target, self.fmt))
+
+    def close(self):
+        if self.owns_stream:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+
+def open_patch_writer(destination: str, fmt: str = 'unified') -> PatchWriter:
+    """PatchWriter for a ``--diff`` CLI value (``-`` means stdout)."""
+    if destination == '-':
+        return PatchWriter(sys.stdout, fmt)
+    return PatchWriter(open(destination, 'w', encoding='utf-8'), fmt, owns_stream=True)
@@ -0,0 +1,458 @@
+"""
+Persistent Read-Through Cache
+
+Implements get/set/memoize on top of 30-data/arxiv/cache.db, which uses the
+diskcache SQLite layout: a `Cache` table (key, raw, store_time, expire_time,
+access_time, access_count, tag, size, mode, value) and a `Settings` table
+whose `count` and `size` rows are maintained by triggers. Entries honour
+`expire_time`; when `Settings.size` exceeds `size_limit` the cache evicts by
+the configured policy (least-recently-stored, least-recently-used or
+least-frequently-used). Access bookkeeping for hits is buffered in memory and
+written back in batches instead of costing one write per read.
+
+Usage:
+    from disk_cache import DiskCache
+
+    cache = DiskCache()
+    cache.set(("doi", "10.1145/3290605.3300233"), metadata, expire=7 * 86400)
+    metadata = cache.get(("doi", "10.1145/3290605.3300233"))
+
+    @cache.memoize(expire=86400, tag="arxiv")
+    def fetch_arxiv_metadata(arxiv_id): ...
+
+    # Repeated lookups within a run: bounded in-process LRU in front of cache.db
+    tiered = TieredCache(cache, max_entries=4096)
+"""
+
+import functools
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger('disk-cache')
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent.parent / '30-data' / 'arxiv' / 'cache.db'
+
+# Value storage modes (diskcache compatible)
+MODE_NONE = 0
+MODE_RAW = 1
+MODE_BINARY = 2
+MODE_TEXT = 3
+MODE_PICKLE = 4
+
+EVICTION_ORDER = {
+    'least-recently-stored': 'store_time',
+    'least-recently-used': 'access_time',
+    'least-frequently-used': 'access_count',
+}
+
+DEFAULT_SETTINGS = {
+    'statistics': 0,
+    'tag_index': 0,
+    'eviction_policy': 'least-recently-stored',
+    'size_limit': 2 ** 30,
+    'cull_limit': 10,
+    'sqlite_auto_vacuum': 1,
+    'sqlite_cache_size': 2 ** 13,
+    'sqlite_journal_mode': 'wal',
+    'sqlite_mmap_size': 2 ** 26,
+    'sqlite_synchronous': 1,
+    'disk_min_file_size': 2 ** 15,
+    'disk_pickle_protocol': pickle.HIGHEST_PROTOCOL,
+}
+
+SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS Settings ( key TEXT NOT NULL UNIQUE, value);
+    CREATE TABLE IF NOT EXISTS Cache ( rowid INTEGER PRIMARY KEY, key BLOB, raw INTEGER,
+        store_time REAL, expire_time REAL, access_time REAL, access_count INTEGER DEFAULT 0,
+        tag BLOB, size INTEGER DEFAULT 0, mode INTEGER DEFAULT 0, filename TEXT, value BLOB);
+    CREATE UNIQUE INDEX IF NOT EXISTS Cache_key_raw ON Cache(key, raw);
+    CREATE INDEX IF NOT EXISTS Cache_expire_time ON Cache (expire_time);
+    CREATE INDEX IF NOT EXISTS Cache_store_time ON Cache (store_time);
+    CREATE TRIGGER IF NOT EXISTS Settings_count_insert AFTER INSERT ON Cache FOR EACH ROW BEGIN
+        UPDATE Settings SET value = value + 1 WHERE key = "count"; END;
+    CREATE TRIGGER IF NOT EXISTS Settings_count_delete AFTER DELETE ON Cache FOR EACH ROW BEGIN
+        UPDATE Settings SET value = value - 1 WHERE key = "count"; END;
+    CREATE TRIGGER IF NOT EXISTS Settings_size_insert AFTER INSERT ON Cache FOR EACH ROW BEGIN
+        UPDATE Settings SET value = value + NEW.size WHERE key = "size"; END;
+    CREATE TRIGGER IF NOT EXISTS Settings_size_update AFTER UPDATE ON Cache FOR EACH ROW BEGIN
+        UPDATE Settings SET value = value + NEW.size - OLD.size WHERE key = "size"; END;
+    CREATE TRIGGER IF NOT EXISTS Settings_size_delete AFTER DELETE ON Cache FOR EACH ROW BEGIN
+        UPDATE Settings SET value = value - OLD.size WHERE key = "size"; END;
+"""
+
+UPSERT_SQL = """
+    INSERT INTO Cache (key, raw, store_time, expire_time, access_time, access_count,
+                       tag, size, mode, filename, value)
+    VALUES (?, ?, ?, ?, ?, 0, ?, ?, ?, NULL, ?)
+    ON CONFLICT (key, raw) DO UPDATE SET
+        store_time = excluded.store_time,
+        expire_time = excluded.expire_time,
+        access_time = excluded.access_time,
+        access_count = 0,
+        tag = excluded.tag,
+        size = excluded.size,
+        mode = excluded.mode,
+        filename = NULL,
+        value = excluded.value
+"""
+
+ENOVAL = object()
+
+
+class DiskCache:
+    """Read-through cache over a diskcache-layout SQLite file.
+
+    Values are kept inline in the `value` column; unlike diskcache, `size`
+    records the inline payload length so the Settings triggers track the real
+    volume that `size_limit` is enforced against. The connection is shared
+    between threads and guarded by a lock.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, eviction_policy: Optional[str] = None,
+                 size_limit: Optional[int] = None, access_flush_size: int = 256,
+                 access_flush_interval: float = 5.0):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self._conn.executescript(SCHEMA_SQL)
+        self._conn.executemany("INSERT OR IGNORE INTO Settings (key, value) VALUES (?, ?)",
+                               [(k, v) for k, v in {'count': 0, 'size': 0, 'hits': 0, 'misses': 0,
+                                                    **DEFAULT_SETTINGS}.items()])
+        self.settings = dict(self._conn.execute("SELECT key, value FROM Settings"))
+        self._apply_pragmas()
+
+        if eviction_policy is not None:
+            self._set_setting('eviction_policy', eviction_policy)
+        if size_limit is not None:
+            self._set_setting('size_limit', size_limit)
+        if self.settings['eviction_policy'] not in EVICTION_ORDER and self.settings['eviction_policy'] != 'none':
+            raise ValueError(f"Unknown eviction policy: {self.settings['eviction_policy']}")
+
+        self.access_flush_size = access_flush_size
+        self.access_flush_interval = access_flush_interval
+        self._pending_access: Dict[int, Tuple[float, int]] = {}
+        self._last_access_flush = time.time()
+        self.hits = 0
+        self.misses = 0
+
+    def _apply_pragmas(self):
+        for name in ('auto_vacuum', 'cache_size', 'journal_mode', 'mmap_size', 'synchronous'):
+            value = self.settings.get(f'sqlite_{name}')
+            if value is not None:
+                self._conn.execute(f"PRAGMA {name} = {value}").fetchall()
+
+    def _set_setting(self, key: str, value: Any):
+        self._conn.execute("UPDATE Settings SET value = ? WHERE key = ?", (value, key))
+        self.settings[key] = value
+
+    # -- serialization -----------------------------------------------------
+
+    def _put_key(self, key: Any) -> Tuple[Any, bool]:
+        if isinstance(key, bytes):
+            return sqlite3.Binary(key), True
+        if isinstance(key, str) or (isinstance(key, int) and -2 ** 63 <= key < 2 ** 63 and not isinstance(key, bool)) \
+                or isinstance(key, float):
+            return key, True
+        return sqlite3.Binary(pickle.dumps(key, protocol=self.settings['disk_pickle_protocol'])), False
+
+    def _store(self, value: Any) -> Tuple[int, int, Any]:
+        if isinstance(value, bytes):
+            return len(value), MODE_RAW, sqlite3.Binary(value)
+        if isinstance(value, str):
+            return len(value.encode('utf-8')), MODE_RAW, value
+        if isinstance(value, float) or (isinstance(value, int) and not isinstance(value, bool)
+                                        and -2 ** 63 <= value < 2 ** 63):
+            return 8, MODE_RAW, value
+        data = pickle.dumps(value, protocol=self.settings['disk_pickle_protocol'])
+        return len(data), MODE_PICKLE, sqlite3.Binary(data)
+
+    @staticmethod
+    def _fetch(mode: int, value: Any) -> Any:
+        if mode == MODE_RAW:
+            return bytes(value) if isinstance(value, memoryview) else value
+        if mode == MODE_PICKLE:
+            return pickle.loads(value)
+        raise ValueError(f"Unsupported cache value mode {mode} (file-backed entries are not read)")
+
+    # -- public API ------------------------------------------------------------
+
+    def get(self, key: Any, default: Any = None, expire_time: bool = False) -> Any:
+        """Return the cached value for ``key`` or ``default`` if missing/expired.
+
+        With ``expire_time`` the result is a (value, expire_time) pair, as in
+        diskcache; expire_time is None for entries that never expire.
+        """
+        db_key, raw = self._put_key(key)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("""
+                SELECT rowid, mode, value, expire_time FROM Cache
+                WHERE key = ? AND raw = ? AND (expire_time IS NULL OR expire_time > ?)
+            """, (db_key, raw, now)).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return (default, None) if expire_time else default
+
+            rowid, mode, value, expires_at = row
+            try:
+                result = self._fetch(mode, value)
+            except (ValueError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+                logger.debug(f"Discarding unreadable cache entry {rowid}: {e}")
+                self.misses += 1
+                return (default, None) if expire_time else default
+
+            self.hits += 1
+            _, count = self._pending_access.get(rowid, (now, 0))
+            self._pending_access[rowid] = (now, count + 1)
+            if (len(self._pending_access) >= self.access_flush_size
+                    or now - self._last_access_flush >= self.access_flush_interval):
+                self.flush_access()
+            return (result, expires_at) if expire_time else result
+
+    def set(self, key: Any, value: Any, expire: Optional[float] = None, tag: Optional[str] = None) -> bool:
+        """Store ``value`` under ``key``; ``expire`` is a TTL in seconds."""
+        db_key, raw = self._put_key(key)
+        size, mode, db_value = self._store(value)
+        now = time.time()
+        expire_time = now + expire if expire is not None else None
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(UPSERT_SQL, (db_key, raw, now, expire_time, now, tag, size, mode, db_value))
+                self._cull(now)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return True
+
+    def delete(self, key: Any) -> bool:
+        db_key, raw = self._put_key(key)
+        with self._lock:
+            return self._conn.execute("DELETE FROM Cache WHERE key = ? AND raw = ?", (db_key, raw)).rowcount > 0
+
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key, ENOVAL) is not ENOVAL
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Remove expired entries. Returns the number removed."""
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM Cache WHERE expire_time IS NOT NULL AND expire_time < ?",
+                (now or time.time(),)).rowcount
+
+    def evict(self, tag: str) -> int:
+        """Remove every entry stored with ``tag``."""
+        with self._lock:
+            return self._conn.execute("DELETE FROM Cache WHERE tag = ?", (tag,)).rowcount
+
+    def clear(self) -> int:
+        with self._lock:
+            self._pending_access.clear()
+            return self._conn.execute("DELETE FROM Cache").rowcount
+
+    def volume(self) -> int:
+        """Inline payload bytes as tracked by the Settings triggers."""
+        with self._lock:
+            return self._conn.execute("SELECT value FROM Settings WHERE key = 'size'").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT value FROM Settings WHERE key = 'count'").fetchone()[0]
+
+    def _cull(self, now: float):
+        """Drop expired rows, then evict by policy while over `size_limit`."""
+        size_limit = self.settings['size_limit']
+        if self._conn.execute("SELECT value FROM Settings WHERE key = 'size'").fetchone()[0] <= size_limit:
+            return
+
+        self._conn.execute("DELETE FROM Cache WHERE expire_time IS NOT NULL AND expire_time < ?", (now,))
+        order = EVICTION_ORDER.get(self.settings['eviction_policy'])
+        if order is None:
+            return
+
+        if order != 'store_time':
+            # Eviction order must see the buffered access bookkeeping
+            self._write_access()
+        cull_limit = max(1, int(self.settings['cull_limit']))
+        excess = self._conn.execute("SELECT value FROM Settings WHERE key = 'size'").fetchone()[0] - size_limit
+        while excess > 0:
+            victims = []
+            for rowid, size in self._conn.execute(
+                    f"SELECT rowid, size FROM Cache ORDER BY {order} LIMIT ?", (cull_limit,)):
+                victims.append((rowid,))
+                excess -= size or 0
+                if excess <= 0:
+                    break
+            if not victims:
+                break
+            self._conn.executemany("DELETE FROM Cache WHERE rowid = ?", victims)
+
+    def _write_access(self):
+        if not self._pending_access:
+            return
+        self._conn.executemany(
+            "UPDATE Cache SET access_time = ?, access_count = access_count + ? WHERE rowid = ?",
+            [(access_time, count, rowid) for rowid, (access_time, count) in self._pending_access.items()])
+        self._pending_access.clear()
+
+    def flush_access(self):
+        """Write buffered access times/counts (and hit statistics) in one transaction."""
+        with self._lock:
+            self._last_access_flush = time.time()
+            if not self._pending_access and not (self.settings['statistics'] and (self.hits or self.misses)):
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._write_access()
+                if self.settings['statistics']:
+                    self._conn.executemany("UPDATE Settings SET value = value + ? WHERE key = ?",
+                                           [(self.hits, 'hits'), (self.misses, 'misses')])
+                    self.hits = self.misses = 0
+                self._conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                self._conn.execute("ROLLBACK")
+                logger.debug(f"Could not flush cache access statistics: {e}")
+
+    def memoize(self, expire: Optional[float] = None, tag: Optional[str] = None,
+                name: Optional[str] = None) -> Callable:
+        """Decorator caching a function's results persistently across runs."""
+        def decorator(func: Callable) -> Callable:
+            prefix = name or f"{func.__module__}.{func.__qualname__}"
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                key = (prefix, args, tuple(sorted(kwargs.items())))
+                result = self.get(key, ENOVAL)
+                if result is ENOVAL:
+                    result = func(*args, **kwargs)
+                    self.set(key, result, expire=expire, tag=tag)
+                return result
+
+            wrapper.cache_key = lambda *args, **kwargs: (prefix, args, tuple(sorted(kwargs.items())))
+            return wrapper
+        return decorator
+
+    def close(self):
+        self.flush_access()
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LRUCache:
+    """Bounded in-process LRU map with per-entry expiry and eviction counters."""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[Any, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key, ENOVAL)
+            if item is not ENOVAL:
+                value, expire_at = item
+                if expire_at is None or expire_at > time.time():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Any, value: Any, expire_at: Optional[float] = None):
+        with self._lock:
+            self._data[key] = (value, expire_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Any) -> bool:
+        with self._lock:
+            return self._data.pop(key, ENOVAL) is not ENOVAL
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TieredCache:
+    """Two-tier lookup: an in-process LRU in front of a persistent DiskCache.
+
+    Exposes the same get/set/delete interface as DiskCache, so it can be
+    dropped in wherever a DiskCache is accepted. Hits in the memory tier cost
+    a dict lookup; disk hits are promoted into memory. Keys must be hashable.
+
+    IdentifierResolver is the only consumer: it is the one place that looks
+    identifiers up. Citation extraction in the frontmatter enforcer records
+    the matched strings as they are, and bibtex_import takes each entry's
+    metadata from the .bib file itself, so neither issues repeated lookups.
+    """
+
+    def __init__(self, disk: Optional[DiskCache] = None, max_entries: int = 4096):
+        self.disk = disk if disk is not None else DiskCache()
+        self.memory = LRUCache(max_entries)
+        self.disk_hits = 0
+        self.disk_misses = 0
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        value = self.memory.get(key, ENOVAL)
+        if value is not ENOVAL:
+            return value
+
+        value, expires_at = self.disk.get(key, ENOVAL, expire_time=True)
+        if value is ENOVAL:
+            self.disk_misses += 1
+            return default
+
+        self.disk_hits += 1
+        # Promoted entries keep the disk entry's expiry
+        self.memory.set(key, value, expires_at)
+        return value
+
+    def set(self, key: Any, value: Any, expire: Optional[float] = None, tag: Optional[str] = None) -> bool:
+        self.memory.set(key, value, time.time() + expire if expire is not None else None)
+        return self.disk.set(key, value, expire=expire, tag=tag)
+
+    def delete(self, key: Any) -> bool:
+        in_memory = self.memory.delete(key)
+        return self.disk.delete(key) or in_memory
+
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key, ENOVAL) is not ENOVAL
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters for instrumentation."""
+        return {
+            'memory_hits': self.memory.hits,
+            'memory_misses': self.memory.misses,
+            'memory_evictions': self.memory.evictions,
+            'memory_entries': len(self.memory),
+            'disk_hits': self.disk_hits,
+            'disk_misses': self.disk_misses,
+        }
+
+    def close(self):
+        self.memory.clear()
+        self.disk.close()
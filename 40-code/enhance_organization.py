@@ -18,6 +18,8 @@ Examples:
     enhance_organization.py --auto-fix
     enhance_organization.py --create-readmes --organize-files
     enhance_organization.py --preview
+    enhance_organization.py --fix-frontmatter --staged
+    enhance_organization.py --auto-fix --diff > organization.patch
 """
 
 import argparse
@@ -27,7 +29,11 @@ from pathlib import Path
 from typing import List, Dict, Optional
 import json
 from datetime import datetime
-import shutil
+
+from diff_preview import PATCH_FORMATS, PatchWriter, open_patch_writer
+from frontmatter_io import prepend_frontmatter, write_if_changed
+from git_changes import ChangeSet, GitChangesError, add_change_arguments, changes_from_args
+from move_planner import MovePlanner
 
 # Configure logging
 logging.basicConfig(
@@ -39,9 +45,15 @@ logger = logging.getLogger('enhance-organization')
 class RepositoryOrganizationEnhancer:
     """Enhances repository organization through automated fixes."""
     
-    def __init__(self, base_path: Path, dry_run: bool = False):
+    def __init__(self, base_path: Path, dry_run: bool = False, changes: Optional[ChangeSet] = None,
+                 patch_writer: Optional[PatchWriter] = None):
         self.base_path = base_path
         self.dry_run = dry_run
+        # When set, fixes only touch these paths and the directories they touch
+        self.changes = changes
+        # In preview mode, receives a patch for every change as it is planned
+        self.patch_writer = patch_writer
+        self.planned_moves: Dict[Path, Path] = {}
         self.changes_made = []
         
         # README templates for different directory types
@@ -436,20 +448,22 @@ When adding infrastructure tools:
         ]
         
         for dir_name, template in required_readmes:
+            if self.changes is not None and not self.changes.touches(dir_name):
+                continue
             readme_path = self.base_path / dir_name / 'README.md'
             
             if not readme_path.exists():
+                content = template.format(
+                    date=datetime.now().strftime('%Y-%m-%d')
+                )
+                
                 if not self.dry_run:
                     readme_path.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    content = template.format(
-                        date=datetime.now().strftime('%Y-%m-%d')
-                    )
-                    
                     readme_path.write_text(content, encoding='utf-8')
                     logger.info(f"✅ Created README.md in: {dir_name}")
                 else:
                     logger.info(f"📋 Would create README.md in: {dir_name}")
+                    self._preview_change(readme_path, None, content)
                 
                 self.changes_made.append(f"Created README.md in {dir_name}")
                 readmes_created += 1
@@ -462,13 +476,19 @@ When adding infrastructure tools:
         return readmes_created
 
     def organize_misplaced_files(self) -> int:
-        """Organize misplaced files into appropriate directory structure."""
+        """Organize misplaced files into appropriate directory structure.
+        
+        All moves are planned first (MovePlanner), so colliding names get a
+        numbered suffix and links pointing at the moved notes are rewritten
+        in the same batch.
+        """
         logger.info("📁 Organizing misplaced files...")
         
-        files_moved = 0
+        planner = MovePlanner(self.base_path)
         root_md_files = [
             f for f in self.base_path.glob("*.md")
             if f.name not in ['README.md', 'GOVERNANCE.md', 'CHANGELOG.md', 'CONTRIBUTING.md']
+            and (self.changes is None or self.changes.includes(f.name))
         ]
         
         for file_path in root_md_files:
@@ -490,17 +510,26 @@ When adding infrastructure tools:
                 else:
                     destination_dir = 'knowledge/applications/'
             
-            destination_path = self.base_path / destination_dir / file_path.name
+            move = planner.add(file_path, self.base_path / destination_dir / file_path.name)
+            destination = planner.relative(move.target)
+            if move.renamed:
+                logger.warning(f"⚠️  {destination_dir}{file_path.name} exists, using {destination}")
             
             if not self.dry_run:
-                destination_path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.move(str(file_path), str(destination_path))
-                logger.info(f"📁 Moved {file_path.name} → {destination_dir}")
+                logger.info(f"📁 Moving {file_path.name} → {destination}")
             else:
-                logger.info(f"📋 Would move {file_path.name} → {destination_dir}")
+                logger.info(f"📋 Would move {file_path.name} → {destination}")
+                # Later previews (frontmatter) refer to the file by its new path
+                self.planned_moves[file_path] = self.base_path / destination
             
-            self.changes_made.append(f"Moved {file_path.name} to {destination_dir}")
-            files_moved += 1
+            self.changes_made.append(f"Moved {file_path.name} to {destination}")
+        
+        stats = planner.apply(self.dry_run, self.patch_writer)
+        files_moved = stats['moved']
+        if stats['links_rewritten_files']:
+            verb = "Would update" if self.dry_run else "Updated"
+            logger.info(f"🔗 {verb} links in {stats['links_rewritten_files']} files")
+            self.changes_made.append(f"Rewrote links in {stats['links_rewritten_files']} files")
         
         if files_moved == 0:
             logger.info("✅ No misplaced files found in root directory")
@@ -514,7 +543,11 @@ When adding infrastructure tools:
         logger.info("🏷️  Adding missing YAML frontmatter...")
         
         files_fixed = 0
-        markdown_files = list(self.base_path.glob("**/*.md"))
+        if self.changes is None:
+            markdown_files = list(self.base_path.glob("**/*.md"))
+        else:
+            markdown_files = [self.base_path / path.relative_to(self.changes.base_path)
+                              for path in self.changes.markdown_files()]
         
         for md_file in markdown_files:
             try:
@@ -529,25 +562,23 @@ When adding infrastructure tools:
                     rel_path = md_file.relative_to(self.base_path)
                     tags = self._generate_tags_from_path(rel_path)
                     
-                    frontmatter = f"""---
-title: {title}
+                    frontmatter = f"""title: {title}
 description: {description}
 status: draft
 created: '{datetime.now().strftime('%Y-%m-%d')}'
 updated: '{datetime.now().strftime('%Y-%m-%d')}'
 tags:
 {chr(10).join(f'- {tag}' for tag in tags)}
----
-
 """
                     
-                    new_content = frontmatter + content
+                    new_content = prepend_frontmatter(content, frontmatter)
                     
                     if not self.dry_run:
-                        md_file.write_text(new_content, encoding='utf-8')
+                        write_if_changed(md_file, new_content, content)
                         logger.info(f"🏷️  Added frontmatter to: {md_file.relative_to(self.base_path)}")
                     else:
                         logger.info(f"📋 Would add frontmatter to: {md_file.relative_to(self.base_path)}")
+                        self._preview_change(md_file, content, new_content)
                     
                     self.changes_made.append(f"Added frontmatter to {md_file.relative_to(self.base_path)}")
                     files_fixed += 1
@@ -562,6 +593,16 @@ tags:
         
         return files_fixed
 
+    def _patch_path(self, path: Path) -> str:
+        # Later patches refer to files by the path a previewed move gave them
+        path = self.planned_moves.get(path, path)
+        return path.relative_to(self.base_path).as_posix()
+
+    def _preview_change(self, path: Path, old: Optional[str], new: str):
+        """Stream the patch for a planned change when previewing with --diff."""
+        if self.patch_writer is not None:
+            self.patch_writer.change(self._patch_path(path), old, new)
+
     def _generate_title_from_filename(self, filename: str) -> str:
         """Generate human-readable title from filename."""
         # Remove extension and replace hyphens/underscores with spaces
@@ -637,23 +678,41 @@ def main() -> int:
     parser.add_argument('--verbose', action='store_true', help='Detailed output')
     parser.add_argument('--base-path', type=Path, default=Path.cwd(), help='Base path to enhance')
     parser.add_argument('--output-json', type=Path, help='Output report as JSON to file')
+    parser.add_argument('--diff', nargs='?', const='-', metavar='FILE',
+                        help='Stream a preview patch to FILE or stdout (implies --preview)')
+    parser.add_argument('--diff-format', choices=PATCH_FORMATS, default='unified',
+                        help='Preview patch format: unified diff or one JSON object per file')
+    add_change_arguments(parser)
     
     args = parser.parse_args()
     
+    patch_writer = None
+    summary_stream = sys.stdout
+    if args.diff:
+        args.preview = True
+        patch_writer = open_patch_writer(args.diff, args.diff_format)
+        if args.diff == '-':
+            # Keep stdout a clean patch stream; the summary goes to stderr
+            summary_stream = sys.stderr
+    
     # Configure logging
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
     try:
-        print("🔧 Repository Organization Enhancement")
-        print("=====================================")
+        print("🔧 Repository Organization Enhancement", file=summary_stream)
+        print("=====================================", file=summary_stream)
         
         dry_run = args.preview
         if dry_run:
-            print("🔍 Running in PREVIEW mode - no changes will be made")
+            print("🔍 Running in PREVIEW mode - no changes will be made", file=summary_stream)
+        
+        changes = changes_from_args(args, args.base_path)
+        if changes is not None:
+            print(f"🔀 Incremental mode: {len(changes)} changed paths", file=summary_stream)
         
         # Initialize enhancer
-        enhancer = RepositoryOrganizationEnhancer(args.base_path, dry_run)
+        enhancer = RepositoryOrganizationEnhancer(args.base_path, dry_run, changes, patch_writer)
         
         total_changes = 0
         
@@ -681,34 +740,40 @@ def main() -> int:
             logger.info(f"📊 Report saved to {args.output_json}")
         
         # Summary
-        print()
+        print(file=summary_stream)
         if total_changes == 0:
-            print("🎉 Repository organization is already optimal! No changes needed.")
+            print("🎉 Repository organization is already optimal! No changes needed.", file=summary_stream)
         else:
             if dry_run:
-                print(f"📋 Would make {total_changes} organizational improvements:")
+                print(f"📋 Would make {total_changes} organizational improvements:", file=summary_stream)
             else:
-                print(f"✅ Successfully made {total_changes} organizational improvements:")
+                print(f"✅ Successfully made {total_changes} organizational improvements:", file=summary_stream)
             
             for change in report['changes_made']:
-                print(f"  ✓ {change}")
+                print(f"  ✓ {change}", file=summary_stream)
             
             if not dry_run:
-                print()
-                print("💡 Recommended next steps:")
-                print("  1. Run maintain_organization.py --validate-all to verify improvements")
-                print("  2. Review and customize generated README.md files")
-                print("  3. Update YAML frontmatter as needed")
-                print("  4. Commit changes to version control")
+                print(file=summary_stream)
+                print("💡 Recommended next steps:", file=summary_stream)
+                print("  1. Run maintain_organization.py --validate-all to verify improvements", file=summary_stream)
+                print("  2. Review and customize generated README.md files", file=summary_stream)
+                print("  3. Update YAML frontmatter as needed", file=summary_stream)
+                print("  4. Commit changes to version control", file=summary_stream)
         
         return 0
     
+    except GitChangesError as e:
+        logger.error(f"❌ Could not determine changed files: {e}")
+        return 1
     except Exception as e:
         logger.error(f"Enhancement failed: {e}")
         if args.verbose:
             import traceback
             traceback.print_exc()
         return 1
+    finally:
+        if patch_writer is not None:
+            patch_writer.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,87 @@
+"""
+Frontmatter-aware file writes shared by the maintenance scripts.
+
+Fixers compute the complete new text of a note and hand it to
+write_if_changed(), which skips the write entirely when nothing changed and
+otherwise replaces the file atomically (temp file + os.replace), so an
+interrupted run never leaves a truncated note and untouched notes keep their
+mtimes. The splice helpers rewrite only the YAML header region; the body is
+carried over byte for byte.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Tuple
+
+OPENING_FENCE = '---'
+CLOSING_FENCE = '\n---\n'
+
+
+def split_frontmatter(content: str) -> Tuple[Optional[str], str]:
+    """Split a note into (raw header including both fences, body).
+
+    Uses the same boundaries as the frontmatter parsers: the text must start
+    with ``---`` and the header ends at the first ``\\n---\\n``. The header is
+    None when there is no frontmatter.
+    """
+    if not content.startswith(OPENING_FENCE):
+        return None, content
+    end = content.find(CLOSING_FENCE, len(OPENING_FENCE))
+    if end == -1:
+        return None, content
+    end += len(CLOSING_FENCE)
+    return content[:end], content[end:]
+
+
+def prepend_frontmatter(content: str, yaml_text: str) -> str:
+    """Put a new frontmatter block (``yaml_text`` ends with a newline) before ``content``."""
+    return f"---\n{yaml_text}---\n\n{content}"
+
+
+def append_frontmatter_fields(content: str, yaml_text: str) -> str:
+    """Insert ``yaml_text`` just before the closing fence of the existing header.
+
+    Existing header lines and the body are left untouched.
+    """
+    header, body = split_frontmatter(content)
+    if header is None:
+        raise ValueError("content has no frontmatter")
+    if not yaml_text:
+        return content
+    return header[:-len('---\n')] + yaml_text + '---\n' + body
+
+
+def atomic_write_text(path: Path, text: str):
+    """Write text to a temp file next to ``path`` and rename it into place."""
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            os.chmod(tmp_name, path.stat().st_mode & 0o7777)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def write_if_changed(path: Path, text: str, current: Optional[str] = None) -> bool:
+    """Atomically write ``text`` unless the file already holds exactly that.
+
+    ``current`` is the text the caller already read; pass it to avoid a
+    second read. Returns True when the file was written.
+    """
+    if current is None:
+        try:
+            current = Path(path).read_text(encoding='utf-8')
+        except FileNotFoundError:
+            current = None
+    if current == text:
+        return False
+    atomic_write_text(path, text)
+    return True
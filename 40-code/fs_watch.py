@@ -0,0 +1,275 @@
+"""
+Debounced file-system watching for long-running maintenance tools.
+
+watch() calls back with batches of changed paths under a tree. On Linux it
+uses inotify through ctypes (no third-party packages): one watch per
+directory, new directories are watched as they appear. Elsewhere, or when
+inotify is unavailable or out of watches, it polls a stat snapshot
+(path -> mtime_ns, size) built with os.scandir and diffs successive
+snapshots.
+
+Bursts of events (an editor's save dance, a git checkout) are coalesced:
+after the first event the watcher keeps collecting until the tree has been
+quiet for ``debounce`` seconds, or ``max_delay`` seconds have passed, and
+then delivers a single batch. A batch of None means events were lost (queue
+overflow, a watched directory moved away) and the caller should resync.
+
+Usage:
+    from fs_watch import watch
+
+    def on_change(paths):  # Set[Path] of absolute paths, or None
+        ...
+
+    watch(Path('.'), on_change, suffixes=('.md',), debounce=0.5)
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+logger = logging.getLogger('fs-watch')
+
+DEFAULT_SKIP_DIRS = ('.git', '.kb', '.venv', 'node_modules', '__pycache__')
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0o2000000)
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+Snapshot = Dict[Path, Tuple[int, int]]
+
+
+def _skipped(name: str, skip_dirs: Iterable[str]) -> bool:
+    return name in skip_dirs
+
+
+def stat_snapshot(base_path: Path, suffixes: Tuple[str, ...] = ('.md',),
+                  skip_dirs: Iterable[str] = DEFAULT_SKIP_DIRS) -> Snapshot:
+    """(mtime_ns, size) of every file under ``base_path`` with one of ``suffixes``."""
+    snapshot: Snapshot = {}
+    stack = [str(base_path)]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not _skipped(entry.name, skip_dirs):
+                            stack.append(entry.path)
+                    elif entry.name.endswith(suffixes):
+                        stat = entry.stat()
+                        snapshot[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+                except OSError:
+                    continue
+    return snapshot
+
+
+def diff_snapshots(old: Snapshot, new: Snapshot) -> Set[Path]:
+    """Paths added, removed or modified between two snapshots."""
+    changed = {path for path, signature in new.items() if old.get(path) != signature}
+    changed.update(path for path in old if path not in new)
+    return changed
+
+
+class PollingWatcher:
+    """Detects changes by diffing stat snapshots every ``interval`` seconds."""
+
+    def __init__(self, base_path: Path, suffixes: Tuple[str, ...], skip_dirs: Iterable[str],
+                 interval: float = 2.0):
+        self.base_path = Path(base_path)
+        self.suffixes = suffixes
+        self.skip_dirs = tuple(skip_dirs)
+        self.interval = interval
+        self._snapshot = stat_snapshot(self.base_path, suffixes, self.skip_dirs)
+        self._next_scan = time.monotonic() + interval
+
+    def read(self, timeout: Optional[float]) -> Optional[Set[Path]]:
+        """Changed paths found within ``timeout`` seconds (empty set when none)."""
+        now = time.monotonic()
+        wait = self._next_scan - now
+        if timeout is not None and wait > timeout:
+            time.sleep(max(timeout, 0))
+            return set()
+        time.sleep(max(wait, 0))
+        self._next_scan = time.monotonic() + self.interval
+        snapshot = stat_snapshot(self.base_path, self.suffixes, self.skip_dirs)
+        changed = diff_snapshots(self._snapshot, snapshot)
+        self._snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify watcher over a directory tree."""
+
+    def __init__(self, base_path: Path, suffixes: Tuple[str, ...], skip_dirs: Iterable[str]):
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.base_path = Path(base_path)
+        self.suffixes = suffixes
+        self.skip_dirs = tuple(skip_dirs)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+        self._dirs: Dict[int, Path] = {}
+        try:
+            self._watch_tree(self.base_path)
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, directory: Path) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error == errno.ENOSPC:
+                raise OSError(error, 'inotify watch limit reached (fs.inotify.max_user_watches)')
+            if error not in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                raise OSError(error, os.strerror(error))
+            return -1
+        self._dirs[wd] = directory
+        return wd
+
+    def _watch_tree(self, root: Path) -> Set[Path]:
+        """Watch ``root`` and its subdirectories; returns the matching files found in them."""
+        found: Set[Path] = set()
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            if self._add_watch(directory) < 0:
+                continue
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not _skipped(entry.name, self.skip_dirs):
+                                stack.append(Path(entry.path))
+                        elif entry.name.endswith(self.suffixes):
+                            found.add(Path(entry.path))
+            except OSError:
+                continue
+        return found
+
+    def read(self, timeout: Optional[float]) -> Optional[Set[Path]]:
+        """Changed paths reported within ``timeout`` seconds, or None after lost events."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed: Set[Path] = set()
+        lost = False
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                lost = True
+                continue
+            directory = self._dirs.get(wd)
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            if directory is None:
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                # A subtree moved or vanished under us; files inside it are unknown
+                lost = lost or directory != self.base_path
+                continue
+
+            path = directory / os.fsdecode(name)
+            if mask & IN_ISDIR:
+                if _skipped(path.name, self.skip_dirs):
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    changed |= self._watch_tree(path)
+                elif mask & IN_MOVED_FROM:
+                    lost = True
+            elif path.name.endswith(self.suffixes):
+                changed.add(path)
+        return None if lost else changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def open_watcher(base_path: Path, suffixes: Tuple[str, ...] = ('.md',),
+                 skip_dirs: Iterable[str] = DEFAULT_SKIP_DIRS, poll: bool = False,
+                 poll_interval: float = 2.0):
+    """An inotify watcher when possible, otherwise a polling one."""
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            watcher = InotifyWatcher(base_path, suffixes, skip_dirs)
+            logger.info(f"👀 Watching {len(watcher._dirs)} directories with inotify")
+            return watcher
+        except (OSError, AttributeError) as e:
+            logger.warning(f"⚠️  inotify unavailable ({e}), falling back to polling")
+    logger.info(f"👀 Polling for changes every {poll_interval:g}s")
+    return PollingWatcher(base_path, suffixes, skip_dirs, poll_interval)
+
+
+def watch(base_path: Path, callback: Callable[[Optional[Set[Path]]], None],
+          suffixes: Tuple[str, ...] = ('.md',), skip_dirs: Iterable[str] = DEFAULT_SKIP_DIRS,
+          debounce: float = 0.5, max_delay: float = 5.0, poll: bool = False,
+          poll_interval: float = 2.0, should_stop: Callable[[], bool] = lambda: False):
+    """Deliver debounced batches of changed paths to ``callback`` until ``should_stop()``."""
+    watcher = open_watcher(base_path, suffixes, skip_dirs, poll, poll_interval)
+    try:
+        while not should_stop():
+            batch = watcher.read(1.0)
+            if batch is not None and not batch:
+                continue
+            # Coalesce the burst: wait for a quiet period, bounded by max_delay
+            deadline = time.monotonic() + max_delay
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                more = watcher.read(min(debounce, remaining))
+                if more is None:
+                    batch = None
+                elif not more:
+                    break
+                elif batch is not None:
+                    batch |= more
+            callback(batch)
+    finally:
+        watcher.close()
@@ -0,0 +1,122 @@
+"""
+Git change sets for incremental maintenance runs.
+
+The maintenance scripts accept ``--changed-since REF`` and ``--staged``.
+Either flag makes the script ask git once for the changed and renamed paths
+(``git diff --name-status -z``) and limit validation and fixes to those files
+plus the directories they touch, so CI runs on pull requests scale with the
+diff instead of the repository.
+
+- ``--changed-since REF``: changes between the merge base of REF and HEAD and
+  the working tree (committed, staged and unstaged edits on the branch)
+- ``--staged``: changes in the index relative to HEAD (pre-commit hooks)
+- both: changes in the index relative to the merge base of REF
+
+Untracked files are not part of a change set; ``git add`` them first.
+"""
+
+import argparse
+import subprocess
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import FrozenSet, List, Optional, Set
+
+
+class GitChangesError(Exception):
+    """git is unavailable, the path is not a work tree, or REF is unknown."""
+
+
+@dataclass
+class ChangeSet:
+    """Paths changed under ``base_path``, as reported by one ``git diff`` call."""
+
+    base_path: Path
+    changed: List[Path] = field(default_factory=list)  # added, modified, copied and rename targets
+    removed: List[Path] = field(default_factory=list)  # deleted files and rename sources
+
+    def __len__(self) -> int:
+        return len(self.changed) + len(self.removed)
+
+    def markdown_files(self) -> List[Path]:
+        """Changed markdown files that still exist, as absolute paths."""
+        return [path for path in self.changed if path.suffix == '.md' and path.is_file()]
+
+    @cached_property
+    def affected_dirs(self) -> FrozenSet[Path]:
+        """Directories (relative to ``base_path``, ``Path('.')`` for the root)
+        that contain a changed or removed path, including their ancestors."""
+        dirs: Set[Path] = set()
+        for path in self.changed + self.removed:
+            dirs.update(path.relative_to(self.base_path).parents)
+        return frozenset(dirs)
+
+    @cached_property
+    def relative_paths(self) -> FrozenSet[Path]:
+        """Every changed and removed path, relative to ``base_path``."""
+        return frozenset(path.relative_to(self.base_path) for path in self.changed + self.removed)
+
+    def touches(self, rel_dir) -> bool:
+        """True when something changed inside ``rel_dir`` (relative to ``base_path``)."""
+        return Path(rel_dir) in self.affected_dirs
+
+    def includes(self, rel_path) -> bool:
+        """True when ``rel_path`` (relative to ``base_path``) itself changed or was removed."""
+        return Path(rel_path) in self.relative_paths
+
+
+def parse_name_status(output: bytes, base_path: Path) -> ChangeSet:
+    """Parse ``git diff --name-status -z`` output (paths relative to ``base_path``)."""
+    changes = ChangeSet(base_path)
+    fields = output.decode('utf-8', errors='surrogateescape').split('\0')
+    i = 0
+    while i < len(fields) and fields[i]:
+        status = fields[i][0]
+        if status in 'RC':
+            source, target = fields[i + 1], fields[i + 2]
+            i += 3
+            if status == 'R':
+                changes.removed.append(base_path / source)
+            changes.changed.append(base_path / target)
+            continue
+        path = base_path / fields[i + 1]
+        i += 2
+        if status == 'D':
+            changes.removed.append(path)
+        else:
+            changes.changed.append(path)
+    return changes
+
+
+def changed_files(base_path: Path, since: Optional[str] = None, staged: bool = False) -> ChangeSet:
+    """Ask git for the paths under ``base_path`` changed since ``since`` and/or in the index."""
+    base_path = Path(base_path).resolve()
+    command = ['git', 'diff', '--name-status', '-z', '-M', '--relative']
+    if staged:
+        command.append('--cached')
+    if since:
+        command += ['--merge-base', since]
+    command.append('--')
+
+    try:
+        result = subprocess.run(command, cwd=base_path, capture_output=True, timeout=120)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise GitChangesError(f"Could not run git: {e}") from e
+    if result.returncode != 0:
+        message = result.stderr.decode('utf-8', errors='replace').strip()
+        raise GitChangesError(message or f"git diff exited with status {result.returncode}")
+    return parse_name_status(result.stdout, base_path)
+
+
+def add_change_arguments(parser: argparse.ArgumentParser):
+    """Add the shared ``--changed-since`` / ``--staged`` options to a CLI."""
+    parser.add_argument('--changed-since', metavar='REF',
+                        help='Only process paths changed since the merge base with REF (e.g. origin/main)')
+    parser.add_argument('--staged', action='store_true', help='Only process paths staged in the index')
+
+
+def changes_from_args(args: argparse.Namespace, base_path: Path) -> Optional[ChangeSet]:
+    """The change set requested on the command line, or None for a full run."""
+    if not (args.changed_since or args.staged):
+        return None
+    return changed_files(base_path, args.changed_since, args.staged)
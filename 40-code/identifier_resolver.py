@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Asynchronous DOI / arXiv Identifier Resolver
+
+Resolves citation identifiers to metadata records with overlapping I/O:
+lookups run on asyncio with a bounded concurrency limit, concurrent requests
+for the same identifier share a single in-flight fetch, and both positive and
+negative (not found) results are persisted in cache.db through DiskCache.
+Identifiers that repeat within a run are answered from an in-process LRU
+tier (TieredCache) without touching SQLite.
+
+The fetch backend is pluggable:
+- HTTPBackend: doi.org content negotiation and the arXiv export API (base
+  URLs are configurable so a local stub server can stand in for them)
+- LocalDumpBackend: the offline arxiv_metadata table loaded by
+  arxiv_dump_import.py
+- FileBackend: a JSON file of canned records for tests and offline runs
+
+Usage:
+    identifier_resolver.py <identifier>... [options]
+
+Examples:
+    identifier_resolver.py 10.1145/3290605.3300233 arXiv:1706.03762
+    identifier_resolver.py 1706.03762 --backend local
+    identifier_resolver.py 10.1/x --backend file --records fake-records.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import urllib.error
+import urllib.parse
+import urllib.request
+import xml.etree.ElementTree as ET
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from bibtex_import import normalize_arxiv_id, normalize_doi
+from disk_cache import ENOVAL, DiskCache, TieredCache
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s'
+)
+logger = logging.getLogger('identifier-resolver')
+
+DOI = 'doi'
+ARXIV = 'arxiv'
+
+ATOM_NS = {'atom': 'http://www.w3.org/2005/Atom', 'arxiv': 'http://arxiv.org/schemas/atom'}
+
+
+class ResolverError(Exception):
+    """Transient backend failure; the result is not cached."""
+
+
+def parse_identifier(value: str) -> Optional[Tuple[str, str]]:
+    """Classify a raw identifier as (kind, normalized id)."""
+    doi = normalize_doi(value)
+    if doi:
+        return DOI, doi
+    arxiv_id = normalize_arxiv_id(value)
+    if arxiv_id:
+        return ARXIV, arxiv_id
+    return None
+
+
+class ResolverBackend(ABC):
+    """Fetches metadata for one identifier. Returns None when not found."""
+
+    @abstractmethod
+    async def fetch(self, kind: str, identifier: str) -> Optional[Dict]:
+        """Metadata for the normalized ``identifier`` of ``kind``, or None."""
+
+
+class HTTPBackend(ResolverBackend):
+    """Resolves DOIs via CSL-JSON content negotiation and arXiv ids via the export API.
+
+    Blocking urllib calls run in the loop's default executor so many requests
+    can be in flight at once without extra dependencies.
+    """
+
+    def __init__(self, doi_url: str = 'https://doi.org/{id}',
+                 arxiv_url: str = 'https://export.arxiv.org/api/query?id_list={id}',
+                 timeout: float = 15.0, user_agent: str = 'main-knowledge-base/0.1 (citation enrichment)'):
+        self.doi_url = doi_url
+        self.arxiv_url = arxiv_url
+        self.timeout = timeout
+        self.user_agent = user_agent
+
+    async def fetch(self, kind: str, identifier: str) -> Optional[Dict]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._fetch_sync, kind, identifier)
+
+    def _get(self, url: str, accept: str) -> Optional[bytes]:
+        request = urllib.request.Request(url, headers={'Accept': accept, 'User-Agent': self.user_agent})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.read()
+        except urllib.error.HTTPError as e:
+            if e.code in (404, 410):
+                return None
+            raise ResolverError(f"HTTP {e.code} for {url}") from e
+        except (urllib.error.URLError, OSError) as e:
+            raise ResolverError(f"{url}: {e}") from e
+
+    def _fetch_sync(self, kind: str, identifier: str) -> Optional[Dict]:
+        quoted = urllib.parse.quote(identifier, safe='/')
+        if kind == DOI:
+            body = self._get(self.doi_url.format(id=quoted), 'application/vnd.citationstyles.csl+json')
+            if body is None:
+                return None
+            try:
+                data = json.loads(body)
+            except json.JSONDecodeError as e:
+                raise ResolverError(f"Invalid CSL-JSON for {identifier}") from e
+            authors = [' '.join(filter(None, (a.get('given'), a.get('family')))) for a in data.get('author', [])]
+            issued = (data.get('issued') or {}).get('date-parts') or [[None]]
+            return {
+                'doi': identifier,
+                'title': data.get('title'),
+                'authors': '; '.join(a for a in authors if a),
+                'year': issued[0][0] if issued and issued[0] else None,
+                'journal': data.get('container-title'),
+                'url': data.get('URL'),
+            }
+
+        body = self._get(self.arxiv_url.format(id=quoted), 'application/atom+xml')
+        if body is None:
+            return None
+        try:
+            entry = ET.fromstring(body).find('atom:entry', ATOM_NS)
+        except ET.ParseError as e:
+            raise ResolverError(f"Invalid Atom feed for {identifier}") from e
+        if entry is None or entry.find('atom:title', ATOM_NS) is None:
+            return None
+        title = entry.findtext('atom:title', '', ATOM_NS)
+        if title.strip() == 'Error':
+            return None
+        published = entry.findtext('atom:published', '', ATOM_NS)
+        return {
+            'arxiv_id': identifier,
+            'title': ' '.join(title.split()),
+            'authors': '; '.join(a.findtext('atom:name', '', ATOM_NS)
+                                 for a in entry.findall('atom:author', ATOM_NS)),
+            'year': int(published[:4]) if published[:4].isdigit() else None,
+            'doi': normalize_doi(entry.findtext('arxiv:doi', '', ATOM_NS)),
+            'url': f"https://arxiv.org/abs/{identifier}",
+        }
+
+
+class LocalDumpBackend(ResolverBackend):
+    """Resolves against the offline `arxiv_metadata` table (see arxiv_dump_import.py)."""
+
+    def __init__(self, store=None):
+        if store is None:
+            from arxiv_dump_import import ArxivMetadataStore
+            store = ArxivMetadataStore()
+        self.store = store
+
+    async def fetch(self, kind: str, identifier: str) -> Optional[Dict]:
+        if kind == ARXIV:
+            return self.store.get_by_arxiv_id(identifier)
+        return self.store.get_by_doi(identifier)
+
+
+class FileBackend(ResolverBackend):
+    """Serves canned records from a JSON file keyed by ``"doi:<id>"`` / ``"arxiv:<id>"``."""
+
+    def __init__(self, path: Path, latency: float = 0.0):
+        with open(path, 'r', encoding='utf-8') as f:
+            self.records = json.load(f)
+        self.latency = latency
+        self.calls = 0
+
+    async def fetch(self, kind: str, identifier: str) -> Optional[Dict]:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.records.get(f"{kind}:{identifier}")
+
+
+class IdentifierResolver:
+    """Coalescing, concurrency-limited, cache-backed identifier resolver."""
+
+    def __init__(self, backend: ResolverBackend, cache=None,
+                 concurrency: int = 8, ttl: Optional[float] = 30 * 86400,
+                 negative_ttl: Optional[float] = 86400):
+        self.backend = backend
+        self.cache = cache if cache is not None else TieredCache(DiskCache())
+        self.concurrency = concurrency
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self.stats = {'cache_hits': 0, 'negative_hits': 0, 'fetches': 0, 'coalesced': 0, 'errors': 0}
+
+    @staticmethod
+    def cache_key(kind: str, identifier: str) -> tuple:
+        return ('resolver', kind, identifier)
+
+    async def resolve(self, kind: str, identifier: str) -> Optional[Dict]:
+        """Return the metadata record for an already-normalized identifier, or None."""
+        key = (kind, identifier)
+
+        cached = self.cache.get(self.cache_key(kind, identifier), ENOVAL)
+        if cached is not ENOVAL:
+            self.stats['cache_hits' if cached is not None else 'negative_hits'] += 1
+            return cached
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.stats['coalesced'] += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._fetch(kind, identifier)
+            future.set_result(result)
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so unawaited coalesced futures don't warn
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+            if not future.done():
+                # The leading task was cancelled: release the coalesced waiters too
+                future.cancel()
+        return result
+
+    async def _fetch(self, kind: str, identifier: str) -> Optional[Dict]:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            self.stats['fetches'] += 1
+            result = await self.backend.fetch(kind, identifier)
+        self.cache.set(self.cache_key(kind, identifier), result,
+                       expire=self.ttl if result is not None else self.negative_ttl,
+                       tag=f"resolver-{kind}")
+        return result
+
+    async def resolve_many(self, identifiers: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """Resolve raw identifiers concurrently; unparseable or failed ones map to None."""
+        raw_ids = list(dict.fromkeys(identifiers))
+
+        async def one(raw: str) -> Optional[Dict]:
+            parsed = parse_identifier(raw)
+            if parsed is None:
+                return None
+            try:
+                return await self.resolve(*parsed)
+            except ResolverError as e:
+                self.stats['errors'] += 1
+                logger.warning(f"⚠️  Could not resolve {raw}: {e}")
+                return None
+
+        results = await asyncio.gather(*(one(raw) for raw in raw_ids))
+        return dict(zip(raw_ids, results))
+
+
+def build_backend(name: str, records: Optional[Path] = None) -> ResolverBackend:
+    if name == 'file':
+        if records is None:
+            raise ValueError("--records is required with --backend file")
+        return FileBackend(records)
+    if name == 'local':
+        return LocalDumpBackend()
+    return HTTPBackend()
+
+
+def main() -> int:
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('identifiers', nargs='+', help='DOIs or arXiv ids to resolve')
+    parser.add_argument('--backend', choices=['http', 'local', 'file'], default='http', help='Fetch backend')
+    parser.add_argument('--records', type=Path, help='JSON records file for --backend file')
+    parser.add_argument('--concurrency', type=int, default=8, help='Maximum concurrent fetches')
+    parser.add_argument('--verbose', action='store_true', help='Detailed output')
+
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    try:
+        resolver = IdentifierResolver(build_backend(args.backend, args.records), concurrency=args.concurrency)
+        results = asyncio.run(resolver.resolve_many(args.identifiers))
+        resolver.cache.close()
+    except (OSError, ValueError) as e:
+        logger.error(f"Resolution failed: {e}")
+        return 1
+
+    print(json.dumps(results, indent=2, default=str))
+    logger.info(f"📊 {resolver.stats} cache={resolver.cache.stats()}")
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,351 @@
+"""
+Incrementally maintained knowledge base index.
+
+Everything the search and navigation tools need lives in one SQLite file,
+30-data/indexes/kb-index.db, keyed by note path:
+
+- notes: frontmatter cache (parsed YAML as JSON, title, category) together
+  with the mtime_ns/size the entry was built from
+- tags: (path, tag) rows, indexed by tag
+- links: relative markdown links (source, target), indexed by target, so
+  backlinks and broken links are single lookups
+- notes_fts: FTS5 full-text index over title, tags and body
+
+update() re-parses only the given notes and replaces just their rows in one
+transaction; sync() finds the notes whose (mtime_ns, size) differ from the
+stored ones, so a rebuild after edits costs one stat per note plus the
+changed notes. tags.json and categories.json in the same directory are
+regenerated from SQL aggregates. The query methods (search, backlinks,
+notes_with_tag, metadata) serve kb_server.py.
+
+Usage:
+    from kb_index import KBIndex
+
+    with KBIndex('.') as index:
+        index.sync()                 # catch up with the tree
+        index.update([changed_path]) # after an edit
+        index.write_summaries()
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Pattern
+
+import yaml
+
+from frontmatter_io import split_frontmatter
+from fs_watch import DEFAULT_SKIP_DIRS, stat_snapshot
+from move_planner import link_targets
+
+logger = logging.getLogger('kb-index')
+
+INDEXES_DIR = Path('30-data') / 'indexes'
+INDEX_DB_NAME = 'kb-index.db'
+# .github holds agent instructions and prompts, not notes
+INDEX_SKIP_DIRS = DEFAULT_SKIP_DIRS + ('.github',)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    title TEXT,
+    category TEXT,
+    frontmatter TEXT,
+    frontmatter_error TEXT
+);
+CREATE TABLE IF NOT EXISTS tags (
+    path TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (path, tag)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_tags_tag ON tags(tag);
+CREATE TABLE IF NOT EXISTS links (
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    PRIMARY KEY (source, target)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_links_target ON links(target);
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+    title, tags, body, tokenize = 'porter unicode61 remove_diacritics 2'
+);
+"""
+
+
+@dataclass
+class NoteRecord:
+    """Index entry for one note, as parsed from disk."""
+    path: str  # relative POSIX path
+    mtime_ns: int
+    size: int
+    title: str
+    category: Optional[str]
+    frontmatter: Optional[Dict]
+    frontmatter_error: Optional[str] = None
+    tags: List[str] = field(default_factory=list)
+    links: List[str] = field(default_factory=list)
+    body: str = ''
+
+
+def _normalize_tags(value) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list):
+        return []
+    return sorted({str(tag).strip() for tag in value if tag is not None and str(tag).strip()})
+
+
+def _title(frontmatter: Optional[Dict], body: str, stem: str) -> str:
+    if frontmatter and frontmatter.get('title'):
+        return str(frontmatter['title'])
+    for line in body.splitlines():
+        if line.startswith('# '):
+            return line[2:].strip()
+    return stem
+
+
+def parse_note(base_path: Path, rel_path: str, text: str, mtime_ns: int = 0, size: int = 0) -> NoteRecord:
+    """Build the index entry for a note from its text (``rel_path`` is POSIX, relative)."""
+    header, body = split_frontmatter(text)
+    frontmatter, error = None, None
+    if header is not None:
+        try:
+            loaded = yaml.safe_load(header[3:-4])
+            if isinstance(loaded, dict):
+                frontmatter = loaded
+            elif loaded is not None:
+                error = 'frontmatter is not a mapping'
+        except yaml.YAMLError as e:
+            error = str(e).splitlines()[0]
+
+    path = base_path / rel_path
+    links = set()
+    for target in link_targets(path, text):
+        try:
+            links.add(target.relative_to(base_path).as_posix())
+        except ValueError:
+            continue  # points outside the knowledge base
+
+    parts = Path(rel_path).parts
+    return NoteRecord(
+        path=rel_path,
+        mtime_ns=mtime_ns,
+        size=size,
+        title=_title(frontmatter, body, Path(rel_path).stem),
+        # Same category as the tag/category summary has always used
+        category=parts[1] if len(parts) > 1 else None,
+        frontmatter=frontmatter,
+        frontmatter_error=error,
+        tags=_normalize_tags(frontmatter.get('tags')) if frontmatter else [],
+        links=sorted(links),
+        body=body,
+    )
+
+
+def _query_terms(query: str) -> Optional[Pattern]:
+    """Pattern matching the start of any query word (a stand-in for the porter stemmer)."""
+    words = {word.lower() for word in re.findall(r'\w+', query)
+             if word.upper() not in ('AND', 'OR', 'NOT', 'NEAR')}
+    if not words:
+        return None
+    return re.compile(r'\b(?:' + '|'.join(re.escape(word[:max(len(word) - 2, 3)]) for word in sorted(words))
+                      + r')\w*', re.IGNORECASE)
+
+
+def _snippet(body: str, terms: Optional[Pattern], width: int = 80) -> str:
+    """A window of ``body`` around the first query match, matches in [brackets].
+
+    FTS5's snippet() re-tokenizes the whole document for every result, which
+    dominates query time on long notes; this only scans up to the first match.
+    """
+    match = terms.search(body) if terms else None
+    start = max(match.start() - width // 2, 0) if match else 0
+    window = ' '.join(body[start:start + width].split())
+    if terms:
+        window = terms.sub(lambda m: f'[{m.group(0)}]', window)
+    return ('…' if start else '') + window + ('…' if start + width < len(body) else '')
+
+
+def _like_prefix(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+class KBIndex:
+    """SQLite-backed note index under ``base_path``."""
+
+    def __init__(self, base_path='.', db_path: Optional[Path] = None,
+                 skip_dirs: Iterable[str] = INDEX_SKIP_DIRS, check_same_thread: bool = True):
+        self.base_path = Path(base_path).resolve()
+        self.indexes_dir = self.base_path / INDEXES_DIR
+        self.db_path = Path(db_path) if db_path else self.indexes_dir / INDEX_DB_NAME
+        self.skip_dirs = tuple(skip_dirs)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=check_same_thread)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("PRAGMA busy_timeout = 5000")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def relative(self, path: Path) -> str:
+        return Path(path).resolve().relative_to(self.base_path).as_posix()
+
+    def _is_indexed_path(self, rel_path: str) -> bool:
+        parts = Path(rel_path).parts
+        return rel_path.endswith('.md') and not any(part in self.skip_dirs for part in parts[:-1])
+
+    def _read(self, rel_path: str) -> Optional[NoteRecord]:
+        path = self.base_path / rel_path
+        try:
+            with open(path, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                raw = f.read()
+        except OSError:
+            return None
+        text = raw.decode('utf-8', errors='replace').replace('\r\n', '\n')
+        return parse_note(self.base_path, rel_path, text, stat.st_mtime_ns, stat.st_size)
+
+    def _delete(self, rel_path: str):
+        row = self.conn.execute("SELECT id FROM notes WHERE path = ?", (rel_path,)).fetchone()
+        if row is None:
+            return False
+        self.conn.execute("DELETE FROM notes_fts WHERE rowid = ?", (row[0],))
+        self.conn.execute("DELETE FROM notes WHERE id = ?", (row[0],))
+        self.conn.execute("DELETE FROM tags WHERE path = ?", (rel_path,))
+        self.conn.execute("DELETE FROM links WHERE source = ?", (rel_path,))
+        return True
+
+    def _store(self, record: NoteRecord):
+        self._delete(record.path)
+        frontmatter = json.dumps(record.frontmatter, default=str) if record.frontmatter is not None else None
+        cursor = self.conn.execute(
+            "INSERT INTO notes (path, mtime_ns, size, title, category, frontmatter, frontmatter_error) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (record.path, record.mtime_ns, record.size, record.title, record.category,
+             frontmatter, record.frontmatter_error))
+        self.conn.execute("INSERT INTO notes_fts (rowid, title, tags, body) VALUES (?, ?, ?, ?)",
+                          (cursor.lastrowid, record.title, ' '.join(record.tags), record.body))
+        self.conn.executemany("INSERT INTO tags (path, tag) VALUES (?, ?)",
+                              [(record.path, tag) for tag in record.tags])
+        self.conn.executemany("INSERT INTO links (source, target) VALUES (?, ?)",
+                              [(record.path, target) for target in record.links])
+
+    def update(self, paths: Iterable[Path]) -> Dict[str, int]:
+        """Re-index the given notes (absolute or base-relative); missing ones are dropped."""
+        counts = {'indexed': 0, 'removed': 0}
+        with self.conn:
+            for path in paths:
+                path = Path(path)
+                try:
+                    rel_path = self.relative(path if path.is_absolute() else self.base_path / path)
+                except ValueError:
+                    continue
+                if not self._is_indexed_path(rel_path):
+                    continue
+                record = self._read(rel_path)
+                if record is None:
+                    counts['removed'] += self._delete(rel_path)
+                else:
+                    self._store(record)
+                    counts['indexed'] += 1
+        return counts
+
+    def sync(self) -> Dict[str, int]:
+        """Bring the index in line with the tree, re-parsing only notes whose stat changed."""
+        snapshot = stat_snapshot(self.base_path, ('.md',), self.skip_dirs)
+        current = {self.relative(path): signature for path, signature in snapshot.items()}
+        stored = {path: (mtime_ns, size) for path, mtime_ns, size in
+                  self.conn.execute("SELECT path, mtime_ns, size FROM notes")}
+        stale = [path for path, signature in current.items() if stored.get(path) != signature]
+        stale += [path for path in stored if path not in current]
+        return self.update(self.base_path / path for path in stale)
+
+    # -- queries ---------------------------------------------------------
+
+    def search(self, query: str, limit: int = 20, tag: Optional[str] = None) -> List[Dict]:
+        """Full-text search ranked by BM25 (title and tags weigh more than the body)."""
+        sql = ("SELECT notes.path, notes.title, notes_fts.body, bm25(notes_fts, 10.0, 5.0, 1.0) AS rank "
+               "FROM notes_fts JOIN notes ON notes.id = notes_fts.rowid WHERE notes_fts MATCH ?")
+        params: list = [query]
+        if tag:
+            sql += " AND notes.path IN (SELECT path FROM tags WHERE tag = ? OR tag LIKE ? ESCAPE '\\')"
+            params += [tag, _like_prefix(tag) + '/%']
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        try:
+            rows = self.conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError:
+            # Not valid FTS5 syntax: search for the words as plain terms
+            params[0] = ' '.join('"{}"'.format(word.replace('"', '""')) for word in query.split())
+            if not params[0]:
+                return []
+            rows = self.conn.execute(sql, params).fetchall()
+        terms = _query_terms(query)
+        return [{'path': path, 'title': title, 'snippet': _snippet(body, terms), 'score': round(-rank, 4)}
+                for path, title, body, rank in rows]
+
+    def backlinks(self, rel_path: str) -> List[str]:
+        return [row[0] for row in self.conn.execute(
+            "SELECT source FROM links WHERE target = ? ORDER BY source", (rel_path,))]
+
+    def outlinks(self, rel_path: str) -> List[str]:
+        return [row[0] for row in self.conn.execute(
+            "SELECT target FROM links WHERE source = ? ORDER BY target", (rel_path,))]
+
+    def notes_with_tag(self, tag: str, descendants: bool = True) -> List[str]:
+        """Notes tagged ``tag`` (and, for hierarchical tags, ``tag/...``)."""
+        if descendants:
+            rows = self.conn.execute(
+                "SELECT DISTINCT path FROM tags WHERE tag = ? OR tag LIKE ? ESCAPE '\\' ORDER BY path",
+                (tag, _like_prefix(tag) + '/%'))
+        else:
+            rows = self.conn.execute("SELECT path FROM tags WHERE tag = ? ORDER BY path", (tag,))
+        return [row[0] for row in rows]
+
+    def metadata(self, rel_path: str) -> Optional[Dict]:
+        row = self.conn.execute(
+            "SELECT path, title, category, frontmatter, frontmatter_error, mtime_ns, size "
+            "FROM notes WHERE path = ?", (rel_path,)).fetchone()
+        if row is None:
+            return None
+        path, title, category, frontmatter, error, mtime_ns, size = row
+        return {'path': path, 'title': title, 'category': category,
+                'frontmatter': json.loads(frontmatter) if frontmatter else None,
+                'frontmatter_error': error, 'tags': [row[0] for row in self.conn.execute(
+                    "SELECT tag FROM tags WHERE path = ? ORDER BY tag", (rel_path,))],
+                'mtime_ns': mtime_ns, 'size': size}
+
+    def note_paths(self) -> List[str]:
+        return [row[0] for row in self.conn.execute("SELECT path FROM notes")]
+
+    def tag_counts(self) -> Dict[str, int]:
+        return dict(self.conn.execute("SELECT tag, COUNT(*) FROM tags GROUP BY tag ORDER BY tag"))
+
+    def category_counts(self) -> Dict[str, int]:
+        return dict(self.conn.execute(
+            "SELECT category, COUNT(*) FROM notes WHERE category IS NOT NULL AND frontmatter IS NOT NULL "
+            "GROUP BY category ORDER BY category"))
+
+    def write_summaries(self):
+        """Regenerate tags.json and categories.json; returns (tag count, category count)."""
+        tags, categories = self.tag_counts(), self.category_counts()
+        for name, data in (('tags.json', tags), ('categories.json', categories)):
+            with open(self.indexes_dir / name, 'w') as f:
+                json.dump(data, f, indent=2)
+        return len(tags), len(categories)
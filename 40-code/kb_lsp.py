@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Knowledge Base Diagnostics Language Server
+
+A minimal Language Server Protocol server (JSON-RPC over stdio) that reports
+frontmatter and link problems while a note is being edited, instead of at
+commit time. It publishes `textDocument/publishDiagnostics` for open
+Markdown buffers and checks the same rules as the pre-commit metadata hook:
+
+- missing or unparsable YAML front matter where the policy requires it
+- JSON Schema violations (.kb/schemas, chosen by kb-policy.yaml path rules)
+- values outside the controlled vocabularies
+- relative links whose target does not exist
+
+Only the edited buffer is re-validated. The policy and schemas are compiled
+once at startup (note_validator.NoteValidator) and link targets are checked
+against the set of note paths from 30-data/indexes/kb-index.db plus the open
+buffers, so a check never walks the tree. Edits are applied incrementally
+and validation runs once the pending messages are drained, so a burst of
+keystrokes costs one validation per document.
+
+Saved and closed buffers are written back to the index, keeping backlinks
+and the path set current for other open documents.
+
+Editor setup (any LSP client): run `python3 40-code/kb_lsp.py` with the
+knowledge base as workspace root, for the `markdown` language.
+
+Usage:
+    kb_lsp.py [--base-path PATH] [--verbose]
+    kb_lsp.py --check FILE...   (print diagnostics and exit)
+
+Examples:
+    kb_lsp.py
+    kb_lsp.py --check 10-knowledge/methods/git-practical-guide.md
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Set
+from urllib.parse import quote, unquote, urlparse
+
+from kb_index import KBIndex
+from note_validator import ERROR, Diagnostic, NoteValidator
+
+# Configure logging (stdout carries the protocol)
+logging.basicConfig(
+    level=logging.INFO,
+    format='[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s',
+    stream=sys.stderr
+)
+logger = logging.getLogger('kb-lsp')
+
+SEVERITY = {ERROR: 1, 'warning': 2}  # LSP DiagnosticSeverity
+SOURCE = 'kb'
+
+# LSP error codes
+METHOD_NOT_FOUND = -32601
+SERVER_NOT_INITIALIZED = -32002
+
+
+def uri_to_path(uri: str) -> Optional[Path]:
+    parsed = urlparse(uri)
+    if parsed.scheme != 'file':
+        return None
+    return Path(unquote(parsed.path))
+
+
+def path_to_uri(path: Path) -> str:
+    return 'file://' + quote(path.as_posix())
+
+
+class TextDocument:
+    """An open buffer, with line offsets for applying ranged edits."""
+
+    def __init__(self, uri: str, text: str, version: int = 0):
+        self.uri = uri
+        self.version = version
+        self.set_text(text)
+
+    def set_text(self, text: str):
+        self.text = text
+        self._line_starts = None
+
+    @property
+    def line_starts(self) -> List[int]:
+        if self._line_starts is None:
+            starts = [0]
+            index = self.text.find('\n')
+            while index != -1:
+                starts.append(index + 1)
+                index = self.text.find('\n', index + 1)
+            self._line_starts = starts
+        return self._line_starts
+
+    def line(self, number: int) -> str:
+        starts = self.line_starts
+        if number >= len(starts):
+            return ''
+        end = starts[number + 1] - 1 if number + 1 < len(starts) else len(self.text)
+        return self.text[starts[number]:end]
+
+    def offset(self, position: Dict, utf16: bool) -> int:
+        """String offset of an LSP position (clamped to the document)."""
+        starts = self.line_starts
+        line = position['line']
+        if line >= len(starts):
+            return len(self.text)
+        character = position['character']
+        if utf16:
+            character = _utf16_to_index(self.line(line), character)
+        return min(starts[line] + character, len(self.text))
+
+    def apply_change(self, change: Dict, utf16: bool):
+        if 'range' not in change:
+            self.set_text(change['text'])
+            return
+        start = self.offset(change['range']['start'], utf16)
+        end = self.offset(change['range']['end'], utf16)
+        self.set_text(self.text[:start] + change['text'] + self.text[end:])
+
+
+def _utf16_to_index(line: str, units: int) -> int:
+    if line.isascii():
+        return units
+    count = 0
+    for index, char in enumerate(line):
+        if count >= units:
+            return index
+        count += 2 if ord(char) > 0xFFFF else 1
+    return len(line)
+
+
+def _index_to_utf16(line: str, index: int) -> int:
+    prefix = line[:index]
+    if prefix.isascii():
+        return index
+    return len(prefix.encode('utf-16-le')) // 2
+
+
+class DiagnosticsServer:
+    """Tracks open documents and publishes diagnostics for the changed ones."""
+
+    def __init__(self, base_path: Optional[Path] = None, output: BinaryIO = None):
+        self.output = output or sys.stdout.buffer
+        self.base_path: Optional[Path] = Path(base_path).resolve() if base_path else None
+        self.validator: Optional[NoteValidator] = None
+        self.index: Optional[KBIndex] = None
+        self.note_paths: Set[str] = set()
+        self.documents: Dict[str, TextDocument] = {}
+        self.open_paths: Set[str] = set()
+        self.dirty: Set[str] = set()
+        self.utf16 = True
+        self.initialized = False
+        self.shutdown_requested = False
+        self._write_lock = threading.Lock()
+
+    # -- transport -------------------------------------------------------
+
+    def send(self, message: Dict):
+        body = json.dumps(message, ensure_ascii=False).encode('utf-8')
+        with self._write_lock:
+            self.output.write(f"Content-Length: {len(body)}\r\n\r\n".encode('ascii') + body)
+            self.output.flush()
+
+    def respond(self, request_id, result=None, error: Optional[Dict] = None):
+        message = {'jsonrpc': '2.0', 'id': request_id}
+        if error is not None:
+            message['error'] = error
+        else:
+            message['result'] = result
+        self.send(message)
+
+    # -- setup -----------------------------------------------------------
+
+    def start(self, base_path: Path):
+        """Compile the policy and load the note path set for ``base_path``."""
+        started = time.perf_counter()
+        self.base_path = Path(base_path).resolve()
+        self.validator = NoteValidator(self.base_path)
+        try:
+            self.index = KBIndex(self.base_path, check_same_thread=False)
+            self.index.sync()
+            self.note_paths = set(self.index.note_paths())
+        except (sqlite3.Error, OSError) as e:
+            # Without an index, link targets are checked on disk
+            logger.warning(f"⚠️  Index unavailable ({e}), checking links on disk")
+            self.index = None
+        logger.info(f"🚀 Ready for {self.base_path} with {len(self.note_paths)} indexed notes "
+                    f"({time.perf_counter() - started:.2f}s)")
+
+    def _relative(self, uri: str) -> Optional[str]:
+        path = uri_to_path(uri)
+        if path is None or path.suffix != '.md' or self.base_path is None:
+            return None
+        try:
+            return path.resolve().relative_to(self.base_path).as_posix()
+        except ValueError:
+            return None
+
+    def path_exists(self, rel_path: str) -> bool:
+        # Open buffers that were never saved count as existing notes
+        if rel_path in self.note_paths or rel_path in self.open_paths:
+            return True
+        # Not a note (an image, a directory) or not indexed yet
+        return (self.base_path / rel_path).exists()
+
+    def _reindex(self, uri: str):
+        rel_path = self._relative(uri)
+        if rel_path is None or self.index is None:
+            return
+        counts = self.index.update([self.base_path / rel_path])
+        if counts['indexed']:
+            self.note_paths.add(rel_path)
+        elif counts['removed']:
+            self.note_paths.discard(rel_path)
+
+    # -- diagnostics -----------------------------------------------------
+
+    def _to_lsp(self, document: TextDocument, diagnostic: Diagnostic) -> Dict:
+        start, end = diagnostic.column, diagnostic.end_column
+        if self.utf16:
+            start = _index_to_utf16(document.line(diagnostic.line), start)
+            end = _index_to_utf16(document.line(diagnostic.end_line), end)
+        return {
+            'range': {'start': {'line': diagnostic.line, 'character': start},
+                      'end': {'line': diagnostic.end_line, 'character': end}},
+            'severity': SEVERITY.get(diagnostic.severity, 2),
+            'code': diagnostic.code,
+            'source': SOURCE,
+            'message': diagnostic.message,
+        }
+
+    def diagnose(self, uri: str) -> List[Dict]:
+        document = self.documents.get(uri)
+        rel_path = self._relative(uri)
+        if document is None or rel_path is None or self.validator is None:
+            return []
+        return [self._to_lsp(document, diagnostic)
+                for diagnostic in self.validator.validate(rel_path, document.text, self.path_exists)]
+
+    def publish(self, uri: str, diagnostics: List[Dict]):
+        document = self.documents.get(uri)
+        params = {'uri': uri, 'diagnostics': diagnostics}
+        if document is not None:
+            params['version'] = document.version
+        self.send({'jsonrpc': '2.0', 'method': 'textDocument/publishDiagnostics', 'params': params})
+
+    def flush(self):
+        """Validate and publish every document changed since the last flush."""
+        for uri in sorted(self.dirty):
+            started = time.perf_counter()
+            diagnostics = self.diagnose(uri)
+            self.publish(uri, diagnostics)
+            logger.debug(f"Validated {uri} in {(time.perf_counter() - started) * 1000:.1f} ms "
+                         f"({len(diagnostics)} diagnostics)")
+        self.dirty.clear()
+
+    # -- messages --------------------------------------------------------
+
+    def handle(self, message: Dict):
+        method = message.get('method')
+        params = message.get('params') or {}
+        request_id = message.get('id')
+
+        if method is None:
+            return  # a response to something we never send
+        if method == 'initialize':
+            self._initialize(request_id, params)
+            return
+        if method == 'exit':
+            raise SystemExit(0 if self.shutdown_requested else 1)
+        if not self.initialized:
+            if request_id is not None:
+                self.respond(request_id, error={'code': SERVER_NOT_INITIALIZED, 'message': 'Server not initialized'})
+            return
+
+        if method == 'shutdown':
+            self.shutdown_requested = True
+            self.respond(request_id, None)
+        elif method == 'textDocument/didOpen':
+            item = params['textDocument']
+            self.documents[item['uri']] = TextDocument(item['uri'], item['text'], item.get('version', 0))
+            rel_path = self._relative(item['uri'])
+            if rel_path is not None:
+                self.open_paths.add(rel_path)
+            self.dirty.add(item['uri'])
+        elif method == 'textDocument/didChange':
+            document = self.documents.get(params['textDocument']['uri'])
+            if document is None:
+                return
+            for change in params.get('contentChanges', []):
+                document.apply_change(change, self.utf16)
+            document.version = params['textDocument'].get('version', document.version)
+            self.dirty.add(document.uri)
+        elif method == 'textDocument/didSave':
+            uri = params['textDocument']['uri']
+            if 'text' in params and uri in self.documents:
+                self.documents[uri].set_text(params['text'])
+            self._reindex(uri)
+            self.dirty.add(uri)
+        elif method == 'textDocument/didClose':
+            uri = params['textDocument']['uri']
+            self.documents.pop(uri, None)
+            self.open_paths.discard(self._relative(uri))
+            self.dirty.discard(uri)
+            self._reindex(uri)
+            self.publish(uri, [])
+        elif method == 'workspace/didChangeWatchedFiles':
+            for change in params.get('changes', []):
+                self._reindex(change['uri'])
+            # Link targets may have appeared or disappeared
+            self.dirty.update(self.documents)
+        elif request_id is not None:
+            self.respond(request_id, error={'code': METHOD_NOT_FOUND, 'message': f"Method not found: {method}"})
+
+    def _initialize(self, request_id, params: Dict):
+        encodings = params.get('capabilities', {}).get('general', {}).get('positionEncodings', [])
+        self.utf16 = 'utf-32' not in encodings
+        if self.base_path is None:
+            root = params.get('rootUri')
+            folders = params.get('workspaceFolders') or []
+            if folders:
+                root = folders[0].get('uri')
+            root_path = uri_to_path(root) if root else None
+            self.start(root_path or Path.cwd())
+        else:
+            self.start(self.base_path)
+        self.initialized = True
+        self.respond(request_id, {
+            'capabilities': {
+                'positionEncoding': 'utf-16' if self.utf16 else 'utf-32',
+                'textDocumentSync': {'openClose': True, 'change': 2, 'save': {'includeText': False}},
+            },
+            'serverInfo': {'name': 'kb-diagnostics'},
+        })
+
+    # -- main loop -------------------------------------------------------
+
+    def serve(self, stream: BinaryIO):
+        """Process messages until exit; diagnostics go out whenever input is drained."""
+        messages: queue.Queue = queue.Queue()
+
+        def read():
+            try:
+                while True:
+                    message = read_message(stream)
+                    messages.put(message)
+                    if message is None:
+                        return
+            except Exception as e:
+                logger.error(f"❌ Failed to read message: {e}")
+                messages.put(None)
+
+        threading.Thread(target=read, name='lsp-reader', daemon=True).start()
+        while True:
+            message = messages.get()
+            while True:
+                if message is None:
+                    return
+                try:
+                    self.handle(message)
+                except SystemExit:
+                    raise
+                except Exception:
+                    logger.exception(f"Failed to handle {message.get('method')}")
+                    if message.get('id') is not None:
+                        self.respond(message['id'], error={'code': -32603, 'message': 'Internal error'})
+                try:
+                    message = messages.get_nowait()
+                except queue.Empty:
+                    break
+            self.flush()
+
+
+def read_message(stream: BinaryIO) -> Optional[Dict]:
+    """Read one Content-Length framed message (None at end of input)."""
+    length = None
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            break
+        name, _, value = line.decode('ascii').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value.strip())
+    if length is None:
+        raise ValueError('Missing Content-Length header')
+    return json.loads(stream.read(length))
+
+
+def check_files(base_path: Path, files: List[str]) -> int:
+    """Validate files once and print diagnostics as path:line:column lines."""
+    server = DiagnosticsServer(base_path)
+    server.start(base_path)
+    problems = 0
+    for name in files:
+        path = Path(name).resolve()
+        try:
+            text = path.read_text(encoding='utf-8')
+        except OSError as e:
+            logger.error(f"❌ Cannot read {name}: {e}")
+            problems += 1
+            continue
+        uri = path_to_uri(path)
+        server.documents[uri] = TextDocument(uri, text)
+        for diagnostic in server.diagnose(uri):
+            start = diagnostic['range']['start']
+            print(f"{name}:{start['line'] + 1}:{start['character'] + 1}: "
+                  f"{diagnostic['code']}: {diagnostic['message']}")
+            problems += 1
+    return 1 if problems else 0
+
+
+def main() -> int:
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-path', type=Path, help='Knowledge base root (default: the client workspace root)')
+    parser.add_argument('--check', nargs='+', metavar='FILE', help='Validate files once instead of serving')
+    parser.add_argument('--stdio', action='store_true', help='Serve over stdio (the default; accepted for LSP clients)')
+    parser.add_argument('--verbose', action='store_true', help='Detailed output')
+
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    if args.check:
+        return check_files((args.base_path or Path('.')).resolve(), args.check)
+
+    server = DiagnosticsServer(args.base_path)
+    code = 0
+    try:
+        server.serve(sys.stdin.buffer)
+    except SystemExit as e:
+        code = e.code
+    sys.stdout.flush()
+    logging.shutdown()
+    # The reader thread may still be blocked on stdin; skip interpreter teardown
+    os._exit(code)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
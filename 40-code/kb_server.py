@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Knowledge Base Query Server
+
+Long-running local JSON-RPC 2.0 server over the knowledge base index
+(30-data/indexes/kb-index.db, see kb_index.py). Editor integrations and
+tools send queries to it instead of starting a Python script per call, so
+they pay neither interpreter startup nor index loading: the server keeps a
+pool of open SQLite readers (WAL mode, memory-mapped), the compiled note
+validator and the set of known note paths in memory.
+
+Transport: a Unix socket (default .kb/cache/kb-server.sock) or a TCP port
+on 127.0.0.1. Requests and responses are single lines of JSON; batches
+(JSON arrays) are supported. Each client connection is served by its own
+thread, so concurrent clients do not wait for each other.
+
+Methods:
+    ping                                    -> {"notes": N}
+    search {query, limit?, tag?}            -> [{path, title, snippet, score}]
+    backlinks {path} / outlinks {path}      -> [path]
+    tags                                    -> {tag: count}
+    notes_with_tag {tag, descendants?}      -> [path]
+    metadata {path}                         -> {path, title, frontmatter, tags, ...}
+    validate {path, text?}                  -> [diagnostic]
+    reindex {paths?}                        -> {indexed, removed}
+
+With --watch the server also keeps the index up to date as notes change
+(the same debounced watcher as maintain_kb_enhanced.py --watch).
+
+Usage:
+    kb_server.py [--socket PATH | --port PORT] [--watch] [--readers N]
+    kb_server.py --call METHOD [--params JSON]
+
+Examples:
+    kb_server.py --watch
+    kb_server.py --port 8765
+    kb_server.py --call search --params '{"query": "git worktree", "limit": 5}'
+    echo '{"jsonrpc":"2.0","id":1,"method":"backlinks","params":{"path":"README.md"}}' \\
+        | nc -U .kb/cache/kb-server.sock
+"""
+
+import argparse
+import inspect
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional
+
+from fs_watch import watch
+from kb_index import KBIndex
+from note_validator import NoteValidator
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s'
+)
+logger = logging.getLogger('kb-server')
+
+DEFAULT_SOCKET = Path('.kb') / 'cache' / 'kb-server.sock'
+DEFAULT_READERS = 8
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class RPCError(Exception):
+    """An error to report to the client as a JSON-RPC error object."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class KBQueryService:
+    """The query methods, backed by a pool of index readers."""
+
+    def __init__(self, base_path: Path, readers: int = DEFAULT_READERS):
+        self.base_path = Path(base_path).resolve()
+        self.writer = KBIndex(self.base_path, check_same_thread=False)
+        self._write_lock = threading.Lock()
+        counts = self.writer.sync()
+        self.writer.write_summaries()
+        logger.info(f"📊 Index ready ({counts['indexed']} notes re-indexed, {counts['removed']} removed)")
+
+        self._readers: queue.LifoQueue = queue.LifoQueue()
+        for _ in range(max(1, readers)):
+            reader = KBIndex(self.base_path, check_same_thread=False)
+            reader.conn.execute("PRAGMA query_only = ON")
+            reader.conn.execute("PRAGMA mmap_size = 268435456")
+            self._readers.put(reader)
+        self.validator = NoteValidator(self.base_path)
+        self._paths: Optional[FrozenSet[str]] = None
+        self._paths_lock = threading.Lock()
+
+        self.methods: Dict[str, Callable] = {
+            'ping': self.ping,
+            'search': self.search,
+            'backlinks': self.backlinks,
+            'outlinks': self.outlinks,
+            'tags': self.tags,
+            'notes_with_tag': self.notes_with_tag,
+            'metadata': self.metadata,
+            'validate': self.validate,
+            'reindex': self.reindex,
+        }
+
+    @contextmanager
+    def _index(self):
+        reader = self._readers.get()
+        try:
+            yield reader
+        finally:
+            self._readers.put(reader)
+
+    def _relative(self, path: Any) -> str:
+        if not isinstance(path, str) or not path:
+            raise RPCError(INVALID_PARAMS, "'path' must be a non-empty string")
+        candidate = Path(path) if Path(path).is_absolute() else self.base_path / path
+        try:
+            return candidate.resolve().relative_to(self.base_path).as_posix()
+        except ValueError:
+            raise RPCError(INVALID_PARAMS, f"{path} is outside the knowledge base")
+
+    # -- index state -----------------------------------------------------
+
+    def known_paths(self) -> FrozenSet[str]:
+        """Indexed note paths, cached until the index changes."""
+        with self._paths_lock:
+            if self._paths is None:
+                with self._index() as index:
+                    self._paths = frozenset(index.note_paths())
+            return self._paths
+
+    def path_exists(self, rel_path: str) -> bool:
+        if rel_path in self.known_paths():
+            return True
+        # Not a note (an image, a directory) or not indexed yet
+        return (self.base_path / rel_path).exists()
+
+    def apply_changes(self, paths: Optional[Iterable[Path]]) -> Dict[str, int]:
+        """Re-index changed notes (None: resync the whole tree)."""
+        with self._write_lock:
+            counts = self.writer.sync() if paths is None else self.writer.update(paths)
+            if counts['indexed'] or counts['removed']:
+                self.writer.write_summaries()
+                with self._paths_lock:
+                    self._paths = None
+        return counts
+
+    # -- methods ---------------------------------------------------------
+
+    def ping(self) -> Dict:
+        return {'notes': len(self.known_paths())}
+
+    def search(self, query: str, limit: int = 20, tag: Optional[str] = None) -> List[Dict]:
+        if not isinstance(query, str) or not query.strip():
+            raise RPCError(INVALID_PARAMS, "'query' must be a non-empty string")
+        if not isinstance(limit, int) or isinstance(limit, bool) or limit < 1:
+            raise RPCError(INVALID_PARAMS, "'limit' must be a positive integer")
+        if tag is not None and not isinstance(tag, str):
+            raise RPCError(INVALID_PARAMS, "'tag' must be a string")
+        with self._index() as index:
+            return index.search(query, limit, tag)
+
+    def backlinks(self, path: str) -> List[str]:
+        with self._index() as index:
+            return index.backlinks(self._relative(path))
+
+    def outlinks(self, path: str) -> List[str]:
+        with self._index() as index:
+            return index.outlinks(self._relative(path))
+
+    def tags(self) -> Dict[str, int]:
+        with self._index() as index:
+            return index.tag_counts()
+
+    def notes_with_tag(self, tag: str, descendants: bool = True) -> List[str]:
+        if not isinstance(tag, str) or not tag:
+            raise RPCError(INVALID_PARAMS, "'tag' must be a non-empty string")
+        if not isinstance(descendants, bool):
+            raise RPCError(INVALID_PARAMS, "'descendants' must be a boolean")
+        with self._index() as index:
+            return index.notes_with_tag(tag, descendants)
+
+    def metadata(self, path: str) -> Optional[Dict]:
+        with self._index() as index:
+            return index.metadata(self._relative(path))
+
+    def validate(self, path: str, text: Optional[str] = None) -> List[Dict]:
+        rel_path = self._relative(path)
+        if text is not None and not isinstance(text, str):
+            raise RPCError(INVALID_PARAMS, "'text' must be a string")
+        if text is None:
+            try:
+                with open(self.base_path / rel_path, 'r', encoding='utf-8', errors='replace') as f:
+                    text = f.read()
+            except OSError as e:
+                raise RPCError(INVALID_PARAMS, f"Cannot read {rel_path}: {e.strerror}")
+        return [diagnostic.to_dict() for diagnostic in
+                self.validator.validate(rel_path, text, self.path_exists)]
+
+    def reindex(self, paths: Optional[List[str]] = None) -> Dict[str, int]:
+        if paths is None:
+            return self.apply_changes(None)
+        if not isinstance(paths, list):
+            raise RPCError(INVALID_PARAMS, "'paths' must be an array of strings")
+        return self.apply_changes(self.base_path / self._relative(path) for path in paths)
+
+    # -- dispatch --------------------------------------------------------
+
+    def dispatch(self, request: Any) -> Optional[Dict]:
+        """Run one JSON-RPC request object; returns the response (None for notifications)."""
+        request_id = request.get('id') if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict) or request.get('jsonrpc') != '2.0' \
+                    or not isinstance(request.get('method'), str):
+                raise RPCError(INVALID_REQUEST, 'Invalid request')
+            method = self.methods.get(request['method'])
+            if method is None:
+                raise RPCError(METHOD_NOT_FOUND, f"Method not found: {request['method']}")
+            params = request.get('params', {})
+            if isinstance(params, dict):
+                args, kwargs = (), params
+            elif isinstance(params, list):
+                args, kwargs = params, {}
+            else:
+                raise RPCError(INVALID_PARAMS, 'params must be an object or an array')
+            # Only a failure to bind the parameters is the caller's fault;
+            # a TypeError raised inside the method is an internal error
+            try:
+                inspect.signature(method).bind(*args, **kwargs)
+            except TypeError as e:
+                raise RPCError(INVALID_PARAMS, str(e))
+            result = method(*args, **kwargs)
+        except RPCError as e:
+            response = {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': e.code, 'message': e.message}}
+        except Exception as e:
+            logger.exception(f"Request failed: {request.get('method')}")
+            response = {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': INTERNAL_ERROR, 'message': str(e)}}
+        else:
+            response = {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+
+        if isinstance(request, dict) and 'id' not in request:
+            return None  # notifications get no response
+        return response
+
+    def handle_line(self, line: bytes) -> Optional[bytes]:
+        """Answer one line of the protocol (a request or a batch)."""
+        try:
+            message = json.loads(line)
+        except ValueError:
+            response = {'jsonrpc': '2.0', 'id': None, 'error': {'code': PARSE_ERROR, 'message': 'Parse error'}}
+        else:
+            if isinstance(message, list) and message:
+                responses = [r for r in map(self.dispatch, message) if r is not None]
+                response = responses or None
+            else:
+                response = self.dispatch(message)
+        if response is None:
+            return None
+        return json.dumps(response, ensure_ascii=False, default=str).encode('utf-8') + b'\n'
+
+    def close(self):
+        while not self._readers.empty():
+            self._readers.get().close()
+        self.writer.close()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Serves newline-delimited JSON-RPC on one client connection."""
+
+    def handle(self):
+        service: KBQueryService = self.server.service
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = service.handle_line(line)
+            if response is not None:
+                self.wfile.write(response)
+                self.wfile.flush()
+
+
+class ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class ThreadingLocalTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def _remove_stale_socket(socket_path: Path):
+    """Delete a socket file left by a server that is no longer running."""
+    if not socket_path.exists():
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(socket_path))
+    except OSError:
+        socket_path.unlink()
+    else:
+        raise SystemExit(f"❌ A server is already listening on {socket_path}")
+    finally:
+        probe.close()
+
+
+def create_server(service: KBQueryService, socket_path: Optional[Path] = None,
+                  port: Optional[int] = None) -> socketserver.BaseServer:
+    """Bind the transport: a Unix socket (owner-only) or 127.0.0.1:port."""
+    if port is not None:
+        server = ThreadingLocalTCPServer(('127.0.0.1', port), _RequestHandler)
+    else:
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        _remove_stale_socket(socket_path)
+        old_umask = os.umask(0o077)
+        try:
+            server = ThreadingUnixServer(str(socket_path), _RequestHandler)
+        finally:
+            os.umask(old_umask)
+    server.service = service
+    return server
+
+
+def call(method: str, params: Any = None, socket_path: Optional[Path] = None,
+         port: Optional[int] = None, timeout: float = 30.0) -> Any:
+    """Send one request to a running server and return its result (raises RPCError)."""
+    if port is not None:
+        connection = socket.create_connection(('127.0.0.1', port), timeout=timeout)
+    else:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(timeout)
+        connection.connect(str(socket_path))
+    with connection, connection.makefile('rwb') as stream:
+        request = {'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': params or {}}
+        stream.write(json.dumps(request).encode('utf-8') + b'\n')
+        stream.flush()
+        response = json.loads(stream.readline())
+    if 'error' in response:
+        raise RPCError(response['error']['code'], response['error']['message'])
+    return response['result']
+
+
+def main() -> int:
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-path', type=Path, default=Path('.'), help='Knowledge base root')
+    transport = parser.add_mutually_exclusive_group()
+    transport.add_argument('--socket', type=Path, help='Unix socket path (default: .kb/cache/kb-server.sock)')
+    transport.add_argument('--port', type=int, help='Listen on 127.0.0.1:PORT instead of a Unix socket')
+    parser.add_argument('--readers', type=int, default=DEFAULT_READERS,
+                        help=f'Open index connections shared by request threads (default: {DEFAULT_READERS})')
+    parser.add_argument('--watch', action='store_true', help='Re-index notes as they change')
+    parser.add_argument('--debounce', type=float, default=0.5, help='Seconds of quiet before re-indexing')
+    parser.add_argument('--poll', action='store_true', help='Poll for changes instead of using inotify')
+    parser.add_argument('--call', metavar='METHOD', help='Client mode: call METHOD on a running server')
+    parser.add_argument('--params', default='{}', help='Client mode: JSON params for --call')
+    parser.add_argument('--verbose', action='store_true', help='Detailed output')
+
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    base_path = args.base_path.resolve()
+    socket_path = args.socket or base_path / DEFAULT_SOCKET
+
+    if args.call:
+        try:
+            result = call(args.call, json.loads(args.params), socket_path, args.port)
+        except (OSError, ValueError) as e:
+            logger.error(f"❌ Request failed: {e}")
+            return 1
+        except RPCError as e:
+            logger.error(f"❌ {e.message} ({e.code})")
+            return 1
+        print(json.dumps(result, indent=2, ensure_ascii=False, default=str))
+        return 0
+
+    started = time.perf_counter()
+    service = KBQueryService(base_path, args.readers)
+    server = create_server(service, socket_path, args.port)
+    address = f"127.0.0.1:{args.port}" if args.port is not None else str(socket_path)
+    logger.info(f"🚀 Serving {len(service.known_paths())} notes on {address} "
+                f"(ready in {time.perf_counter() - started:.2f}s)")
+
+    if args.watch:
+        def on_change(paths):
+            counts = service.apply_changes(paths)
+            if counts['indexed'] or counts['removed']:
+                logger.info(f"🔄 Re-indexed {counts['indexed']} notes, removed {counts['removed']}")
+
+        threading.Thread(target=watch, args=(base_path, on_change),
+                         kwargs={'skip_dirs': service.writer.skip_dirs, 'debounce': args.debounce,
+                                 'poll': args.poll},
+                         name='kb-watch', daemon=True).start()
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("🛑 Shutting down")
+    finally:
+        server.server_close()
+        if args.port is None and socket_path.exists():
+            socket_path.unlink()
+        service.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,6 +13,18 @@ Usage:
     python3 maintain_kb_enhanced.py --scan
     python3 maintain_kb_enhanced.py --fix
     python3 maintain_kb_enhanced.py --optimize
+    python3 maintain_kb_enhanced.py --scan --fix --changed-since origin/main
+    python3 maintain_kb_enhanced.py --watch --debounce 0.5
+
+--changed-since/--staged limit scanning and fixing to the changed files and
+the directories they touch; --optimize always covers the whole tree because
+the archive pass and the tag/category indexes are global.
+
+--watch keeps 30-data/indexes (kb-index.db with the frontmatter cache, link
+graph, tags and full-text index, plus tags.json/categories.json) up to date:
+changes are picked up through inotify, or by polling a stat snapshot where
+inotify is unavailable, and each debounced batch re-indexes only the notes
+that changed.
 """
 
 import os
@@ -21,14 +33,24 @@ import yaml
 import json
 import sqlite3
 import argparse
+import logging
+import time
 from pathlib import Path
 from datetime import datetime, timedelta
 from collections import Counter, defaultdict
 from typing import Dict, List, Set, Tuple, Optional
 
+from frontmatter_io import prepend_frontmatter, write_if_changed
+from git_changes import ChangeSet, GitChangesError, add_change_arguments, changes_from_args
+from move_planner import MovePlanner
+from kb_index import KBIndex
+from fs_watch import watch
+
 class KnowledgeBaseMaintainer:
-    def __init__(self, base_path: str = "."):
+    def __init__(self, base_path: str = ".", changes: Optional[ChangeSet] = None):
         self.base_path = Path(base_path)
+        # When set, scans and fixes only cover these paths
+        self.changes = changes
         self.issues = []
         self.stats = defaultdict(int)
         self.kb_policy = self._load_policy()
@@ -41,6 +63,21 @@ class KnowledgeBaseMaintainer:
                 return yaml.safe_load(f)
         return {}
     
+    def _markdown_files(self) -> List[Path]:
+        """Markdown files to process: the whole tree, or the changed files."""
+        if self.changes is None:
+            return list(self.base_path.rglob("*.md"))
+        return [self.base_path / path.relative_to(self.changes.base_path)
+                for path in self.changes.markdown_files()]
+    
+    def _all_paths(self):
+        """Files and directories to measure: the whole tree, or the changed files and their parents."""
+        if self.changes is None:
+            return self.base_path.rglob("*")
+        files = [self.base_path / path.relative_to(self.changes.base_path) for path in self.changes.changed]
+        dirs = [self.base_path / rel for rel in self.changes.affected_dirs if rel != Path('.')]
+        return files + dirs
+    
     def scan_content(self) -> Dict:
         """Comprehensive content scanning and analysis"""
         print("🔍 Scanning knowledge base content...")
@@ -65,6 +102,8 @@ class KnowledgeBaseMaintainer:
                         '70-presentations', '80-resources', '90-archive']
         
         for req_dir in required_dirs:
+            if self.changes is not None and not self.changes.touches(req_dir):
+                continue
             dir_path = self.base_path / req_dir
             if not dir_path.exists():
                 issues.append({
@@ -77,6 +116,8 @@ class KnowledgeBaseMaintainer:
         # Check for files in root that should be categorized
         for item in self.base_path.iterdir():
             if item.is_file() and item.suffix == '.md':
+                if self.changes is not None and not self.changes.includes(item.name):
+                    continue
                 if item.name not in ['README.md', 'TODO.md', 'TASKS.md', 
                                    'CHANGELOG.md', 'GOVERNANCE.md', 'CONTRIBUTING.md']:
                     issues.append({
@@ -91,7 +132,7 @@ class KnowledgeBaseMaintainer:
     def _check_metadata(self) -> List[Dict]:
         """Validate YAML frontmatter across all markdown files"""
         issues = []
-        md_files = list(self.base_path.rglob("*.md"))
+        md_files = self._markdown_files()
         
         for md_file in md_files:
             if any(skip in str(md_file) for skip in ['.git', '.kb', '.venv']):
@@ -174,7 +215,7 @@ class KnowledgeBaseMaintainer:
             'draft_files': 0
         }
         
-        md_files = list(self.base_path.rglob("*.md"))
+        md_files = self._markdown_files()
         content_lengths = []
         cutoff_date = datetime.now() - timedelta(days=180)
         
@@ -229,7 +270,7 @@ class KnowledgeBaseMaintainer:
     def _validate_cross_references(self) -> List[Dict]:
         """Validate all cross-references and internal links"""
         issues = []
-        md_files = list(self.base_path.rglob("*.md"))
+        md_files = self._markdown_files()
         
         for md_file in md_files:
             if any(skip in str(md_file) for skip in ['.git', '.kb', '.venv']):
@@ -286,7 +327,7 @@ class KnowledgeBaseMaintainer:
         cutoff_date = datetime.now() - timedelta(days=365)
         stale_cutoff = datetime.now() - timedelta(days=90)
         
-        md_files = list(self.base_path.rglob("*.md"))
+        md_files = self._markdown_files()
         
         for md_file in md_files:
             if any(skip in str(md_file) for skip in ['.git', '.kb', '.venv']):
@@ -344,7 +385,7 @@ class KnowledgeBaseMaintainer:
         file_sizes = []
         file_names = Counter()
         
-        for file_path in self.base_path.rglob("*"):
+        for file_path in self._all_paths():
             if file_path.is_file() and not any(skip in str(file_path) for skip in ['.git', '.venv']):
                 size = file_path.stat().st_size
                 total_size += size
@@ -363,7 +404,7 @@ class KnowledgeBaseMaintainer:
         metrics['duplicate_names'] = [(name, count) for name, count in file_names.items() if count > 1]
         
         # Find deep directories
-        for dir_path in self.base_path.rglob("*"):
+        for dir_path in self._all_paths():
             if dir_path.is_dir():
                 depth = len(dir_path.parts) - len(self.base_path.parts)
                 if depth > 6:
@@ -474,7 +515,7 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         }
         
         # Add missing frontmatter
-        md_files = list(self.base_path.rglob("*.md"))
+        md_files = self._markdown_files()
         
         for md_file in md_files:
             if any(skip in str(md_file) for skip in ['.git', '.kb', '.venv']):
@@ -490,23 +531,18 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
                     created_date = datetime.fromtimestamp(md_file.stat().st_ctime).strftime('%Y-%m-%d')
                     updated_date = datetime.fromtimestamp(md_file.stat().st_mtime).strftime('%Y-%m-%d')
                     
-                    frontmatter = f"""---
-title: {title}
+                    frontmatter = f"""title: {title}
 description: Auto-generated description
 status: draft
 created: {created_date}
 updated: {updated_date}
 tags: [auto-generated]
 version: 1.0.0
----
-
 """
                     
-                    with open(md_file, 'w', encoding='utf-8') as f:
-                        f.write(frontmatter + content)
-                    
-                    fixes_applied['frontmatter_added'] += 1
-                    print(f"Added frontmatter to {md_file}")
+                    if write_if_changed(md_file, prepend_frontmatter(content, frontmatter), content):
+                        fixes_applied['frontmatter_added'] += 1
+                        print(f"Added frontmatter to {md_file}")
             
             except Exception as e:
                 print(f"Error fixing {md_file}: {e}")
@@ -532,16 +568,24 @@ version: 1.0.0
         
         cutoff_date = datetime.now() - timedelta(days=365)
         
+        # Plan every archive move first: flattening nested projects into one
+        # directory can collide, and links to archived notes must follow them
+        planner = MovePlanner(self.base_path)
         if completed_dir.exists():
             for project_file in completed_dir.rglob("*.md"):
                 if project_file.stat().st_mtime < cutoff_date.timestamp():
-                    try:
-                        new_path = archive_dir / project_file.name
-                        project_file.rename(new_path)
-                        optimizations['archived_files'] += 1
-                        print(f"Archived {project_file} to {new_path}")
-                    except Exception as e:
-                        print(f"Error archiving {project_file}: {e}")
+                    move = planner.add(project_file, archive_dir / project_file.name)
+                    if move.renamed:
+                        print(f"Name conflict: archiving {project_file} as {move.target.name}")
+                    print(f"Archiving {project_file} to {move.target}")
+        
+        try:
+            stats = planner.apply()
+            optimizations['archived_files'] = stats['moved']
+            if stats['links_rewritten_files']:
+                print(f"🔗 Updated links in {stats['links_rewritten_files']} files")
+        except OSError as e:
+            print(f"Error archiving projects: {e}")
         
         # Update search indexes
         self._update_search_indexes()
@@ -552,50 +596,41 @@ version: 1.0.0
     
     def _update_search_indexes(self):
         """Update search indexes for better performance"""
-        indexes_dir = self.base_path / "30-data" / "indexes"
-        indexes_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Create tag index
-        tag_counter = Counter()
-        category_counter = Counter()
-        
-        md_files = list(self.base_path.rglob("*.md"))
-        
-        for md_file in md_files:
-            if any(skip in str(md_file) for skip in ['.git', '.kb', '.venv']):
-                continue
-            
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                if content.startswith('---'):
-                    frontmatter_end = content.find('---', 3)
-                    if frontmatter_end != -1:
-                        frontmatter = content[3:frontmatter_end].strip()
-                        metadata = yaml.safe_load(frontmatter)
-                        
-                        if 'tags' in metadata and metadata['tags']:
-                            for tag in metadata['tags']:
-                                tag_counter[tag] += 1
-                        
-                        # Determine category from path
-                        path_parts = md_file.parts
-                        if len(path_parts) > 1:
-                            category_counter[path_parts[1]] += 1
-            
-            except Exception:
-                continue
-        
-        # Write tag index
-        with open(indexes_dir / "tags.json", 'w') as f:
-            json.dump(dict(tag_counter), f, indent=2)
-        
-        # Write category index
-        with open(indexes_dir / "categories.json", 'w') as f:
-            json.dump(dict(category_counter), f, indent=2)
+        # Only notes whose mtime/size changed since the last run are re-parsed
+        with KBIndex(self.base_path) as index:
+            counts = index.sync()
+            tag_count, category_count = index.write_summaries()
         
-        print(f"📊 Updated search indexes with {len(tag_counter)} tags and {len(category_counter)} categories")
+        print(f"📊 Updated search indexes with {tag_count} tags and {category_count} categories "
+              f"({counts['indexed']} notes re-indexed, {counts['removed']} removed)")
+    
+    def watch(self, debounce: float = 0.5, poll: bool = False, poll_interval: float = 2.0):
+        """Keep the indexes in 30-data/indexes fresh as notes change, until interrupted"""
+        index = KBIndex(self.base_path)
+        counts = index.sync()
+        index.write_summaries()
+        print(f"📊 Index ready ({counts['indexed']} notes re-indexed, {counts['removed']} removed)")
+        
+        def on_change(paths):
+            started = time.perf_counter()
+            if paths is None:
+                # Events were lost; the stat comparison finds what changed
+                counts = index.sync()
+            else:
+                counts = index.update(paths)
+            if counts['indexed'] or counts['removed']:
+                index.write_summaries()
+                elapsed = (time.perf_counter() - started) * 1000
+                print(f"🔄 Re-indexed {counts['indexed']} notes, removed {counts['removed']} ({elapsed:.0f} ms)")
+        
+        print("👀 Watching for changes (Ctrl+C to stop)...")
+        try:
+            watch(self.base_path, on_change, skip_dirs=index.skip_dirs, debounce=debounce,
+                  poll=poll, poll_interval=poll_interval)
+        except KeyboardInterrupt:
+            print("\n🛑 Stopped watching")
+        finally:
+            index.close()
 
 def main():
     parser = argparse.ArgumentParser(description="Enhanced Knowledge Base Maintenance Tool")
@@ -603,15 +638,27 @@ def main():
     parser.add_argument("--fix", action="store_true", help="Automatically fix common issues")
     parser.add_argument("--optimize", action="store_true", help="Optimize performance and organization")
     parser.add_argument("--all", action="store_true", help="Run scan, fix, and optimize")
+    parser.add_argument("--watch", action="store_true", help="Watch the tree and keep the indexes up to date")
+    parser.add_argument("--debounce", type=float, default=0.5, help="Seconds of quiet before a batch of changes is indexed")
+    parser.add_argument("--poll", action="store_true", help="Poll for changes instead of using inotify")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds between polls")
     parser.add_argument("--path", default=".", help="Path to knowledge base root")
+    add_change_arguments(parser)
     
     args = parser.parse_args()
     
-    if not any([args.scan, args.fix, args.optimize, args.all]):
+    if not any([args.scan, args.fix, args.optimize, args.all, args.watch]):
         parser.print_help()
         return
     
-    maintainer = KnowledgeBaseMaintainer(args.path)
+    try:
+        changes = changes_from_args(args, Path(args.path))
+    except GitChangesError as e:
+        raise SystemExit(f"❌ Could not determine changed files: {e}")
+    if changes is not None:
+        print(f"🔀 Incremental mode: {len(changes)} changed paths")
+    
+    maintainer = KnowledgeBaseMaintainer(args.path, changes)
     
     if args.scan or args.all:
         maintainer.scan_content()
@@ -622,6 +669,11 @@ def main():
     if args.optimize or args.all:
         maintainer.optimize()
     
+    if args.watch:
+        logging.basicConfig(level=logging.INFO, format='%(message)s')
+        maintainer.watch(args.debounce, args.poll, args.poll_interval)
+        return
+    
     print("✅ Knowledge base maintenance completed!")
 
 if __name__ == "__main__":
@@ -12,15 +12,25 @@ Examples:
     maintain_organization.py --verbose
     maintain_organization.py --dry-run --check-structure
     maintain_organization.py --validate-all
+    maintain_organization.py --validate-all --changed-since origin/main
+    maintain_organization.py --validate-all --git-history
+    maintain_organization.py --validate-all --db-maintenance
 """
 
 import argparse
 import logging
+import os
+import subprocess
 import sys
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict, Optional, Set
+from typing import Any, List, Dict, Optional, Set, Tuple
 import json
 
+from db_health import REQUIRED_DATABASES, HealthThresholds, check_databases, log_health, run_maintenance
+from git_changes import ChangeSet, GitChangesError, add_change_arguments, changes_from_args
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -28,14 +38,276 @@ logging.basicConfig(
 )
 logger = logging.getLogger('maintain-organization')
 
+# Tracked blobs above this size are reported by check_git_integrity
+LARGE_FILE_BYTES = 10 * 1024 * 1024
+GITLINK_MODE = '160000'  # submodule entries point at commits, not blobs
+
+
+def large_index_blobs(base_path: Path, threshold: int = LARGE_FILE_BYTES) -> List[Tuple[str, int]]:
+    """(path, size) of every blob in the index larger than ``threshold``.
+
+    Sizes come from the object store: one ``git ls-files -s -z`` lists the
+    index and one ``git cat-file --batch-check`` reports every blob size, so
+    nothing in the work tree is stat()ed.
+    """
+    listing = subprocess.run(['git', 'ls-files', '-s', '-z'], cwd=base_path,
+                             capture_output=True, check=True, timeout=60)
+    paths_by_blob: Dict[str, List[str]] = {}
+    for entry in listing.stdout.decode('utf-8', errors='surrogateescape').split('\0'):
+        if not entry:
+            continue
+        info, path = entry.split('\t', 1)
+        mode, blob, _stage = info.split(' ')
+        if mode != GITLINK_MODE:
+            paths_by_blob.setdefault(blob, []).append(path)
+    if not paths_by_blob:
+        return []
+
+    sizes = subprocess.run(['git', 'cat-file', '--batch-check=%(objectname) %(objectsize)'],
+                           cwd=base_path, input=''.join(f"{blob}\n" for blob in paths_by_blob).encode(),
+                           capture_output=True, check=True, timeout=60)
+    large = []
+    for line in sizes.stdout.decode().splitlines():
+        blob, size = line.split(' ', 1)
+        if size.isdigit() and int(size) > threshold:
+            large.extend((path, int(size)) for path in paths_by_blob[blob])
+    return sorted(large, key=lambda item: -item[1])
+
+
+def large_history_blobs(base_path: Path, threshold: int = LARGE_FILE_BYTES) -> List[Tuple[str, int]]:
+    """(path, size) of blobs larger than ``threshold`` reachable from any ref.
+
+    ``git rev-list --objects --all`` is piped straight into ``git cat-file
+    --batch-check``; each object is listed once, under the first path it was
+    seen at.
+    """
+    rev_list = subprocess.Popen(['git', 'rev-list', '--objects', '--all'], cwd=base_path,
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    batch_check = subprocess.Popen(['git', 'cat-file', '--batch-check=%(objecttype) %(objectsize) %(rest)'],
+                                   cwd=base_path, stdin=rev_list.stdout, stdout=subprocess.PIPE)
+    rev_list.stdout.close()  # cat-file owns the pipe now
+    large = []
+    for line in batch_check.stdout:
+        kind, size, path = line.decode('utf-8', errors='surrogateescape').rstrip('\n').split(' ', 2)
+        if kind == 'blob' and int(size) > threshold:
+            large.append((path, int(size)))
+    if batch_check.wait() != 0 or rev_list.wait() != 0:
+        raise subprocess.CalledProcessError(rev_list.returncode or batch_check.returncode,
+                                            'git rev-list --objects --all | git cat-file --batch-check')
+    return sorted(large, key=lambda item: -item[1])
+
+@dataclass
+class Document:
+    """One markdown file as read by the validator's single walk."""
+    path: Path
+    rel_path: Path
+    data: bytes
+    stat: os.stat_result
+    text: Optional[str]  # None when the file is not valid UTF-8
+
+
+class DocumentCheck(ABC):
+    """Per-document check fed by AcademicStructureValidator.walk_documents().
+
+    visit() sees every document during the walk and should only collect
+    findings; finish() runs once afterwards to log, record issues on the
+    validator and return the check's result. Both are abstract, so a check
+    missing either one cannot be instantiated and registered.
+    """
+
+    name = ''
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Clear collected state before a walk."""
+
+    @abstractmethod
+    def visit(self, doc: Document):
+        """Collect findings for one document."""
+
+    @abstractmethod
+    def finish(self, validator: 'AcademicStructureValidator') -> Any:
+        """Log and record the collected findings and return the result."""
+
+
+class EmptyFileCheck(DocumentCheck):
+    """Empty or nearly empty markdown files that need content."""
+
+    name = 'empty_files'
+    min_content_chars = 50
+
+    def reset(self):
+        self.empty_files = []
+        self.small_files = []
+
+    def visit(self, doc: Document):
+        if doc.text is None:
+            return
+        content = doc.text.strip()
+
+        # Count lines excluding YAML frontmatter
+        content_lines = []
+        in_frontmatter = False
+        frontmatter_count = 0
+
+        for line in content.split('\n'):
+            if line.strip() == '---':
+                frontmatter_count += 1
+                in_frontmatter = frontmatter_count == 1
+                continue
+            if not in_frontmatter and line.strip():
+                content_lines.append(line.strip())
+
+        actual_content = '\n'.join(content_lines).strip()
+
+        if not content:
+            self.empty_files.append(doc.path)
+        elif len(actual_content) < self.min_content_chars:
+            self.small_files.append((doc.path, len(actual_content)))
+
+    def finish(self, validator: 'AcademicStructureValidator') -> List[Path]:
+        logger.info("📝 Detecting empty markdown files...")
+        for md_file in self.empty_files:
+            logger.error(f"❌ Empty file: {md_file.relative_to(validator.base_path)}")
+            validator.issues_found.append(f"Empty file: {md_file.relative_to(validator.base_path)}")
+        for md_file, size in self.small_files:
+            logger.warning(f"⚠️  Minimal content file ({size} chars): {md_file.relative_to(validator.base_path)}")
+            validator.issues_found.append(f"Minimal content file: {md_file.relative_to(validator.base_path)}")
+
+        if self.empty_files:
+            logger.warning(f"Found {len(self.empty_files)} completely empty files")
+        if self.small_files:
+            logger.warning(f"Found {len(self.small_files)} files with minimal content")
+
+        if not self.empty_files and not self.small_files:
+            logger.info("✅ No empty or minimal content files found")
+
+        return self.empty_files + [f[0] for f in self.small_files]
+
+
+class FrontmatterCheck(DocumentCheck):
+    """Presence and completeness of YAML frontmatter."""
+
+    name = 'frontmatter'
+    required_fields = ['title', 'description', 'status', 'created', 'updated', 'tags']
+
+    def reset(self):
+        self.files_without_frontmatter = []
+        self.files_with_invalid_frontmatter = []
+        self.files_with_incomplete_frontmatter = []
+
+    def visit(self, doc: Document):
+        content = doc.text
+        if content is None:
+            return
+
+        if not content.startswith('---'):
+            self.files_without_frontmatter.append(doc.path)
+            return
+
+        parts = content.split('---', 2)
+        if len(parts) < 3:
+            self.files_with_invalid_frontmatter.append(doc.path)
+            return
+
+        frontmatter_text = parts[1].strip()
+
+        # Check for required fields
+        missing_fields = [field for field in self.required_fields if f"{field}:" not in frontmatter_text]
+        if missing_fields:
+            self.files_with_incomplete_frontmatter.append((doc.path, missing_fields))
+
+    def finish(self, validator: 'AcademicStructureValidator') -> bool:
+        logger.info("🏷️  Validating YAML frontmatter...")
+        base_path = validator.base_path
+        frontmatter_valid = True
+
+        if self.files_without_frontmatter:
+            logger.warning(f"⚠️  Found {len(self.files_without_frontmatter)} files without YAML frontmatter")
+            for file_path in self.files_without_frontmatter[:5]:
+                logger.warning(f"  - {file_path.relative_to(base_path)}")
+            if len(self.files_without_frontmatter) > 5:
+                logger.warning(f"  ... and {len(self.files_without_frontmatter) - 5} more")
+            frontmatter_valid = False
+
+        if self.files_with_invalid_frontmatter:
+            logger.warning(f"⚠️  Found {len(self.files_with_invalid_frontmatter)} files with invalid YAML frontmatter")
+            for file_path in self.files_with_invalid_frontmatter[:3]:
+                logger.warning(f"  - {file_path.relative_to(base_path)}")
+            frontmatter_valid = False
+
+        if self.files_with_incomplete_frontmatter:
+            logger.warning(f"⚠️  Found {len(self.files_with_incomplete_frontmatter)} files with incomplete frontmatter")
+            for file_path, missing in self.files_with_incomplete_frontmatter[:3]:
+                logger.warning(f"  - {file_path.relative_to(base_path)} missing: {', '.join(missing)}")
+            frontmatter_valid = False
+
+        if frontmatter_valid:
+            logger.info("✅ All markdown files have valid YAML frontmatter")
+        else:
+            logger.info("💡 Run yaml-frontmatter-enforcer.py to fix these issues")
+            validator.issues_found.extend([f"Frontmatter issue in: {f.relative_to(base_path)}" for f in self.files_without_frontmatter])
+            validator.issues_found.extend([f"Invalid frontmatter in: {f.relative_to(base_path)}" for f in self.files_with_invalid_frontmatter])
+            validator.issues_found.extend([f"Incomplete frontmatter in: {f[0].relative_to(base_path)}" for f in self.files_with_incomplete_frontmatter])
+
+        return frontmatter_valid
+
+
+class ContentMetricsCheck(DocumentCheck):
+    """File counts and sizes per directory for the report."""
+
+    name = 'content_metrics'
+
+    def reset(self):
+        self.dir_counts = {}
+        self.total_files = 0
+        self.total_size = 0
+
+    def visit(self, doc: Document):
+        dir_name = str(doc.rel_path.parent) if doc.rel_path.parent != Path('.') else 'root'
+        counts = self.dir_counts.setdefault(dir_name, {'count': 0, 'size': 0})
+        counts['count'] += 1
+        counts['size'] += doc.stat.st_size
+        self.total_files += 1
+        self.total_size += doc.stat.st_size
+
+    def finish(self, validator: 'AcademicStructureValidator') -> Dict:
+        return {
+            'total_markdown_files': self.total_files,
+            'total_content_size': self.total_size,
+            'average_file_size': self.total_size // self.total_files if self.total_files else 0,
+            'files_by_directory': self.dir_counts
+        }
+
+
+DEFAULT_DOCUMENT_CHECKS = (EmptyFileCheck, FrontmatterCheck, ContentMetricsCheck)
+
+
 class AcademicStructureValidator:
     """Validates and maintains academic directory structure."""
 
-    def __init__(self, base_path: Path, dry_run: bool = False):
+    def __init__(self, base_path: Path, dry_run: bool = False, changes: Optional[ChangeSet] = None,
+                 git_history: bool = False, db_maintenance: bool = False,
+                 db_thresholds: HealthThresholds = HealthThresholds()):
         self.base_path = base_path
         self.dry_run = dry_run
+        # Also scan every blob reachable from any ref for oversized files
+        self.git_history = git_history
+        # Run the ANALYZE/optimize/vacuum that the database check schedules
+        self.db_maintenance = db_maintenance
+        self.db_thresholds = db_thresholds
+        # When set, checks only cover these paths and the directories they touch
+        self.changes = changes
         self.issues_found = []
 
+        # Per-document checks share one walk over the markdown files
+        self.document_checks: Dict[str, DocumentCheck] = {}
+        self._check_results: Optional[Dict[str, Any]] = None
+        for check_class in DEFAULT_DOCUMENT_CHECKS:
+            self.register_check(check_class())
+
         # Academic directory structure (follows 00-90 taxonomy)
         self.required_dirs = {
             '10-knowledge': {
@@ -78,12 +350,24 @@ class AcademicStructureValidator:
             'README.md', 'GOVERNANCE.md', 'CITATION.cff', 'CHANGELOG.md'
         ]
 
+    def _markdown_files(self) -> List[Path]:
+        """Markdown files to check: the whole tree, or the changed files."""
+        if self.changes is None:
+            return list(self.base_path.glob("**/*.md"))
+        return [self.base_path / path.relative_to(self.changes.base_path)
+                for path in self.changes.markdown_files()]
+
+    def _in_scope(self, rel_dir: str) -> bool:
+        return self.changes is None or self.changes.touches(rel_dir)
+
     def check_directory_structure(self) -> bool:
         """Check and create missing directories."""
         logger.info("📁 Checking academic directory structure...")
         structure_valid = True
 
         for main_dir, subdirs in self.required_dirs.items():
+            if not self._in_scope(main_dir):
+                continue
             main_path = self.base_path / main_dir
 
             if not main_path.exists():
@@ -118,6 +402,8 @@ class AcademicStructureValidator:
         readmes_valid = True
 
         for dir_path in self.readme_dirs:
+            if not self._in_scope(dir_path):
+                continue
             readme_path = self.base_path / dir_path / 'README.md'
             if not readme_path.exists():
                 logger.warning(f"⚠️  Missing README.md in: {dir_path}")
@@ -134,6 +420,8 @@ class AcademicStructureValidator:
         root_files_valid = True
 
         for filename in self.required_root_files:
+            if self.changes is not None and not self.changes.includes(filename):
+                continue
             file_path = self.base_path / filename
             if not file_path.exists():
                 logger.error(f"❌ Missing root file: {filename}")
@@ -154,6 +442,7 @@ class AcademicStructureValidator:
         root_md_files = [
             f for f in self.base_path.glob("*.md")
             if f.name not in self.required_root_files + ['CONTRIBUTING.md', 'TODO.md', 'TASKS.md']
+            and (self.changes is None or self.changes.includes(f.name))
         ]
 
         if root_md_files:
@@ -168,132 +457,58 @@ class AcademicStructureValidator:
 
         return misplaced_files
 
-    def find_empty_files(self) -> List[Path]:
-        """Find empty or nearly empty markdown files that need content."""
-        logger.info("📝 Detecting empty markdown files...")
-        empty_files = []
-        small_files = []
+    def register_check(self, check: DocumentCheck):
+        """Add a per-document check to the shared walk."""
+        self.document_checks[check.name] = check
+        self._check_results = None
 
-        markdown_files = list(self.base_path.glob("**/*.md"))
+    def walk_documents(self):
+        """Read every markdown file once and feed it to all registered checks."""
+        checks = list(self.document_checks.values())
+        for check in checks:
+            check.reset()
 
-        for md_file in markdown_files:
+        for md_file in self._markdown_files():
             try:
-                content = md_file.read_text(encoding='utf-8').strip()
-                content_size = len(content)
-
-                # Count lines excluding YAML frontmatter
-                lines = content.split('\n')
-                content_lines = []
-                in_frontmatter = False
-                frontmatter_count = 0
-
-                for line in lines:
-                    if line.strip() == '---':
-                        frontmatter_count += 1
-                        in_frontmatter = frontmatter_count == 1
-                        continue
-                    if not in_frontmatter and line.strip():
-                        content_lines.append(line.strip())
-
-                actual_content = '\n'.join(content_lines).strip()
-
-                if content_size == 0:
-                    empty_files.append(md_file)
-                    logger.error(f"❌ Empty file: {md_file.relative_to(self.base_path)}")
-                    self.issues_found.append(f"Empty file: {md_file.relative_to(self.base_path)}")
-                elif len(actual_content) < 50:  # Less than 50 characters of actual content
-                    small_files.append((md_file, len(actual_content)))
-                    logger.warning(f"⚠️  Minimal content file ({len(actual_content)} chars): {md_file.relative_to(self.base_path)}")
-                    self.issues_found.append(f"Minimal content file: {md_file.relative_to(self.base_path)}")
-
-            except Exception as e:
+                with open(md_file, 'rb') as f:
+                    stat = os.fstat(f.fileno())
+                    data = f.read()
+            except OSError as e:
                 logger.warning(f"Could not read {md_file}: {e}")
-
-        if empty_files:
-            logger.warning(f"Found {len(empty_files)} completely empty files")
-        if small_files:
-            logger.warning(f"Found {len(small_files)} files with minimal content")
-
-        if not empty_files and not small_files:
-            logger.info("✅ No empty or minimal content files found")
-
-        return empty_files + [f[0] for f in small_files]
-
-    def validate_yaml_frontmatter(self) -> bool:
-        """Enhanced validation of YAML frontmatter with content analysis."""
-        logger.info("🏷️  Validating YAML frontmatter...")
-
-        markdown_files = list(self.base_path.glob("**/*.md"))
-        files_without_frontmatter = []
-        files_with_invalid_frontmatter = []
-        files_with_incomplete_frontmatter = []
-
-        required_fields = ['title', 'description', 'status', 'created', 'updated', 'tags']
-
-        for md_file in markdown_files:
+                continue
             try:
-                content = md_file.read_text(encoding='utf-8')
-
-                if not content.startswith('---'):
-                    files_without_frontmatter.append(md_file)
-                    continue
-
-                # Extract frontmatter
-                try:
-                    parts = content.split('---', 2)
-                    if len(parts) < 3:
-                        files_with_invalid_frontmatter.append(md_file)
-                        continue
-
-                    frontmatter_text = parts[1].strip()
-
-                    # Check for required fields
-                    missing_fields = []
-                    for field in required_fields:
-                        if f"{field}:" not in frontmatter_text:
-                            missing_fields.append(field)
-
-                    if missing_fields:
-                        files_with_incomplete_frontmatter.append((md_file, missing_fields))
-
-                except Exception:
-                    files_with_invalid_frontmatter.append(md_file)
-
-            except Exception as e:
+                # Same newline handling as read_text()
+                text = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+            except UnicodeDecodeError as e:
                 logger.warning(f"Could not read {md_file}: {e}")
+                text = None
 
-        # Report findings
-        frontmatter_valid = True
+            doc = Document(md_file, md_file.relative_to(self.base_path), data, stat, text)
+            for check in checks:
+                check.visit(doc)
 
-        if files_without_frontmatter:
-            logger.warning(f"⚠️  Found {len(files_without_frontmatter)} files without YAML frontmatter")
-            for file_path in files_without_frontmatter[:5]:
-                logger.warning(f"  - {file_path.relative_to(self.base_path)}")
-            if len(files_without_frontmatter) > 5:
-                logger.warning(f"  ... and {len(files_without_frontmatter) - 5} more")
-            frontmatter_valid = False
+        self._check_results = {}
 
-        if files_with_invalid_frontmatter:
-            logger.warning(f"⚠️  Found {len(files_with_invalid_frontmatter)} files with invalid YAML frontmatter")
-            for file_path in files_with_invalid_frontmatter[:3]:
-                logger.warning(f"  - {file_path.relative_to(self.base_path)}")
-            frontmatter_valid = False
+    def check_result(self, name: str) -> Any:
+        """Result of a registered check, walking the files on first use.
 
-        if files_with_incomplete_frontmatter:
-            logger.warning(f"⚠️  Found {len(files_with_incomplete_frontmatter)} files with incomplete frontmatter")
-            for file_path, missing in files_with_incomplete_frontmatter[:3]:
-                logger.warning(f"  - {file_path.relative_to(self.base_path)} missing: {', '.join(missing)}")
-            frontmatter_valid = False
+        Each check is finished (logged and recorded in issues_found) once per
+        walk. Later calls return the cached result without logging again, so
+        read issues_found or the returned value rather than relying on the log.
+        """
+        if self._check_results is None:
+            self.walk_documents()
+        if name not in self._check_results:
+            self._check_results[name] = self.document_checks[name].finish(self)
+        return self._check_results[name]
 
-        if frontmatter_valid:
-            logger.info("✅ All markdown files have valid YAML frontmatter")
-        else:
-            logger.info("💡 Run yaml-frontmatter-enforcer.py to fix these issues")
-            self.issues_found.extend([f"Frontmatter issue in: {f.relative_to(self.base_path)}" for f in files_without_frontmatter])
-            self.issues_found.extend([f"Invalid frontmatter in: {f.relative_to(self.base_path)}" for f in files_with_invalid_frontmatter])
-            self.issues_found.extend([f"Incomplete frontmatter in: {f[0].relative_to(self.base_path)}" for f in files_with_incomplete_frontmatter])
+    def find_empty_files(self) -> List[Path]:
+        """Find empty or nearly empty markdown files that need content."""
+        return self.check_result(EmptyFileCheck.name)
 
-        return frontmatter_valid
+    def validate_yaml_frontmatter(self) -> bool:
+        """Enhanced validation of YAML frontmatter with content analysis."""
+        return self.check_result(FrontmatterCheck.name)
 
     def check_git_integrity(self) -> bool:
         """Check git repository integrity and common issues."""
@@ -309,44 +524,38 @@ class AcademicStructureValidator:
 
         # Check for large files
         try:
-            import subprocess
-            result = subprocess.run(['git', 'ls-files'],
-                                  cwd=self.base_path,
-                                  capture_output=True,
-                                  text=True,
-                                  timeout=30)
-
-            if result.returncode == 0:
-                large_files = []
-                for file_line in result.stdout.strip().split('\n'):
-                    if file_line:
-                        file_path = self.base_path / file_line
-                        if file_path.exists() and file_path.stat().st_size > 10 * 1024 * 1024:  # 10MB
-                            large_files.append((file_line, file_path.stat().st_size // (1024 * 1024)))
-
-                if large_files:
-                    logger.warning(f"⚠️  Found {len(large_files)} large files in git:")
-                    for file_name, size_mb in large_files[:3]:
-                        logger.warning(f"  - {file_name} ({size_mb}MB)")
-                    issues_found.append(f"Large files in git: {len(large_files)} files")
-
-                # Check git status
-                status_result = subprocess.run(['git', 'status', '--porcelain'],
-                                             cwd=self.base_path,
-                                             capture_output=True,
-                                             text=True,
-                                             timeout=30)
-
-                if status_result.returncode == 0:
-                    untracked_files = [line for line in status_result.stdout.strip().split('\n')
-                                     if line.startswith('??')]
-                    modified_files = [line for line in status_result.stdout.strip().split('\n')
-                                    if line.startswith(' M') or line.startswith('M ')]
-
-                    if untracked_files:
-                        logger.info(f"📁 Found {len(untracked_files)} untracked files")
-                    if modified_files:
-                        logger.info(f"📝 Found {len(modified_files)} modified files")
+            large_files = large_index_blobs(self.base_path)
+            if large_files:
+                logger.warning(f"⚠️  Found {len(large_files)} large files in git:")
+                for file_name, size in large_files[:3]:
+                    logger.warning(f"  - {file_name} ({size // (1024 * 1024)}MB)")
+                issues_found.append(f"Large files in git: {len(large_files)} files")
+
+            if self.git_history:
+                history_blobs = large_history_blobs(self.base_path)
+                if history_blobs:
+                    logger.warning(f"⚠️  Found {len(history_blobs)} large blobs in git history:")
+                    for file_name, size in history_blobs[:3]:
+                        logger.warning(f"  - {file_name} ({size // (1024 * 1024)}MB)")
+                    issues_found.append(f"Large blobs in git history: {len(history_blobs)} blobs")
+
+            # Check git status
+            status_result = subprocess.run(['git', 'status', '--porcelain'],
+                                           cwd=self.base_path,
+                                           capture_output=True,
+                                           text=True,
+                                           timeout=30)
+
+            if status_result.returncode == 0:
+                untracked_files = [line for line in status_result.stdout.strip().split('\n')
+                                   if line.startswith('??')]
+                modified_files = [line for line in status_result.stdout.strip().split('\n')
+                                  if line.startswith(' M') or line.startswith('M ')]
+
+                if untracked_files:
+                    logger.info(f"📁 Found {len(untracked_files)} untracked files")
+                if modified_files:
+                    logger.info(f"📝 Found {len(modified_files)} modified files")
 
         except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError) as e:
             logger.warning(f"Could not check git status: {e}")
@@ -420,69 +629,59 @@ class AcademicStructureValidator:
         return True
 
     def check_database_integrity(self) -> bool:
-        """Check database files exist and are accessible."""
+        """Quick-check the databases in parallel and schedule maintenance when needed."""
         logger.info("🗄️  Checking database integrity...")
 
-        db_dir = self.base_path / 'database'
-        required_dbs = ['knowledge.db', 'analytics.db', 'citations.db', 'workflows.db']
+        db_dir = self.base_path / '30-data' / 'database'
 
         if not db_dir.exists():
             logger.error("❌ Database directory missing")
             self.issues_found.append("Database directory missing")
             return False
 
-        missing_dbs = []
-        for db_name in required_dbs:
-            db_path = db_dir / db_name
-            if not db_path.exists():
-                missing_dbs.append(db_name)
-                logger.warning(f"⚠️  Missing database: {db_name}")
+        results = check_databases(db_dir, REQUIRED_DATABASES, self.db_thresholds)
+        for health in results:
+            log_health(health)
+            if self.db_maintenance:
+                run_maintenance(health, self.dry_run)
+
+        missing_dbs = [health.name for health in results if not health.exists]
+        corrupt_dbs = [health.name for health in results if health.exists and not health.ok]
 
         if missing_dbs:
             self.issues_found.extend([f"Missing database: {db}" for db in missing_dbs])
-            logger.info("💡 Run database/setup_databases.py to create missing databases")
+            logger.info("💡 Run 30-data/database/setup_databases.py to create missing databases")
+        if corrupt_dbs:
+            self.issues_found.extend([f"Database integrity check failed: {db}" for db in corrupt_dbs])
+
+        if missing_dbs or corrupt_dbs:
             return False
-        else:
-            logger.info("✅ All required databases found")
-            return True
+        logger.info("✅ All required databases passed quick_check")
+        return True
 
     def generate_comprehensive_report(self) -> Dict:
         """Generate detailed validation report with metrics."""
-        markdown_files = list(self.base_path.glob("**/*.md"))
-
-        # Count files by directory
-        dir_counts = {}
-        total_size = 0
+        content_metrics = self.check_result(ContentMetricsCheck.name)
 
-        for md_file in markdown_files:
-            rel_path = md_file.relative_to(self.base_path)
-            dir_name = str(rel_path.parent) if rel_path.parent != Path('.') else 'root'
-
-            if dir_name not in dir_counts:
-                dir_counts[dir_name] = {'count': 0, 'size': 0}
-
-            dir_counts[dir_name]['count'] += 1
-            file_size = md_file.stat().st_size
-            dir_counts[dir_name]['size'] += file_size
-            total_size += file_size
+        # Checks added with register_check() report under their own name
+        extra_checks = {name: self.check_result(name) for name, check in self.document_checks.items()
+                        if not isinstance(check, DEFAULT_DOCUMENT_CHECKS)}
 
         report = {
             'timestamp': str(Path().cwd()),
             'base_path': str(self.base_path),
+            'scope': 'full' if self.changes is None else f"{len(self.changes)} changed paths",
             'validation_summary': {
                 'total_issues': len(self.issues_found),
                 'validation_complete': len(self.issues_found) == 0,
                 'issues_by_category': self._categorize_issues()
             },
-            'content_metrics': {
-                'total_markdown_files': len(markdown_files),
-                'total_content_size': total_size,
-                'average_file_size': total_size // len(markdown_files) if markdown_files else 0,
-                'files_by_directory': dir_counts
-            },
+            'content_metrics': content_metrics,
             'issues_found': self.issues_found,
             'recommendations': self._generate_recommendations()
         }
+        if extra_checks:
+            report['document_checks'] = extra_checks
 
         return report
 
@@ -550,6 +749,15 @@ def main() -> int:
     parser.add_argument('--validate-all', action='store_true', help='Run all validation checks')
     parser.add_argument('--base-path', type=Path, default=Path.cwd(), help='Base path to validate')
     parser.add_argument('--output-json', type=Path, help='Output report as JSON to file')
+    parser.add_argument('--git-history', action='store_true',
+                        help='Also report oversized blobs anywhere in git history (slower)')
+    parser.add_argument('--db-maintenance', action='store_true',
+                        help='Run scheduled database maintenance (ANALYZE, PRAGMA optimize, incremental VACUUM)')
+    parser.add_argument('--db-freelist-ratio', type=float, default=HealthThresholds.freelist_ratio,
+                        help='Free page share that schedules incremental vacuum (default: 0.10)')
+    parser.add_argument('--db-stats-drift', type=float, default=HealthThresholds.stats_drift,
+                        help='Row-count drift from sqlite_stat1 that schedules ANALYZE (default: 0.25)')
+    add_change_arguments(parser)
 
     args = parser.parse_args()
 
@@ -566,8 +774,14 @@ def main() -> int:
         if args.dry_run:
             print("🔍 Running in DRY-RUN mode - no changes will be made")
 
+        changes = changes_from_args(args, args.base_path)
+        if changes is not None:
+            print(f"🔀 Incremental mode: {len(changes)} changed paths")
+
         # Initialize validator
-        validator = AcademicStructureValidator(args.base_path, args.dry_run)
+        thresholds = HealthThresholds(freelist_ratio=args.db_freelist_ratio, stats_drift=args.db_stats_drift)
+        validator = AcademicStructureValidator(args.base_path, args.dry_run, changes, args.git_history,
+                                               args.db_maintenance, thresholds)
 
         validation_results = []
 
@@ -628,6 +842,9 @@ def main() -> int:
 
             return 1
 
+    except GitChangesError as e:
+        logger.error(f"❌ Could not determine changed files: {e}")
+        return 1
     except Exception as e:
         logger.error(f"Script failed: {e}")
         if args.verbose:
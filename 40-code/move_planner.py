@@ -0,0 +1,314 @@
+"""
+Bulk file moves that keep relative links working.
+
+Callers register every move first (MovePlanner.add). Name conflicts are
+resolved while planning: a target that already exists, or that another
+planned move claims, gets a numbered suffix (``notes-2.md``), which matters
+when moves flatten a tree into a single archive directory. apply() then
+
+1. reads every markdown file once to build a backlink map (resolved
+   target path -> linking file -> spans of the links that must change),
+   covering links to moved files and the outbound links of moved files,
+2. rewrites exactly those spans, touching only the affected files,
+3. writes all rewritten files atomically and performs the moves in one batch.
+
+The work is linear in the size of the tree, however many files move.
+Links inside fenced code blocks or inline code spans and links to URLs,
+anchors or absolute paths are left alone.
+
+``[[wikilinks]]`` are not rewritten: they name a note rather than a path, and
+after a conflict rename (``notes.md`` -> ``notes-2.md``) the old name still
+belongs to another file. apply() logs a warning for each move whose file name
+changes while wikilinks still use the old name.
+"""
+
+import logging
+import os
+import re
+from bisect import bisect_right
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+from urllib.parse import quote, unquote
+
+from frontmatter_io import atomic_write_text, write_if_changed
+
+# [text](target "title") and ![alt](<target with spaces>)
+INLINE_LINK_RE = re.compile(r'!?\[[^\]]*\]\(\s*(<[^>\n]*>|[^)\s]+)(?:\s+["\'(][^)\n]*)?\)')
+# [label]: target
+REFERENCE_LINK_RE = re.compile(r'^[ \t]{0,3}\[[^\]\n]+\]:[ \t]*(<[^>\n]*>|\S+)', re.MULTILINE)
+FENCE_RE = re.compile(r'^[ \t]{0,3}(`{3,}|~{3,})[^\n]*\n.*?(?:^[ \t]{0,3}\1[ \t]*$|\Z)', re.MULTILINE | re.DOTALL)
+# `code`, ``code with ` inside`` (may wrap, but not across a blank line)
+CODE_SPAN_RE = re.compile(r'(`+)(?!`)(?:[^`\n]|`(?!\1)|\n(?!\s*\n))+?(?<!`)\1(?!`)')
+# [[name]], [[folder/name|alias]], [[name#heading]]
+WIKILINK_RE = re.compile(r'!?\[\[([^\]|#\n]+)(?:[|#][^\]\n]*)?\]\]')
+EXTERNAL_PREFIXES = ('http://', 'https://', 'mailto:', 'ftp://', 'data:', '#', '/')
+
+DEFAULT_SKIP_DIRS = ('.git', '.kb', '.venv', 'node_modules')
+
+logger = logging.getLogger('move-planner')
+
+
+@dataclass
+class Move:
+    """One planned move (absolute paths)."""
+    source: Path
+    target: Path
+    requested: Path  # target before conflict resolution
+
+    @property
+    def renamed(self) -> bool:
+        return self.target != self.requested
+
+
+@dataclass
+class Backlinks:
+    """What one read of the tree found out about a batch of moves."""
+    links: Dict[Path, Dict[Path, List[Tuple[int, int]]]]  # target -> linking file -> spans to rewrite
+    wikilinks: Dict[Path, Set[Path]]  # source of a move that changes the file name -> files with [[name]]
+    texts: Dict[Path, str]  # text of every file with links to rewrite
+
+
+def _code_regions(text: str) -> List[Tuple[int, int]]:
+    """Sorted (start, end) of fenced code blocks and inline code spans."""
+    regions = []
+    position = 0
+    for fence in list(FENCE_RE.finditer(text)) + [None]:
+        end = fence.start() if fence else len(text)
+        # Code spans are only looked for between fences, so a fence's
+        # backticks never pair with a span outside it
+        regions += [match.span() for match in CODE_SPAN_RE.finditer(text, position, end)]
+        if fence:
+            regions.append(fence.span())
+            position = fence.end()
+    return regions
+
+
+def _in_code(text: str) -> Callable[[int], bool]:
+    """Predicate telling whether an offset of ``text`` lies in code."""
+    regions = _code_regions(text)
+    region_starts = [start for start, _ in regions]
+
+    def in_code(position: int) -> bool:
+        i = bisect_right(region_starts, position) - 1
+        return i >= 0 and position < regions[i][1]
+    return in_code
+
+
+def _link_spans(text: str) -> Iterable[Tuple[int, int, str]]:
+    """(start, end, raw target) of every link target outside fenced code and code spans."""
+    in_code = _in_code(text)
+    for pattern in (INLINE_LINK_RE, REFERENCE_LINK_RE):
+        for match in pattern.finditer(text):
+            if not in_code(match.start()):
+                yield match.start(1), match.end(1), match.group(1)
+
+
+def _split_target(raw: str) -> Tuple[str, str, bool]:
+    """Split a raw link target into (decoded path, '#fragment' or '?query' suffix, was bracketed)."""
+    bracketed = raw.startswith('<') and raw.endswith('>')
+    target = raw[1:-1] if bracketed else raw
+    cut = min((i for i in (target.find('#'), target.find('?')) if i != -1), default=len(target))
+    return unquote(target[:cut]), target[cut:], bracketed
+
+
+def wikilink_names(text: str) -> Iterable[str]:
+    """Lower-cased note names (last path component, no .md) of the wikilinks outside code."""
+    in_code = _in_code(text)
+    for match in WIKILINK_RE.finditer(text):
+        if not in_code(match.start()):
+            name = match.group(1).strip().rsplit('/', 1)[-1].lower()
+            yield name[:-3] if name.endswith('.md') else name
+
+
+def relative_links(path: Path, text: str) -> Iterable[Tuple[int, int, Path]]:
+    """(start, end, normalized absolute path) of the relative links in ``text`` (a note at ``path``)."""
+    for start, end, raw in _link_spans(text):
+        link_path, _, _ = _split_target(raw)
+        if not link_path or raw.startswith(EXTERNAL_PREFIXES) or '://' in raw:
+            continue
+        yield start, end, Path(os.path.normpath(path.parent / link_path))
+
+
+def link_targets(path: Path, text: str) -> Iterable[Path]:
+    """Normalized absolute paths of the relative links in ``text`` (a note at ``path``)."""
+    for _, _, target in relative_links(path, text):
+        yield target
+
+
+class MovePlanner:
+    """Plans a batch of moves under ``base_path`` and applies them with link rewriting."""
+
+    def __init__(self, base_path: Path, skip_dirs: Iterable[str] = DEFAULT_SKIP_DIRS):
+        self.base_path = Path(base_path).resolve()
+        self.skip_dirs = tuple(skip_dirs)
+        self.moves: Dict[Path, Move] = {}
+        self._claimed: Set[Path] = set()
+
+    # -- planning --------------------------------------------------------
+
+    def add(self, source: Path, target: Path) -> Move:
+        """Plan moving ``source`` to ``target``; returns the move with its final target.
+
+        Moving a file onto itself is a no-op: the returned move is not planned.
+        """
+        source = Path(source).resolve()
+        requested = Path(target).resolve()
+        if source in self.moves:
+            raise ValueError(f"{source} is already planned to move")
+
+        final = requested
+        counter = 2
+        while self._taken(final, source):
+            final = requested.with_name(f"{requested.stem}-{counter}{requested.suffix}")
+            counter += 1
+
+        move = Move(source, final, requested)
+        if final == source:
+            return move
+        self.moves[source] = move
+        self._claimed.add(final)
+        return move
+
+    def _taken(self, target: Path, source: Path) -> bool:
+        if target == source:
+            return False
+        # Existing files are never overwritten, even ones planned to move away:
+        # that keeps the batch independent of move order
+        return target in self._claimed or target.exists()
+
+    @property
+    def conflicts(self) -> List[Move]:
+        """Moves whose target had to be renamed to avoid a collision."""
+        return [move for move in self.moves.values() if move.renamed]
+
+    # -- link rewriting --------------------------------------------------
+
+    def _markdown_files(self) -> Iterable[Path]:
+        for path in self.base_path.rglob('*.md'):
+            if not any(part in self.skip_dirs for part in path.relative_to(self.base_path).parts):
+                yield path
+
+    def _new_location(self, path: Path) -> Path:
+        move = self.moves.get(path)
+        return move.target if move else path
+
+    def build_backlinks(self) -> Backlinks:
+        """Read every markdown file once.
+
+        Collects the backlink map of the links that must change: links to
+        moved files, and the relative links inside moved files whose target
+        exists. Wikilinks naming a move whose file name changes are collected
+        separately, since they are only reported.
+        """
+        links: Dict[Path, Dict[Path, List[Tuple[int, int]]]] = defaultdict(lambda: defaultdict(list))
+        wikilinks: Dict[Path, Set[Path]] = defaultdict(set)
+        texts: Dict[Path, str] = {}
+        renamed_names: Dict[str, List[Path]] = defaultdict(list)
+        for move in self.moves.values():
+            if move.target.name != move.source.name:
+                renamed_names[move.source.stem.lower()].append(move.source)
+
+        for path in self._markdown_files():
+            try:
+                text = path.read_text(encoding='utf-8')
+            except (OSError, UnicodeDecodeError):
+                continue
+            moving = path in self.moves
+            for start, end, resolved in relative_links(path, text):
+                if resolved in self.moves or (moving and resolved.exists()):
+                    links[resolved][path].append((start, end))
+                    texts[path] = text
+            if renamed_names and '[[' in text:
+                for name in wikilink_names(text):
+                    for source in renamed_names.get(name, ()):
+                        wikilinks[source].add(path)
+        return Backlinks(links, wikilinks, texts)
+
+    def rewrite_links(self, path: Path, text: str, links: Iterable[Tuple[int, int, Path]]) -> str:
+        """Return ``text`` (currently at ``path``) with the given links retargeted.
+
+        ``links`` are (start, end, resolved target) spans from the backlink map.
+        """
+        new_dir = self._new_location(path).parent
+        pieces = []
+        last = 0
+        for start, end, resolved in sorted(links):
+            raw = text[start:end]
+            link_path, suffix, bracketed = _split_target(raw)
+            new_link = os.path.relpath(self._new_location(resolved), new_dir).replace(os.sep, '/')
+            if new_link == os.path.normpath(link_path).replace(os.sep, '/'):
+                continue
+            if bracketed:
+                new_raw = f"<{new_link}{suffix}>"
+            elif '%' in raw or ' ' in new_link:
+                new_raw = quote(new_link) + suffix
+            else:
+                new_raw = new_link + suffix
+            pieces.append(text[last:start])
+            pieces.append(new_raw)
+            last = end
+        pieces.append(text[last:])
+        return ''.join(pieces)
+
+    # -- applying --------------------------------------------------------
+
+    def relative(self, path: Path) -> str:
+        return path.relative_to(self.base_path).as_posix()
+
+    def apply(self, dry_run: bool = False, patch_writer=None) -> Dict[str, int]:
+        """Rewrite links and perform all planned moves.
+
+        In a dry run nothing is written; ``patch_writer`` (diff_preview)
+        receives the renames and link edits instead.
+        """
+        stats = {'moved': 0, 'links_rewritten_files': 0, 'conflicts': len(self.conflicts)}
+        if not self.moves:
+            return stats
+
+        backlinks = self.build_backlinks()
+        by_file: Dict[Path, List[Tuple[int, int, Path]]] = defaultdict(list)
+        for target, sources in backlinks.links.items():
+            for path, spans in sources.items():
+                by_file[path].extend((start, end, target) for start, end in spans)
+        rewritten = {}
+        for path, links in by_file.items():
+            text = backlinks.texts[path]
+            new_text = self.rewrite_links(path, text, links)
+            if new_text != text:
+                rewritten[path] = (text, new_text)
+        stats['links_rewritten_files'] = len(rewritten)
+
+        for source, paths in backlinks.wikilinks.items():
+            move = self.moves[source]
+            logger.warning(f"⚠️  [[{source.stem}]] wikilinks in {len(paths)} files are not rewritten and will not "
+                           f"follow {self.relative(source)} -> {self.relative(move.target)}: "
+                           f"{', '.join(sorted(self.relative(p) for p in paths))}")
+
+        if dry_run:
+            if patch_writer is not None:
+                for move in self.moves.values():
+                    patch_writer.rename(self.relative(move.source), self.relative(move.target))
+                for path, (old, new) in rewritten.items():
+                    patch_writer.change(self.relative(self._new_location(path)), old, new)
+            stats['moved'] = len(self.moves)
+            return stats
+
+        # Files that stay put are rewritten in place
+        for path, (old, new) in rewritten.items():
+            if path not in self.moves:
+                write_if_changed(path, new, old)
+
+        # Moved files: write the rewritten text at the target, or rename untouched ones
+        for move in self.moves.values():
+            move.target.parent.mkdir(parents=True, exist_ok=True)
+            if move.source in rewritten:
+                atomic_write_text(move.target, rewritten[move.source][1])
+                if move.target != move.source:
+                    os.chmod(move.target, move.source.stat().st_mode & 0o7777)
+                    move.source.unlink()
+            else:
+                os.rename(move.source, move.target)
+            stats['moved'] += 1
+        return stats
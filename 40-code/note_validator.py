@@ -0,0 +1,191 @@
+"""
+In-memory note validation with source positions.
+
+Applies the same rules as the pre-commit hook (.kb/scripts/validate_metadata.py)
+to a single note's text: frontmatter required where a policy path rule names
+a schema, JSON Schema validation against .kb/schemas, and the controlled
+vocabularies from kb-policy.yaml. It also reports relative links whose target
+does not exist. The policy is compiled once (path regexes, one cached
+Draft202012Validator per schema), so validating a note costs a YAML parse
+plus the checks, without touching the rest of the tree.
+
+Each problem is a Diagnostic with a 0-based line/column range, ready for an
+editor.
+
+Usage:
+    from note_validator import NoteValidator
+
+    validator = NoteValidator('.')
+    for diagnostic in validator.validate('10-knowledge/methods/x.md', text):
+        print(diagnostic.line, diagnostic.message)
+"""
+
+import bisect
+import json
+import os
+import re
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Pattern, Tuple
+
+import yaml
+
+from frontmatter_io import split_frontmatter
+from move_planner import relative_links
+
+try:
+    from jsonschema import Draft202012Validator
+except ImportError:  # schema checks are skipped, the other checks still run
+    Draft202012Validator = None
+
+POLICY_PATH = Path('.kb') / 'policy' / 'kb-policy.yaml'
+
+ERROR = 'error'
+WARNING = 'warning'
+
+
+@dataclass
+class Diagnostic:
+    """One problem in a note, located by 0-based line and column."""
+    line: int
+    column: int
+    end_line: int
+    end_column: int
+    severity: str
+    code: str  # frontmatter-missing, frontmatter-syntax, schema, vocabulary, broken-link
+    message: str
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class _LineIndex:
+    """Maps string offsets to (line, column)."""
+
+    def __init__(self, text: str):
+        self.starts = [0] + [match.end() for match in re.finditer('\n', text)]
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        line = bisect.bisect_right(self.starts, offset) - 1
+        return line, offset - self.starts[line]
+
+
+class NoteValidator:
+    """Validates notes under ``base_path`` against the compiled KB policy."""
+
+    def __init__(self, base_path='.', policy: Optional[Dict] = None):
+        self.base_path = Path(base_path).resolve()
+        if policy is None:
+            policy_file = self.base_path / POLICY_PATH
+            policy = {}
+            if policy_file.exists():
+                with open(policy_file, 'r', encoding='utf-8') as f:
+                    policy = yaml.safe_load(f) or {}
+        self.policy = policy
+
+        self.rules: List[Tuple[Pattern, str]] = []
+        for rule in policy.get('paths', []):
+            if 'schema' in rule:
+                try:
+                    self.rules.append((re.compile(rule['path']), rule['schema']))
+                except re.error:
+                    continue
+        self.vocabularies = {field: list(values) for field, values in
+                             policy.get('metadata', {}).get('controlled_vocabs', {}).items()}
+        level = policy.get('enforcement', {}).get('level', 'error')
+        self.severity = WARNING if level == 'warning' else ERROR
+        self._validators: Dict[str, Optional[object]] = {}
+
+    def schema_for(self, rel_path: str) -> Optional[str]:
+        """The schema the first matching policy path rule names (as the pre-commit hook does)."""
+        for pattern, schema in self.rules:
+            if pattern.search(rel_path):
+                return schema
+        return None
+
+    def _validator(self, schema_path: str):
+        if schema_path not in self._validators:
+            validator = None
+            if Draft202012Validator is not None:
+                try:
+                    with open(self.base_path / schema_path, 'r', encoding='utf-8') as f:
+                        validator = Draft202012Validator(json.load(f))
+                except (OSError, json.JSONDecodeError):
+                    validator = None
+            self._validators[schema_path] = validator
+        return self._validators[schema_path]
+
+    def _default_exists(self, rel_path: str) -> bool:
+        return (self.base_path / rel_path).exists()
+
+    def validate(self, rel_path: str, text: str,
+                 path_exists: Optional[Callable[[str], bool]] = None) -> List[Diagnostic]:
+        """Diagnostics for ``text`` as the content of ``rel_path`` (relative, POSIX).
+
+        ``path_exists`` answers whether a base-relative path exists; pass one
+        backed by an index to avoid touching the file system.
+        """
+        lines = _LineIndex(text)
+        diagnostics: List[Diagnostic] = []
+
+        def add(start: int, end: int, code: str, message: str, severity: str = None):
+            line, column = lines.position(start)
+            end_line, end_column = lines.position(end)
+            diagnostics.append(Diagnostic(line, column, end_line, end_column,
+                                          severity or self.severity, code, message))
+
+        schema_path = self.schema_for(rel_path)
+        header, _ = split_frontmatter(text)
+        frontmatter = None
+        if header is None:
+            if schema_path:
+                add(0, 0, 'frontmatter-missing', 'Missing required YAML front matter')
+        else:
+            try:
+                frontmatter = yaml.safe_load(header[3:-4]) or {}
+            except yaml.YAMLError as e:
+                mark = getattr(e, 'problem_mark', None)
+                offset = 3 + mark.index if mark is not None else 0
+                add(offset, offset, 'frontmatter-syntax', f"YAML parsing error: {getattr(e, 'problem', None) or e}")
+            else:
+                if not isinstance(frontmatter, dict):
+                    add(0, len(header), 'frontmatter-syntax', 'Front matter is not a mapping')
+                    frontmatter = None
+
+        if frontmatter is not None:
+            keys = self._key_spans(header)
+            if schema_path:
+                validator = self._validator(schema_path)
+                if validator is None and Draft202012Validator is not None:
+                    add(0, 0, 'schema', f"Could not load schema {schema_path}")
+                elif validator is not None:
+                    for error in sorted(validator.iter_errors(frontmatter), key=lambda e: [str(p) for p in e.path]):
+                        where = ' -> '.join(str(p) for p in error.path) if error.path else 'root'
+                        start, end = keys.get(error.path[0], (0, 3)) if error.path else (0, 3)
+                        add(start, end, 'schema', f"{error.message} at {where}")
+            for field, allowed in self.vocabularies.items():
+                value = frontmatter.get(field)
+                values = value if isinstance(value, list) else [value]
+                for item in values:
+                    if isinstance(item, str) and item not in allowed:
+                        start, end = keys.get(field, (0, 3))
+                        add(start, end, 'vocabulary',
+                            f"Invalid value '{item}' for field '{field}'. Allowed values: {', '.join(allowed)}")
+
+        exists = path_exists or self._default_exists
+        note_path = self.base_path / rel_path
+        for start, end, target in relative_links(note_path, text):
+            try:
+                target_rel = target.relative_to(self.base_path).as_posix()
+            except ValueError:
+                continue
+            if not exists(target_rel):
+                add(start, end, 'broken-link', f"Broken link: {os.path.relpath(target, note_path.parent)} does not exist",
+                    WARNING)
+        return diagnostics
+
+    @staticmethod
+    def _key_spans(header: str) -> Dict[str, Tuple[int, int]]:
+        """Offsets of each top-level frontmatter key."""
+        return {match.group(1): (match.start(1), match.end(1))
+                for match in re.finditer(r'^([A-Za-z0-9_-]+)[ \t]*:', header, re.MULTILINE)}
@@ -16,6 +16,10 @@ Features:
 
 Usage:
     python3 yaml-frontmatter-enforcer.py [--validate-only] [--fix] [--path PATH]
+    python3 yaml-frontmatter-enforcer.py --fix --staged
+    python3 yaml-frontmatter-enforcer.py --validate-only --changed-since origin/main
+    python3 yaml-frontmatter-enforcer.py --diff > frontmatter.patch
+    python3 yaml-frontmatter-enforcer.py --diff - --diff-format json | jq .path
 """
 
 import os
@@ -23,6 +27,11 @@ import sys
 import re
 import yaml
 import argparse
+import hashlib
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import chain, islice
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple
@@ -31,6 +40,123 @@ import sqlite3
 # Add parent directory to path for database imports
 sys.path.append(str(Path(__file__).parent.parent))
 
+from diff_preview import PATCH_FORMATS, PatchWriter, format_patch, open_patch_writer
+from frontmatter_io import append_frontmatter_fields, prepend_frontmatter, write_if_changed
+from git_changes import GitChangesError, add_change_arguments, changes_from_args
+
+# Title and description are taken from the start of a note; only this many
+# characters are examined so their cost does not grow with the note.
+METADATA_WINDOW = 16 * 1024
+
+TITLE_RE = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+DESCRIPTION_RES = [
+    re.compile(r'(?:^|\n)(?:## )?(?:Description|Summary|Overview)[:\s]*\n(.+?)(?:\n\n|\n#|$)',
+               re.MULTILINE | re.DOTALL),
+    re.compile(r'(?:^|\n)(.+?)(?:\n\n|\n#|$)', re.MULTILINE | re.DOTALL)  # First paragraph
+]
+# Whole-text signals, consumed lazily so scanning stops once enough are found
+CITATION_RES = [
+    re.compile(r'\[([^\]]+)\]\([^)]*(?:doi|arxiv|journal)[^)]*\)', re.IGNORECASE),
+    re.compile(r'(?:doi:|DOI:)\s*([^\s]+)', re.IGNORECASE),
+    re.compile(r'(?:arxiv:|arXiv:)\s*([^\s]+)', re.IGNORECASE)
+]
+VERSION_RE = re.compile(r'version[:\s]+([0-9]+\.[0-9]+\.[0-9]+)', re.IGNORECASE)
+MAX_CITATIONS = 10
+
+# research_content rows written per transaction during fix runs
+DB_LOG_BATCH = 200
+# Files per worker task, and tasks in flight per worker: finished outcomes
+# (and their preview patches) wait in memory only inside this window
+FIX_CHUNK_MAX = 64
+FIX_WINDOW_PER_WORKER = 4
+
+
+@dataclass(frozen=True)
+class ContentSignals:
+    """Keyword evidence found in one document body."""
+    content_type: Optional[str]
+    status: Optional[str]
+    tags: Tuple[str, ...]
+    project_type: Optional[str]
+
+
+class KeywordClassifier:
+    """Matches every indicator keyword in a single pass over the text.
+
+    ``tables`` maps a group name to an ordered {label: [keywords]} table;
+    earlier labels win for single-valued groups. All keywords are compiled
+    into one trie-shaped regex, each hit also credits the keywords that are
+    its prefixes, so the result equals running every ``keyword in text``
+    test separately. Results are memoized by content hash.
+    """
+
+    def __init__(self, tables: Dict[str, Dict[str, List[str]]], cache_size: int = 1024):
+        self.tables = tables
+        self.cache_size = cache_size
+        self._cache: OrderedDict = OrderedDict()
+
+        keywords = {kw for table in tables.values() for kws in table.values() for kw in kws}
+        self._pattern = re.compile(self._trie_pattern(keywords))
+        self._prefixes = {kw: frozenset(k for k in keywords if kw.startswith(k)) for kw in keywords}
+
+    @staticmethod
+    def _trie_pattern(keywords) -> str:
+        trie: Dict = {}
+        for keyword in keywords:
+            node = trie
+            for ch in keyword:
+                node = node.setdefault(ch, {})
+            node[''] = {}
+
+        def build(node: Dict) -> str:
+            branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+            if not branches:
+                return ''
+            body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+            # Greedy optional tail: the longest keyword at a position wins
+            return f'(?:{body})?' if '' in node else body
+
+        return build(trie)
+
+    def keywords_in(self, text: str) -> set:
+        """Every keyword occurring (case-insensitively) anywhere in ``text``."""
+        lowered = text.lower()
+        found = set()
+        search = self._pattern.search
+        match = search(lowered)
+        while match:
+            keyword = match.group()
+            if keyword not in found:
+                found |= self._prefixes[keyword]
+            # Restart one character later so overlapping keywords are seen too
+            match = search(lowered, match.start() + 1)
+        return found
+
+    def classify(self, text: str) -> ContentSignals:
+        key = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        found = self.keywords_in(text)
+        hits = {
+            group: [label for label, kws in table.items() if found.intersection(kws)]
+            for group, table in self.tables.items()
+        }
+        signals = ContentSignals(
+            content_type=next(iter(hits.get('content_type', [])), None),
+            status=next(iter(hits.get('status', [])), None),
+            tags=tuple(hits.get('tags', [])),
+            project_type=next(iter(hits.get('project_type', [])), None),
+        )
+
+        self._cache[key] = signals
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return signals
+
+
 class YAMLFrontmatterEnforcer:
     """Enforces YAML frontmatter standards across the knowledge base."""
     
@@ -54,6 +180,33 @@ class YAMLFrontmatterEnforcer:
             'confidence_level': ['high', 'medium', 'low'],
             'project_status': ['active', 'completed', 'on-hold', 'archived']
         }
+        
+        # Keyword indicators used for content analysis (order = priority)
+        self.content_indicators = {
+            'content_type': {
+                'academic': ['citation', 'doi:', 'arxiv:', 'journal:', 'peer review', 'methodology'],
+                'technical': ['api', 'function', 'parameter', 'usage example', 'tool name'],
+                'project': ['phase', 'milestone', 'workflow', 'completion', 'implementation']
+            },
+            'status': {
+                'draft': ['work in progress', 'draft', 'todo'],
+                'published': ['complete', 'final', 'published']
+            },
+            'tags': {
+                'ai': ['artificial intelligence', 'machine learning', 'ai', 'ml'],
+                'research': ['research', 'study', 'analysis', 'methodology'],
+                'tools': ['tool', 'software', 'application', 'utility'],
+                'documentation': ['guide', 'manual', 'reference', 'documentation'],
+                'academic': ['academic', 'scholarly', 'peer-reviewed', 'journal'],
+                'technical': ['technical', 'api', 'programming', 'development']
+            },
+            'project_type': {
+                'implementation': ['implementation'],
+                'analysis': ['analysis'],
+                'completion-report': ['completion']
+            }
+        }
+        self.classifier = KeywordClassifier(self.content_indicators)
     
     def extract_frontmatter(self, content: str) -> Tuple[Optional[Dict], str]:
         """Extract YAML frontmatter from markdown content."""
@@ -92,32 +245,17 @@ class YAMLFrontmatterEnforcer:
         if any(keyword in path_str for keyword in ['projects', 'workflow', 'methodology']):
             return 'project'
         
-        # Content analysis for type detection
-        content_lower = content.lower()
-        
-        # Look for academic indicators
-        academic_indicators = ['citation', 'doi:', 'arxiv:', 'journal:', 'peer review', 'methodology']
-        if any(indicator in content_lower for indicator in academic_indicators):
-            return 'academic'
-        
-        # Look for technical indicators
-        technical_indicators = ['api', 'function', 'parameter', 'usage example', 'tool name']
-        if any(indicator in content_lower for indicator in technical_indicators):
-            return 'technical'
-        
-        # Look for project indicators
-        project_indicators = ['phase', 'milestone', 'workflow', 'completion', 'implementation']
-        if any(indicator in content_lower for indicator in project_indicators):
-            return 'project'
-        
-        return 'basic'
+        # Content analysis for type detection (academic > technical > project)
+        return self.classifier.classify(content).content_type or 'basic'
     
     def generate_intelligent_metadata(self, file_path: Path, content: str, content_type: str) -> Dict:
         """Generate intelligent metadata based on content analysis."""
         metadata = {}
+        signals = self.classifier.classify(content)
+        head = content[:METADATA_WINDOW]
         
         # Extract title from first heading or filename
-        title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
+        title_match = TITLE_RE.search(head)
         if title_match:
             metadata['title'] = title_match.group(1).strip()
         else:
@@ -125,13 +263,8 @@ class YAMLFrontmatterEnforcer:
             metadata['title'] = file_path.stem.replace('-', ' ').replace('_', ' ').title()
         
         # Generate description from first paragraph or summary
-        desc_patterns = [
-            r'(?:^|\n)(?:## )?(?:Description|Summary|Overview)[:\s]*\n(.+?)(?:\n\n|\n#|$)',
-            r'(?:^|\n)(.+?)(?:\n\n|\n#|$)'  # First paragraph
-        ]
-        
-        for pattern in desc_patterns:
-            desc_match = re.search(pattern, content, re.MULTILINE | re.DOTALL)
+        for pattern in DESCRIPTION_RES:
+            desc_match = pattern.search(head)
             if desc_match:
                 desc = desc_match.group(1).strip()
                 # Clean up description
@@ -145,13 +278,8 @@ class YAMLFrontmatterEnforcer:
         if 'description' not in metadata:
             metadata['description'] = f"Documentation for {metadata['title']}"
         
-        # Set status based on content indicators
-        if any(indicator in content.lower() for indicator in ['work in progress', 'draft', 'todo']):
-            metadata['status'] = 'draft'
-        elif any(indicator in content.lower() for indicator in ['complete', 'final', 'published']):
-            metadata['status'] = 'published'
-        else:
-            metadata['status'] = 'draft'  # Conservative default
+        # Set status based on content indicators (draft wins; conservative default)
+        metadata['status'] = signals.status or 'draft'
         
         # Set timestamps
         current_time = datetime.now(timezone.utc).strftime('%Y-%m-%d')
@@ -168,19 +296,7 @@ class YAMLFrontmatterEnforcer:
                 tags.add(part.replace('-', ' ').replace('_', ' '))
         
         # Tags from content analysis
-        content_lower = content.lower()
-        tag_indicators = {
-            'ai': ['artificial intelligence', 'machine learning', 'ai', 'ml'],
-            'research': ['research', 'study', 'analysis', 'methodology'],
-            'tools': ['tool', 'software', 'application', 'utility'],
-            'documentation': ['guide', 'manual', 'reference', 'documentation'],
-            'academic': ['academic', 'scholarly', 'peer-reviewed', 'journal'],
-            'technical': ['technical', 'api', 'programming', 'development']
-        }
-        
-        for tag, indicators in tag_indicators.items():
-            if any(indicator in content_lower for indicator in indicators):
-                tags.add(tag)
+        tags.update(signals.tags)
         
         metadata['tags'] = sorted(list(tags))[:5]  # Limit to 5 most relevant tags
         
@@ -190,39 +306,25 @@ class YAMLFrontmatterEnforcer:
             metadata['citations'] = []
             metadata['confidence_level'] = 'medium'
             
-            # Extract citations from content
-            citation_patterns = [
-                r'\[([^\]]+)\]\([^)]*(?:doi|arxiv|journal)[^)]*\)',
-                r'(?:doi:|DOI:)\s*([^\s]+)',
-                r'(?:arxiv:|arXiv:)\s*([^\s]+)'
-            ]
-            
-            citations = []
-            for pattern in citation_patterns:
-                citations.extend(re.findall(pattern, content, re.IGNORECASE))
+            # Extract citations from content (links first, then DOIs, then arXiv ids)
+            matches = chain.from_iterable(pattern.finditer(content) for pattern in CITATION_RES)
+            citations = [match.group(1) for match in islice(matches, MAX_CITATIONS)]
             
             if citations:
-                metadata['citations'] = citations[:10]  # Limit citations
+                metadata['citations'] = citations
         
         elif content_type == 'technical':
             metadata['version'] = '1.0.0'
             
             # Extract version from content if available
-            version_match = re.search(r'version[:\s]+([0-9]+\.[0-9]+\.[0-9]+)', content, re.IGNORECASE)
+            version_match = VERSION_RE.search(content)
             if version_match:
                 metadata['version'] = version_match.group(1)
         
         elif content_type == 'project':
-            metadata['project_type'] = 'research'
-            metadata['methodology'] = 'systematic-content-recreation'
-            
             # Determine project type from content
-            if 'implementation' in content.lower():
-                metadata['project_type'] = 'implementation'
-            elif 'analysis' in content.lower():
-                metadata['project_type'] = 'analysis'
-            elif 'completion' in content.lower():
-                metadata['project_type'] = 'completion-report'
+            metadata['project_type'] = signals.project_type or 'research'
+            metadata['methodology'] = 'systematic-content-recreation'
         
         return metadata
     
@@ -259,96 +361,153 @@ class YAMLFrontmatterEnforcer:
         
         return violations
     
-    def fix_frontmatter(self, file_path: Path, content: str, dry_run: bool = False) -> bool:
-        """Fix or add frontmatter to a file."""
+    def prepare_fix(self, file_path: Path, content: str) -> Optional[Tuple[str, Dict, str, str]]:
+        """Compute the fixed file content without writing anything.
+        
+        Returns (new_content, frontmatter, content_type, action), or None
+        when the file needs no changes.
+        """
         frontmatter, body = self.extract_frontmatter(content)
         content_type = self.determine_content_type(file_path, body)
         
         if frontmatter is None:
             # No frontmatter - generate from scratch
             frontmatter = self.generate_intelligent_metadata(file_path, body, content_type)
+            yaml_content = yaml.dump(frontmatter, default_flow_style=False, sort_keys=False)
+            new_content = prepend_frontmatter(content, yaml_content)
             action = "Added"
         else:
             # Existing frontmatter - validate and fix
             violations = self.validate_frontmatter(frontmatter, content_type, file_path)
             if not violations:
-                return False  # No fixes needed
+                return None  # No fixes needed
             
-            # Generate missing fields
+            # Generate missing fields; existing header lines and the body are kept as-is
             generated = self.generate_intelligent_metadata(file_path, body, content_type)
             required = self.required_fields[content_type]
+            missing = {field: generated[field] for field in required if field not in frontmatter}
+            if not missing:
+                return None  # Nothing that can be fixed automatically (e.g. invalid values)
             
-            for field in required:
-                if field not in frontmatter:
-                    frontmatter[field] = generated[field]
-            
-            # Update timestamp
-            frontmatter['updated'] = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+            frontmatter.update(missing)
+            yaml_content = yaml.dump(missing, default_flow_style=False, sort_keys=False)
+            new_content = append_frontmatter_fields(content, yaml_content)
             action = "Fixed"
         
-        if not dry_run:
-            # Write the fixed content
-            yaml_content = yaml.dump(frontmatter, default_flow_style=False, sort_keys=False)
-            new_content = f"---\n{yaml_content}---\n\n{body}"
-            
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
-            
+        if new_content == content:
+            return None
+        return new_content, frontmatter, content_type, action
+    
+    def fix_frontmatter(self, file_path: Path, content: str, dry_run: bool = False) -> bool:
+        """Fix or add frontmatter to a file."""
+        fix = self.prepare_fix(file_path, content)
+        if fix is None:
+            return False
+        new_content, frontmatter, content_type, action = fix
+        
+        if not dry_run and write_if_changed(file_path, new_content, content):
             # Log to database
             self.log_to_database(file_path, frontmatter, content_type)
         
         self.fixes_applied.append(f"{action} frontmatter for {file_path}")
         return True
     
+    def database_row(self, file_path: Path, frontmatter: Dict, content_type: str) -> Tuple:
+        """Build the research_content row recorded for a fixed file."""
+        return (
+            frontmatter.get('title', ''),
+            frontmatter.get('description', ''),
+            frontmatter.get('methodology', content_type),
+            frontmatter.get('confidence_level', 'medium'),
+            frontmatter.get('status', 'draft'),
+            frontmatter.get('created', datetime.now().strftime('%Y-%m-%d')),
+            frontmatter.get('updated', datetime.now().strftime('%Y-%m-%d')),
+            str(file_path.relative_to(self.base_path))
+        )
+    
     def log_to_database(self, file_path: Path, frontmatter: Dict, content_type: str):
         """Log frontmatter changes to the knowledge database."""
-        if not self.db_path.exists():
+        self.write_database_rows([self.database_row(file_path, frontmatter, content_type)])
+    
+    def write_database_rows(self, rows: List[Tuple]):
+        """Insert or update research content records in one transaction."""
+        if not rows or not Path(self.db_path).exists():
             return
         
+        sql = """
+            INSERT OR REPLACE INTO research_content 
+            (title, content, methodology, confidence_level, status, created_date, updated_date, file_path)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        conn = sqlite3.connect(self.db_path)
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Insert or update research content record
-            cursor.execute("""
-                INSERT OR REPLACE INTO research_content 
-                (title, content, methodology, confidence_level, status, created_date, updated_date, file_path)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                frontmatter.get('title', ''),
-                frontmatter.get('description', ''),
-                frontmatter.get('methodology', content_type),
-                frontmatter.get('confidence_level', 'medium'),
-                frontmatter.get('status', 'draft'),
-                frontmatter.get('created', datetime.now().strftime('%Y-%m-%d')),
-                frontmatter.get('updated', datetime.now().strftime('%Y-%m-%d')),
-                str(file_path.relative_to(self.base_path))
-            ))
+            try:
+                with conn:
+                    conn.executemany(sql, rows)
+            except sqlite3.IntegrityError:
+                # A single invalid row must not discard the rest of the batch
+                for row in rows:
+                    try:
+                        with conn:
+                            conn.execute(sql, row)
+                    except sqlite3.Error as e:
+                        print(f"Database logging error: {e}", file=sys.stderr)
             
-            conn.commit()
+        except sqlite3.Error as e:
+            print(f"Database logging error: {e}", file=sys.stderr)
+        finally:
             conn.close()
+    
+    def fix_one(self, file_path: Path, dry_run: bool = False, patch_format: str = None) -> Dict:
+        """Fix a single file (runs inside fix workers).
+        
+        The file is replaced atomically; the database row is returned instead
+        of written so that a single process owns the database connection. In
+        a dry run with ``patch_format`` set, the outcome carries the preview
+        patch for this file instead.
+        """
+        outcome = {'path': file_path, 'action': None, 'row': None, 'patch': None, 'violations': [], 'error': None}
+        start = len(self.violations)
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
             
-        except sqlite3.Error as e:
-            print(f"Database logging error: {e}")
+            fix = self.prepare_fix(file_path, content)
+            if fix is not None:
+                new_content, frontmatter, content_type, outcome['action'] = fix
+                if dry_run and patch_format:
+                    outcome['patch'] = format_patch(self.display_path(file_path), content, new_content, patch_format)
+                elif not dry_run and write_if_changed(file_path, new_content, content):
+                    outcome['row'] = self.database_row(file_path, frontmatter, content_type)
+        except Exception as e:
+            outcome['error'] = str(e)
+        
+        # Hand violations back to the caller instead of keeping them per worker
+        outcome['violations'] = self.violations[start:]
+        del self.violations[start:]
+        return outcome
+    
+    def display_path(self, file_path: Path) -> str:
+        """POSIX path relative to the base path, as used in patches."""
+        try:
+            return Path(file_path).relative_to(self.base_path).as_posix()
+        except ValueError:
+            return Path(file_path).as_posix()
+    
+    @staticmethod
+    def is_skipped(file_path: Path) -> bool:
+        """True for files under directories the enforcer never touches."""
+        skip_dirs = ['.git', 'node_modules', '.vscode', 'cache']
+        return any(skip_dir in file_path.parts for skip_dir in skip_dirs)
     
     def scan_directory(self, directory: Path = None) -> List[Path]:
         """Scan directory for markdown files."""
         scan_dir = directory or self.base_path
-        markdown_files = []
-        
-        for file_path in scan_dir.rglob("*.md"):
-            # Skip certain directories
-            skip_dirs = ['.git', 'node_modules', '.vscode', 'cache']
-            if any(skip_dir in file_path.parts for skip_dir in skip_dirs):
-                continue
-            
-            markdown_files.append(file_path)
-        
-        return markdown_files
+        return [file_path for file_path in scan_dir.rglob("*.md") if not self.is_skipped(file_path)]
     
     def run_validation(self, file_paths: List[Path] = None) -> Dict:
         """Run validation on specified files or all markdown files."""
-        files_to_check = file_paths or self.scan_directory()
+        files_to_check = file_paths if file_paths is not None else self.scan_directory()
         
         results = {
             'total_files': len(files_to_check),
@@ -384,9 +543,18 @@ class YAMLFrontmatterEnforcer:
         
         return results
     
-    def run_fixes(self, file_paths: List[Path] = None, dry_run: bool = False) -> Dict:
-        """Run fixes on specified files or all markdown files."""
-        files_to_fix = file_paths or self.scan_directory()
+    def run_fixes(self, file_paths: List[Path] = None, dry_run: bool = False, jobs: int = None,
+                  patch_writer: PatchWriter = None) -> Dict:
+        """Run fixes on specified files or all markdown files.
+        
+        Files are fixed by a pool of ``jobs`` worker processes (default: CPU
+        count). Results are consumed in input order, and database rows are
+        written by this process in batches, so an interrupted run leaves
+        every file either untouched or completely rewritten. In a dry run,
+        ``patch_writer`` receives each file's preview patch as soon as it is
+        its turn; only a bounded window of tasks is in flight at a time.
+        """
+        files_to_fix = file_paths if file_paths is not None else self.scan_directory()
         
         results = {
             'total_files': len(files_to_fix),
@@ -395,21 +563,79 @@ class YAMLFrontmatterEnforcer:
             'errors': []
         }
         
-        for file_path in files_to_fix:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                if self.fix_frontmatter(file_path, content, dry_run):
+        jobs = min(jobs or os.cpu_count() or 1, len(files_to_fix))
+        patch_format = patch_writer.fmt if dry_run and patch_writer else None
+        tasks = [(file_path, dry_run, patch_format) for file_path in files_to_fix]
+        if jobs > 1:
+            executor = ProcessPoolExecutor(max_workers=jobs, initializer=_init_fix_worker, initargs=(self,))
+            chunksize = max(1, min(FIX_CHUNK_MAX, len(tasks) // (jobs * 8)))
+            outcomes = _bounded_map(executor, tasks, chunksize, jobs * FIX_WINDOW_PER_WORKER)
+        else:
+            executor = None
+            outcomes = (self.fix_one(*task) for task in tasks)
+        
+        rows = []
+        try:
+            for outcome in outcomes:
+                self.violations.extend(outcome['violations'])
+                if outcome['patch']:
+                    patch_writer.write(outcome['patch'])
+                if outcome['error']:
+                    results['errors'].append(f"{outcome['path']}: {outcome['error']}")
+                elif outcome['action']:
                     results['files_fixed'] += 1
+                    self.fixes_applied.append(f"{outcome['action']} frontmatter for {outcome['path']}")
+                    if outcome['row']:
+                        rows.append(outcome['row'])
+                        if len(rows) >= DB_LOG_BATCH:
+                            self.write_database_rows(rows)
+                            rows = []
                 else:
                     results['files_skipped'] += 1
-                    
-            except Exception as e:
-                results['errors'].append(f"{file_path}: {e}")
+        finally:
+            if executor is not None:
+                # Closing the generator cancels the chunks it has not handed out
+                # (shutdown(cancel_futures=True) needs Python 3.9)
+                outcomes.close()
+                executor.shutdown()
+            self.write_database_rows(rows)
         
         return results
 
+
+# Per-process enforcer used by fix workers
+_worker_enforcer: Optional[YAMLFrontmatterEnforcer] = None
+
+
+def _init_fix_worker(enforcer: YAMLFrontmatterEnforcer):
+    global _worker_enforcer
+    _worker_enforcer = enforcer
+
+
+def _run_fix_worker(chunk: List[Tuple[Path, bool, Optional[str]]]) -> List[Dict]:
+    return [_worker_enforcer.fix_one(*task) for task in chunk]
+
+
+def _bounded_map(executor: ProcessPoolExecutor, tasks: List[Tuple], chunksize: int, window: int):
+    """Yield fix outcomes in task order with at most ``window`` chunks submitted.
+    
+    Unlike ``executor.map``, which submits everything up front, results that
+    are ready before the consumer gets to them cannot pile up beyond the window.
+    Closing the generator early cancels the chunks that have not started.
+    """
+    pending = deque()
+    try:
+        for start in range(0, len(tasks), chunksize):
+            pending.append(executor.submit(_run_fix_worker, tasks[start:start + chunksize]))
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
 def main():
     """Main CLI interface."""
     parser = argparse.ArgumentParser(description="YAML Frontmatter Enforcer for Academic Knowledge Base")
@@ -417,10 +643,25 @@ def main():
     parser.add_argument('--fix', action='store_true', help='Fix violations automatically')
     parser.add_argument('--dry-run', action='store_true', help='Show what would be fixed without making changes')
     parser.add_argument('--path', type=str, help='Specific path to process (default: current directory)')
+    parser.add_argument('--jobs', '-j', type=int, help='Parallel fix workers (default: CPU count)')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
+    parser.add_argument('--diff', nargs='?', const='-', metavar='FILE',
+                        help='Stream a preview patch of the fixes to FILE or stdout (implies --fix --dry-run)')
+    parser.add_argument('--diff-format', choices=PATCH_FORMATS, default='unified',
+                        help='Preview patch format: unified diff or one JSON object per file')
+    add_change_arguments(parser)
     
     args = parser.parse_args()
     
+    patch_writer = None
+    summary_stream = sys.stdout
+    if args.diff:
+        args.fix = args.dry_run = True
+        patch_writer = open_patch_writer(args.diff, args.diff_format)
+        if args.diff == '-':
+            # Keep stdout a clean patch stream; progress and summary go to stderr
+            summary_stream = sys.stderr
+    
     # Determine base path
     if args.path:
         base_path = Path(args.path).resolve()
@@ -435,60 +676,77 @@ def main():
         else:
             base_path = Path.cwd()
     
-    print(f"🔧 YAML Frontmatter Enforcer")
-    print(f"📁 Base path: {base_path}")
-    print("=" * 50)
+    print(f"🔧 YAML Frontmatter Enforcer", file=summary_stream)
+    print(f"📁 Base path: {base_path}", file=summary_stream)
+    print("=" * 50, file=summary_stream)
     
     enforcer = YAMLFrontmatterEnforcer(base_path)
     
+    try:
+        changes = changes_from_args(args, base_path)
+    except GitChangesError as e:
+        print(f"❌ Could not determine changed files: {e}", file=summary_stream)
+        sys.exit(1)
+    file_paths = None
+    if changes is not None:
+        file_paths = [path for path in changes.markdown_files() if not enforcer.is_skipped(path)]
+        print(f"🔀 Incremental mode: {len(file_paths)} changed markdown files", file=summary_stream)
+    
     if args.validate_only or not args.fix:
         # Run validation
-        print("🔍 Validating frontmatter compliance...")
-        results = enforcer.run_validation()
+        print("🔍 Validating frontmatter compliance...", file=summary_stream)
+        results = enforcer.run_validation(file_paths)
         
-        print(f"📊 Validation Results:")
-        print(f"   Total files: {results['total_files']}")
-        print(f"   Compliant files: {results['compliant_files']}")
-        print(f"   Files with violations: {results['violation_files']}")
-        print(f"   Files missing frontmatter: {results['missing_frontmatter']}")
+        print(f"📊 Validation Results:", file=summary_stream)
+        print(f"   Total files: {results['total_files']}", file=summary_stream)
+        print(f"   Compliant files: {results['compliant_files']}", file=summary_stream)
+        print(f"   Files with violations: {results['violation_files']}", file=summary_stream)
+        print(f"   Files missing frontmatter: {results['missing_frontmatter']}", file=summary_stream)
         
         if args.verbose and results['violations']:
-            print(f"\n❌ Violations found:")
+            print(f"\n❌ Violations found:", file=summary_stream)
             for violation in results['violations']:
-                print(f"   {violation}")
+                print(f"   {violation}", file=summary_stream)
         
         if results['violation_files'] > 0 or results['missing_frontmatter'] > 0:
-            print(f"\n💡 Run with --fix to automatically resolve issues")
+            print(f"\n💡 Run with --fix to automatically resolve issues", file=summary_stream)
             sys.exit(1)
         else:
-            print(f"\n✅ All files are compliant!")
+            print(f"\n✅ All files are compliant!", file=summary_stream)
             sys.exit(0)
     
     if args.fix:
         # Run fixes
-        print("🔧 Fixing frontmatter issues...")
-        results = enforcer.run_fixes(dry_run=args.dry_run)
+        print("🔧 Fixing frontmatter issues...", file=summary_stream)
+        try:
+            results = enforcer.run_fixes(file_paths, dry_run=args.dry_run, jobs=args.jobs,
+                                         patch_writer=patch_writer)
+        finally:
+            if patch_writer is not None:
+                patch_writer.close()
         
-        print(f"📊 Fix Results:")
-        print(f"   Total files processed: {results['total_files']}")
-        print(f"   Files fixed: {results['files_fixed']}")
-        print(f"   Files skipped (no issues): {results['files_skipped']}")
+        print(f"📊 Fix Results:", file=summary_stream)
+        print(f"   Total files processed: {results['total_files']}", file=summary_stream)
+        print(f"   Files fixed: {results['files_fixed']}", file=summary_stream)
+        print(f"   Files skipped (no issues): {results['files_skipped']}", file=summary_stream)
         
         if results['errors']:
-            print(f"   Errors: {len(results['errors'])}")
+            print(f"   Errors: {len(results['errors'])}", file=summary_stream)
             if args.verbose:
                 for error in results['errors']:
-                    print(f"   ❌ {error}")
+                    print(f"   ❌ {error}", file=summary_stream)
         
         if args.verbose and enforcer.fixes_applied:
-            print(f"\n✅ Fixes applied:")
+            print(f"\n✅ Fixes applied:", file=summary_stream)
             for fix in enforcer.fixes_applied:
-                print(f"   {fix}")
+                print(f"   {fix}", file=summary_stream)
         
+        if patch_writer is not None:
+            print(f"   Patches written: {patch_writer.files}", file=summary_stream)
         if args.dry_run:
-            print(f"\n💡 This was a dry run. Use --fix without --dry-run to apply changes.")
+            print(f"\n💡 This was a dry run. Use --fix without --dry-run to apply changes.", file=summary_stream)
         else:
-            print(f"\n✅ Frontmatter enforcement complete!")
+            print(f"\n✅ Frontmatter enforcement complete!", file=summary_stream)
 
 if __name__ == "__main__":
     main()
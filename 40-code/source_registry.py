@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Cross-File Source Registry
+
+Deep-research notes repeat many of the same web sources. This script
+extracts the sources of every note (with the same parser as
+.kb/scripts/clean_sources.py) and upserts them into citations.db:
+
+- `web_sources`: one row per source keyed by a normalized URL (lower-case
+  scheme and host, default ports, trailing slashes, text fragments and
+  tracking parameters removed)
+- `source_favicons`: favicon URLs / data URIs stored once and referenced
+  by id, so repeated blobs are not duplicated
+- `web_source_files`: which notes cite which source
+
+"Where else did we cite this?" then becomes an index lookup (--where).
+Notes are only re-read when their content changed since the last run.
+
+Usage:
+    source_registry.py [options]
+
+Examples:
+    source_registry.py
+    source_registry.py --paths 30-data/deep-research --verbose
+    source_registry.py --where https://git-scm.com/docs/git-worktree/
+"""
+
+import argparse
+import hashlib
+import logging
+import re
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(REPO_ROOT / '.kb' / 'scripts'))
+
+from clean_sources import HTML_SUFFIXES, extract_source_data  # noqa: E402
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s'
+)
+logger = logging.getLogger('source-registry')
+
+DEFAULT_DB_PATH = REPO_ROOT / '30-data' / 'database' / 'citations.db'
+DEFAULT_PATHS = [Path('30-data') / 'deep-research', Path('10-knowledge')]
+
+SKIP_DIRS = {'.git', '.venv', 'node_modules', '.kb', '__pycache__'}
+
+TRACKING_PARAMS = {'gclid', 'dclid', 'fbclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid',
+                   'ref_src', 'ref_url', '_hsenc', '_hsmi', 'yclid', 'spm'}
+DEFAULT_PORTS = {'http': '80', 'https': '443'}
+
+SOURCES_SECTION_RE = re.compile(r'## Sources.*?(?=\n## |\Z)', re.DOTALL)
+# Sources already converted with `clean_sources.py --format markdown`
+MARKDOWN_SOURCE_RE = re.compile(
+    r'^\[(?:!\[\]\((?P<favicon>[^)\s]+)\) )?(?P<title>[^\]\n]*)\]\((?P<url>https?://[^)\s]+)\)\s*$',
+    re.MULTILINE)
+
+SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS source_favicons (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        favicon TEXT UNIQUE NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS web_sources (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        normalized_url TEXT UNIQUE NOT NULL,
+        url TEXT NOT NULL,
+        title TEXT,
+        domain TEXT,
+        favicon_id INTEGER,
+        first_seen TEXT NOT NULL,
+        last_seen TEXT NOT NULL,
+        FOREIGN KEY (favicon_id) REFERENCES source_favicons(id)
+    );
+    CREATE TABLE IF NOT EXISTS web_source_files (
+        source_id INTEGER NOT NULL,
+        content_file TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        PRIMARY KEY (source_id, content_file),
+        FOREIGN KEY (source_id) REFERENCES web_sources(id)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS web_source_scan_state (
+        content_file TEXT PRIMARY KEY,
+        content_hash TEXT NOT NULL,
+        scanned_date TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_web_sources_domain ON web_sources(domain);
+    CREATE INDEX IF NOT EXISTS idx_web_source_files_file ON web_source_files(content_file, source_id);
+"""
+
+UPSERT_SOURCE_SQL = """
+    INSERT INTO web_sources (normalized_url, url, title, domain, favicon_id, first_seen, last_seen)
+    VALUES (?, ?, ?, ?, (SELECT id FROM source_favicons WHERE favicon = ?), ?, ?)
+    ON CONFLICT (normalized_url) DO UPDATE SET
+        title = COALESCE(NULLIF(excluded.title, ''), title),
+        domain = COALESCE(NULLIF(excluded.domain, ''), domain),
+        favicon_id = COALESCE(excluded.favicon_id, favicon_id),
+        last_seen = excluded.last_seen
+"""
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a source URL used as the registry key."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and str(parts.port) != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path.rstrip('/')
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                       if not k.lower().startswith('utm_') and k.lower() not in TRACKING_PARAMS])
+    # Scroll-to-text fragments (#:~:text=...) point into the same page
+    fragment = '' if parts.fragment.startswith(':~:') else parts.fragment
+    return urlunsplit((scheme, host, path, query, fragment))
+
+
+def extract_sources(text: str, whole_document: bool = False) -> List[Dict[str, str]]:
+    """Sources of one note: its Sources section HTML, or markdown source links."""
+    if whole_document:
+        return extract_source_data(text)
+
+    sources = []
+    for section in SOURCES_SECTION_RE.finditer(text):
+        sources.extend(extract_source_data(section.group(0)))
+        for match in MARKDOWN_SOURCE_RE.finditer(section.group(0)):
+            title = match.group('title')
+            domain = urlsplit(match.group('url')).hostname or ''
+            if title.endswith(f" - {domain}") or title.endswith(f" {domain}"):
+                title = title[:-len(domain)].rstrip(' -')
+            sources.append({'url': match.group('url'), 'title': title or domain,
+                            'domain': domain, 'favicon': match.group('favicon') or ''})
+    return sources
+
+
+class SourceRegistry:
+    """Maintains the normalized web source registry in citations.db."""
+
+    def __init__(self, base_path: Path = REPO_ROOT, db_path: Path = DEFAULT_DB_PATH,
+                 dry_run: bool = False):
+        self.base_path = Path(base_path)
+        self.db_path = Path(db_path)
+        self.dry_run = dry_run
+
+    def connect(self) -> sqlite3.Connection:
+        """Open citations.db, creating the registry tables unless this is a dry run."""
+        if self.dry_run:
+            return sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(SCHEMA_SQL)
+        return conn
+
+    @staticmethod
+    def _has_table(conn: sqlite3.Connection, name: str) -> bool:
+        return conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+    def iter_content_files(self, paths: Optional[Iterable[Path]] = None) -> Iterator[Path]:
+        roots = [Path(p) if Path(p).is_absolute() else self.base_path / p for p in (paths or DEFAULT_PATHS)]
+        for root in roots:
+            if root.is_file():
+                yield root
+                continue
+            if not root.is_dir():
+                continue
+            for path in sorted(root.rglob('*')):
+                if path.suffix.lower() not in ('.md',) + HTML_SUFFIXES or not path.is_file():
+                    continue
+                if SKIP_DIRS.intersection(path.relative_to(self.base_path).parts):
+                    continue
+                yield path
+
+    def register_file(self, conn: sqlite3.Connection, rel_path: str,
+                      sources: List[Dict[str, str]], today: str) -> int:
+        """Replace the source mapping of one file; returns the number of distinct sources."""
+        by_key: Dict[str, Dict[str, str]] = {}
+        for source in sources:
+            by_key.setdefault(normalize_url(source['url']), source)
+
+        conn.executemany("INSERT OR IGNORE INTO source_favicons (favicon) VALUES (?)",
+                         [(s['favicon'],) for s in by_key.values() if s['favicon']])
+        conn.executemany(UPSERT_SOURCE_SQL, [
+            (key, s['url'], s['title'], s['domain'], s['favicon'] or None, today, today)
+            for key, s in by_key.items()
+        ])
+        conn.execute("DELETE FROM web_source_files WHERE content_file = ?", (rel_path,))
+        conn.executemany("""
+            INSERT INTO web_source_files (source_id, content_file, position)
+            SELECT id, ?, ? FROM web_sources WHERE normalized_url = ?
+        """, [(rel_path, position, key) for position, key in enumerate(by_key)])
+        return len(by_key)
+
+    def run(self, paths: Optional[Iterable[Path]] = None, full: bool = False) -> Dict[str, int]:
+        """Register the sources of changed files."""
+        today = datetime.now().strftime('%Y-%m-%d')
+        stats = {'files_seen': 0, 'files_scanned': 0, 'sources': 0, 'files_removed': 0}
+
+        conn = self.connect()
+        try:
+            state = {}
+            if self._has_table(conn, 'web_source_scan_state'):
+                state = dict(conn.execute("SELECT content_file, content_hash FROM web_source_scan_state"))
+            seen = set()
+
+            for path in self.iter_content_files(paths):
+                rel_path = str(path.relative_to(self.base_path))
+                seen.add(rel_path)
+                stats['files_seen'] += 1
+                try:
+                    data = path.read_bytes()
+                except OSError as e:
+                    logger.warning(f"Could not read {path}: {e}")
+                    continue
+
+                content_hash = hashlib.sha1(data).hexdigest()
+                if not full and state.get(rel_path) == content_hash:
+                    continue
+
+                sources = extract_sources(data.decode('utf-8', errors='replace'),
+                                          whole_document=path.suffix.lower() in HTML_SUFFIXES)
+                stats['files_scanned'] += 1
+                if self.dry_run:
+                    stats['sources'] += len(sources)
+                    continue
+
+                # Files without sources are recorded too, so they are not re-read next run
+                if sources or rel_path in state:
+                    count = self.register_file(conn, rel_path, sources, today)
+                    stats['sources'] += count
+                    logger.debug(f"{rel_path}: {count} sources")
+                conn.execute("""
+                    INSERT OR REPLACE INTO web_source_scan_state (content_file, content_hash, scanned_date)
+                    VALUES (?, ?, ?)
+                """, (rel_path, content_hash, today))
+
+            # Forget files that disappeared (only when the default roots were walked)
+            if not paths:
+                removed = [(f,) for f in state if f not in seen]
+                stats['files_removed'] = len(removed)
+                if removed and not self.dry_run:
+                    conn.executemany("DELETE FROM web_source_files WHERE content_file = ?", removed)
+                    conn.executemany("DELETE FROM web_source_scan_state WHERE content_file = ?", removed)
+
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        logger.info(f"🌐 Scanned {stats['files_scanned']} of {stats['files_seen']} files, "
+                    f"registered {stats['sources']} source references")
+        return stats
+
+    def where_cited(self, url: str) -> List[Dict]:
+        """Files citing ``url`` (compared by normalized URL)."""
+        conn = self.connect()
+        conn.row_factory = sqlite3.Row
+        try:
+            rows = conn.execute("""
+                SELECT s.url, s.title, s.domain, f.content_file
+                FROM web_sources s JOIN web_source_files f ON f.source_id = s.id
+                WHERE s.normalized_url = ?
+                ORDER BY f.content_file
+            """, (normalize_url(url),)).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            conn.close()
+
+
+def main() -> int:
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-path', type=Path, default=REPO_ROOT, help='Knowledge base root')
+    parser.add_argument('--db', type=Path, default=DEFAULT_DB_PATH, help='Path to citations.db')
+    parser.add_argument('--paths', nargs='+', type=Path,
+                        help='Only scan these files or directories (default: 30-data/deep-research, 10-knowledge)')
+    parser.add_argument('--full', action='store_true', help='Rescan every file')
+    parser.add_argument('--where', metavar='URL', help='List the notes that cite URL and exit')
+    parser.add_argument('--dry-run', action='store_true', help='Scan without writing')
+    parser.add_argument('--verbose', action='store_true', help='Detailed output')
+
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    if not args.db.exists():
+        logger.error(f"❌ Database not found: {args.db}")
+        return 1
+
+    try:
+        registry = SourceRegistry(args.base_path.resolve(), args.db, args.dry_run)
+        if args.where:
+            rows = registry.where_cited(args.where)
+            for row in rows:
+                print(f"{row['content_file']}\t{row['title']}")
+            return 0 if rows else 1
+
+        stats = registry.run(args.paths, full=args.full)
+        print(f"✅ Source registry updated: {stats}")
+        return 0
+    except sqlite3.Error as e:
+        logger.error(f"Registry update failed: {e}")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""Tests for citation_usage: identifier matching and dry runs."""
+
+import sqlite3
+
+from citation_usage import CitationMatcher, CitationUsageIndexer
+
+
+def matcher(*patterns):
+    m = CitationMatcher()
+    for citation_id, pattern in enumerate(patterns, 1):
+        m.add(pattern, citation_id)
+    return m
+
+
+def found(m, text):
+    return [pattern for _, _, pattern in m.iter_matches(text)]
+
+
+def test_prefixed_identifiers():
+    m = matcher('10.1145/abc.123', '1706.03762')
+    assert found(m, 'See doi:10.1145/ABC.123 and arXiv:1706.03762.') == ['10.1145/abc.123', '1706.03762']
+
+
+def test_identifiers_cited_as_urls():
+    m = matcher('10.1145/abc.123', '1706.03762')
+    text = ('[paper](https://doi.org/10.1145/ABC.123) '
+            'https://arxiv.org/abs/1706.03762v5 '
+            '<https://arxiv.org/pdf/1706.03762> '
+            'https://arxiv.org/pdf/1706.03762v2.pdf')
+    assert found(m, text) == ['10.1145/abc.123', '1706.03762', '1706.03762', '1706.03762']
+
+
+def test_partial_identifiers_do_not_match():
+    m = matcher('10.1145/abc', '1706.0376', 'smith2020')
+    assert found(m, '10.1145/abc.123 10.1145/abcd 1706.03762 goldsmith2020 smith2020a') == []
+    assert found(m, 'doi.org/10.1145/abc/x') == []
+
+
+def test_dry_run_leaves_the_database_alone(tmp_path):
+    db = tmp_path / 'citations.db'
+    conn = sqlite3.connect(db)
+    conn.executescript("""
+        CREATE TABLE citations (id INTEGER PRIMARY KEY, citation_key TEXT, doi TEXT, arxiv_id TEXT);
+        CREATE TABLE citation_usage (id INTEGER PRIMARY KEY, citation_id INTEGER, content_file TEXT,
+                                     usage_context TEXT, usage_date TEXT);
+        INSERT INTO citations VALUES (1, 'vaswani2017', NULL, '1706.03762');
+    """)
+    conn.close()
+    notes = tmp_path / 'notes'
+    notes.mkdir()
+    (notes / 'a.md').write_text('https://arxiv.org/abs/1706.03762\n', encoding='utf-8')
+    before = db.read_bytes()
+
+    stats = CitationUsageIndexer(tmp_path, db, dry_run=True).run()
+
+    assert stats['files_scanned'] == 1 and stats['usages'] == 1
+    assert db.read_bytes() == before
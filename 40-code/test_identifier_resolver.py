@@ -0,0 +1,89 @@
+"""Tests for identifier_resolver: coalescing, caching and the concurrency bound."""
+
+import asyncio
+
+import pytest
+
+from disk_cache import DiskCache, TieredCache
+from identifier_resolver import ARXIV, DOI, IdentifierResolver, ResolverBackend
+
+
+class FakeBackend(ResolverBackend):
+    """Records calls; each fetch waits for ``release`` when one is given."""
+
+    def __init__(self, records=None, release=None):
+        self.records = records or {}
+        self.release = release
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    async def fetch(self, kind, identifier):
+        self.calls.append((kind, identifier))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            if self.release is not None:
+                await self.release.wait()
+            else:
+                await asyncio.sleep(0.01)
+        finally:
+            self.active -= 1
+        return self.records.get(identifier)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = TieredCache(DiskCache(tmp_path / 'cache.db'))
+    yield cache
+    cache.close()
+
+
+def test_concurrent_requests_share_one_fetch(cache):
+    backend = FakeBackend({'10.1/x': {'title': 'X'}})
+    resolver = IdentifierResolver(backend, cache)
+
+    async def run():
+        return await asyncio.gather(*(resolver.resolve(DOI, '10.1/x') for _ in range(10)))
+
+    assert asyncio.run(run()) == [{'title': 'X'}] * 10
+    assert backend.calls == [(DOI, '10.1/x')]
+    assert resolver.stats['coalesced'] == 9
+
+
+def test_not_found_results_are_cached(cache):
+    backend = FakeBackend()
+    resolver = IdentifierResolver(backend, cache)
+
+    assert asyncio.run(resolver.resolve(ARXIV, '2101.00001')) is None
+    assert asyncio.run(resolver.resolve(ARXIV, '2101.00001')) is None
+    assert len(backend.calls) == 1
+    assert resolver.stats['negative_hits'] == 1
+
+
+def test_fetches_respect_the_concurrency_bound(cache):
+    backend = FakeBackend()
+    resolver = IdentifierResolver(backend, cache, concurrency=3)
+
+    asyncio.run(resolver.resolve_many(f"10.1/{i}" for i in range(12)))
+
+    assert len(backend.calls) == 12
+    assert backend.max_active == 3
+
+
+def test_cancelled_leader_releases_waiters(cache):
+    backend = FakeBackend()
+    resolver = IdentifierResolver(backend, cache)
+
+    async def run():
+        backend.release = asyncio.Event()  # never set: the fetch only ends by cancellation
+        leader = asyncio.ensure_future(resolver.resolve(DOI, '10.1/x'))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(resolver.resolve(DOI, '10.1/x'))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(waiter, timeout=1)
+        assert not resolver._inflight
+
+    asyncio.run(run())
@@ -0,0 +1,145 @@
+"""Tests for move_planner: conflict suffixes and link rewriting."""
+
+import io
+
+from diff_preview import PatchWriter
+from move_planner import MovePlanner
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+    return path
+
+
+def test_conflicting_targets_get_numbered_suffixes(tmp_path):
+    write(tmp_path / 'archive' / 'notes.md', 'existing\n')
+    first = write(tmp_path / 'a' / 'notes.md', 'a\n')
+    second = write(tmp_path / 'b' / 'notes.md', 'b\n')
+
+    planner = MovePlanner(tmp_path)
+    move_a = planner.add(first, tmp_path / 'archive' / 'notes.md')
+    move_b = planner.add(second, tmp_path / 'archive' / 'notes.md')
+
+    assert move_a.target.name == 'notes-2.md'
+    assert move_b.target.name == 'notes-3.md'
+    assert planner.conflicts == [move_a, move_b]
+
+    planner.apply()
+    assert (tmp_path / 'archive' / 'notes.md').read_text() == 'existing\n'
+    assert (tmp_path / 'archive' / 'notes-2.md').read_text() == 'a\n'
+    assert (tmp_path / 'archive' / 'notes-3.md').read_text() == 'b\n'
+
+
+def test_inbound_and_outbound_links_are_rewritten(tmp_path):
+    write(tmp_path / 'index.md', 'See [guide](docs/guide.md)\n\n[ref]: docs/guide.md\n')
+    guide = write(tmp_path / 'docs' / 'guide.md', 'Back to [index](../index.md), ![img](../pic.png)\n')
+    write(tmp_path / 'pic.png', '')
+
+    planner = MovePlanner(tmp_path)
+    planner.add(guide, tmp_path / 'archive' / 'old' / 'guide.md')
+    stats = planner.apply()
+
+    assert stats == {'moved': 1, 'links_rewritten_files': 2, 'conflicts': 0}
+    assert not guide.exists()
+    assert (tmp_path / 'index.md').read_text() == \
+        'See [guide](archive/old/guide.md)\n\n[ref]: archive/old/guide.md\n'
+    assert (tmp_path / 'archive' / 'old' / 'guide.md').read_text() == \
+        'Back to [index](../../index.md), ![img](../../pic.png)\n'
+
+
+def test_links_in_code_are_left_alone(tmp_path):
+    text = ('```\n[fenced](y.md)\n```\n'
+            'Inline `[code](y.md)` and ``[double `tick`](y.md)``\n'
+            '[real](y.md)\n')
+    write(tmp_path / 'x.md', text)
+    target = write(tmp_path / 'y.md', 'y\n')
+
+    planner = MovePlanner(tmp_path)
+    planner.add(target, tmp_path / 'sub' / 'y.md')
+    planner.apply()
+
+    assert (tmp_path / 'x.md').read_text() == text.replace('[real](y.md)', '[real](sub/y.md)')
+
+
+def test_anchors_queries_and_external_links(tmp_path):
+    write(tmp_path / 'x.md', '[a](y.md#part) [b](y.md?plain=1) [c](#local) [d](https://e.org/y.md)\n')
+    target = write(tmp_path / 'y.md', 'y\n')
+
+    planner = MovePlanner(tmp_path)
+    planner.add(target, tmp_path / 'sub' / 'y.md')
+    planner.apply()
+
+    assert (tmp_path / 'x.md').read_text() == \
+        '[a](sub/y.md#part) [b](sub/y.md?plain=1) [c](#local) [d](https://e.org/y.md)\n'
+
+
+def test_bracketed_and_encoded_targets(tmp_path):
+    write(tmp_path / 'x.md', '[a](<my notes.md>) [b](my%20notes.md "title")\n')
+    target = write(tmp_path / 'my notes.md', 'y\n')
+
+    planner = MovePlanner(tmp_path)
+    planner.add(target, tmp_path / 'new dir' / 'my notes.md')
+    planner.apply()
+
+    assert (tmp_path / 'x.md').read_text() == \
+        '[a](<new dir/my notes.md>) [b](new%20dir/my%20notes.md "title")\n'
+
+
+def test_identity_move_is_not_planned(tmp_path):
+    source = write(tmp_path / 'a.md', '[o](other.md)\n')
+    other = write(tmp_path / 'other.md', 'o\n')
+
+    planner = MovePlanner(tmp_path)
+    planner.add(other, tmp_path / 'b' / 'other.md')
+    planner.add(source, source)
+    planner.apply()
+
+    assert source.read_text() == '[o](b/other.md)\n'
+
+
+def test_dry_run_only_reports(tmp_path):
+    write(tmp_path / 'x.md', '[y](y.md)\n')
+    target = write(tmp_path / 'y.md', 'y\n')
+    stream = io.StringIO()
+
+    planner = MovePlanner(tmp_path)
+    planner.add(target, tmp_path / 'sub' / 'y.md')
+    stats = planner.apply(dry_run=True, patch_writer=PatchWriter(stream))
+
+    assert stats['moved'] == 1
+    assert target.exists() and (tmp_path / 'x.md').read_text() == '[y](y.md)\n'
+    assert 'rename from y.md\nrename to sub/y.md\n' in stream.getvalue()
+    assert '+[y](sub/y.md)\n' in stream.getvalue()
+
+
+def test_backlink_map_holds_the_spans_to_rewrite(tmp_path):
+    index = write(tmp_path / 'index.md', 'See [guide](docs/guide.md) and [other](other.md)\n')
+    guide = write(tmp_path / 'docs' / 'guide.md', '[index](../index.md) [gone](../missing.md)\n')
+    write(tmp_path / 'other.md', 'o\n')
+
+    planner = MovePlanner(tmp_path)
+    planner.add(guide, tmp_path / 'archive' / 'guide.md')
+    backlinks = planner.build_backlinks()
+
+    assert {target: dict(sources) for target, sources in backlinks.links.items()} == {
+        guide.resolve(): {index.resolve(): [(12, 25)]},
+        index.resolve(): {guide.resolve(): [(8, 19)]},
+    }
+    assert set(backlinks.texts) == {index.resolve(), guide.resolve()}
+
+
+def test_wikilinks_to_renamed_moves_are_reported(tmp_path, caplog):
+    write(tmp_path / 'archive' / 'notes.md', 'existing\n')
+    notes = write(tmp_path / 'a' / 'notes.md', 'a\n')
+    text = 'See [[notes]], [[a/notes|alias]] and `[[notes]]`\n'
+    write(tmp_path / 'x.md', text)
+
+    planner = MovePlanner(tmp_path)
+    planner.add(notes, tmp_path / 'archive' / 'notes.md')
+    with caplog.at_level('WARNING', logger='move-planner'):
+        planner.apply()
+
+    assert (tmp_path / 'x.md').read_text() == text
+    assert len(caplog.records) == 1
+    assert 'a/notes.md -> archive/notes-2.md: x.md' in caplog.records[0].getMessage()